@@ -29,6 +29,37 @@ def main():
         help='The config file path, "_" will be skipped',
         dest="config",
     )
+    subparsers = parser.add_subparsers(dest="command")
+    import_parser = subparsers.add_parser("import", help="Import an answer bank")
+    _ = import_parser.add_argument("path", help="The .jsonl or .csv answer bank to import")
+    export_parser = subparsers.add_parser("export", help="Export all answers")
+    _ = export_parser.add_argument("path", help="The .jsonl or .csv answer bank to export to")
+    serve_parser = subparsers.add_parser("serve", help="Share answers with other nodes")
+    _ = serve_parser.add_argument("--host", default="127.0.0.1", help="The host to bind")
+    _ = serve_parser.add_argument("--port", type=int, help="The port to bind")
+    _ = serve_parser.add_argument(
+        "--token",
+        help="The token clients should send, defaults to answer_server_token in config",
+    )
+    benchmark_parser = subparsers.add_parser(
+        "benchmark",
+        help="Compare memory and page load time of browsers and launch profiles",
+    )
+    _ = benchmark_parser.add_argument(
+        "--browsers",
+        nargs="+",
+        choices=["firefox", "chromium", "webkit"],
+        default=["firefox", "chromium", "webkit"],
+        help="The browsers to compare",
+    )
+    _ = benchmark_parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["default", "performance"],
+        help="The launch profiles to compare",
+    )
+    _ = benchmark_parser.add_argument("--url", help="The page to load")
+    _ = benchmark_parser.add_argument("--rounds", type=int, default=3, help="Loads per browser")
     args = parser.parse_args()
     # apply args
     if isinstance(args.config, str):
@@ -53,6 +84,16 @@ def main():
     if isinstance(args.gui, bool):
         get_runtime_config().gui = args.gui
 
+    if args.command in {"import", "export"}:
+        _process_answer_bank(args.command, Path(args.path))
+        return
+    if args.command == "serve":
+        _serve_answers(args.host, args.port, args.token)
+        return
+    if args.command == "benchmark":
+        _benchmark_browsers(args.browsers, args.profiles, args.url, args.rounds)
+        return
+
     if get_runtime_config().gui:
         from autoxuexiplaywright.gui import start
         from autoxuexiplaywright.gui import register_callbacks
@@ -61,3 +102,93 @@ def main():
         from autoxuexiplaywright.core import register_callbacks
     register_callbacks()
     start()
+
+
+def _process_answer_bank(command: str, path: Path):
+    from autoxuexiplaywright.logger import info
+    from autoxuexiplaywright.logger import error
+    from autoxuexiplaywright.logger import init_logger
+    from autoxuexiplaywright.storage import get_data_path
+    from autoxuexiplaywright.languages import get_language_string
+    from autoxuexiplaywright.processors.common.answer.bank import export_answer_bank
+    from autoxuexiplaywright.processors.common.answer.bank import import_answer_bank
+    from autoxuexiplaywright.processors.common.answer.store import ANSWER_DB_FILENAME
+    from autoxuexiplaywright.processors.common.answer.store import AnswerStore
+
+    init_logger()
+    store = AnswerStore(get_data_path(ANSWER_DB_FILENAME))
+    try:
+        if command == "import":
+            info(
+                get_language_string("core-info-answer-bank-imported")
+                % import_answer_bank(path, store),
+            )
+        else:
+            info(
+                get_language_string("core-info-answer-bank-exported")
+                % export_answer_bank(path, store),
+            )
+    except (ValueError, OSError) as e:
+        # Unsupported format, missing file or a file not in UTF-8
+        error(get_language_string("core-err-answer-bank-failed") % (path, e))
+    finally:
+        store.close()
+
+
+def _serve_answers(host: str, port: int | None, token: str | None):
+    from contextlib import suppress
+    from autoxuexiplaywright.config import get_runtime_config
+    from autoxuexiplaywright.logger import info
+    from autoxuexiplaywright.logger import error
+    from autoxuexiplaywright.logger import init_logger
+    from autoxuexiplaywright.storage import get_data_path
+    from autoxuexiplaywright.languages import get_language_string
+    from autoxuexiplaywright.processors.common import ANSWER_SERVER_PORT
+    from autoxuexiplaywright.processors.common.answer.store import ANSWER_DB_FILENAME
+    from autoxuexiplaywright.processors.common.answer.store import AnswerStore
+    from autoxuexiplaywright.processors.common.answer.server import AnswerServer
+
+    init_logger()
+    token = token or get_runtime_config().answer_server_token
+    # Anyone reaching the server can change answers, so others must know the token
+    if token is None and not _is_loopback(host):
+        error(get_language_string("core-err-answer-server-token-required") % host)
+        return
+    store = AnswerStore(get_data_path(ANSWER_DB_FILENAME))
+    try:
+        with AnswerServer(store, host, port or ANSWER_SERVER_PORT, token) as server:
+            info(get_language_string("core-info-answer-server-started") % server.url)
+            with suppress(KeyboardInterrupt):
+                server.serve_forever()
+    finally:
+        store.close()
+
+
+def _is_loopback(host: str) -> bool:
+    from ipaddress import ip_address
+
+    try:
+        return ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def _benchmark_browsers(browser_ids: list[str], profiles: list[str], url: str | None, rounds: int):
+    from autoxuexiplaywright.logger import info
+    from autoxuexiplaywright.logger import init_logger
+    from autoxuexiplaywright.languages import get_language_string
+    from autoxuexiplaywright.processors.common.urls import MAIN_PAGE
+    from autoxuexiplaywright.processors.sync_api.benchmark import run_benchmark
+
+    init_logger()
+    for result in run_benchmark(browser_ids, profiles, url or MAIN_PAGE, rounds):  # type: ignore
+        info(
+            get_language_string("core-info-benchmark-result")
+            % (
+                result.browser_id,
+                result.profile,
+                result.launch_secs,
+                result.median_load_secs,
+                "-" if result.rss is None else "%.1f MB" % (result.rss / 1024 / 1024),
+            ),
+        )
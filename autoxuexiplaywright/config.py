@@ -1,5 +1,6 @@
 """Config struct."""
 
+from re import fullmatch
 from json import dump
 from json import load
 from typing import Literal
@@ -23,6 +24,8 @@ ChannelType = (
 )
 BrowserType = Literal["firefox", "chromium", "webkit"]
 
+_ACCOUNT_NAME_PATTERN = r"[\w-]+"
+
 
 class Config:
     """class for storaging runtime config."""
@@ -39,6 +42,21 @@ class Config:
         self.proxy: ProxySettings | None = None
         self.skipped: list[str] = []
         self.get_video = False
+        self.capture_paper = False
+        self.answer_server: str | None = None
+        self.answer_server_token: str | None = None
+        # Tasks running at the same time, each one uses a page of the pool in async mode
+        # or a browser in sync mode
+        self.page_budget = 3
+        # Tabs of a read task, they and up to 2 list pages it opens are not limited by
+        # page_budget, so up to page_budget * (read_tabs + 3) pages can be opened
+        self.read_tabs = 3
+        self.block_profile = "balanced"
+        self.http_cache_size_mb = 256
+        self.launch_profile = "default"
+        self.persistent_profile = True
+        self.accounts: list[str] = []
+        self.account_concurrency = 2
 
     def __eq__(self, __o: object) -> bool:
         """Compare equality."""
@@ -167,12 +185,71 @@ def _deserialize_config_from_json(json: dict[str, bool | str | ProxySettings | N
                 case "get_video":
                     if isinstance(value, bool):
                         config.get_video = value
+                case "capture_paper":
+                    if isinstance(value, bool):
+                        config.capture_paper = value
+                case "answer_server":
+                    if isinstance(value, str):
+                        config.answer_server = value
+                case "answer_server_token":
+                    if isinstance(value, str):
+                        config.answer_server_token = value
+                case "page_budget":
+                    if isinstance(value, int) and not isinstance(value, bool):
+                        config.page_budget = value
+                case "read_tabs":
+                    if isinstance(value, int) and not isinstance(value, bool):
+                        config.read_tabs = value
+                case "block_profile":
+                    if isinstance(value, str):
+                        config.block_profile = value
+                case "http_cache_size_mb":
+                    if isinstance(value, int) and not isinstance(value, bool):
+                        config.http_cache_size_mb = value
+                case "launch_profile":
+                    if isinstance(value, str):
+                        config.launch_profile = value
+                case "persistent_profile":
+                    if isinstance(value, bool):
+                        config.persistent_profile = value
+                case "accounts":
+                    if isinstance(value, list):
+                        config.accounts = _parse_accounts(value)  # type: ignore
+                case "account_concurrency":
+                    if isinstance(value, int) and not isinstance(value, bool):
+                        config.account_concurrency = value
                 case _:
                     pass
 
     return config
 
 
+def _parse_accounts(value: list[object]) -> list[str]:
+    """Keep account names which can be used in file names.
+
+    Names are used in file names like `alice-qr.png`, so only letters, digits, `_` and
+    `-` are allowed, and `default` is kept for the default account. Names differing
+    only in case are the same file on some systems, only the first one is kept.
+
+    Args:
+        value (list[object]): The names in json
+
+    Returns:
+        list[str]: The valid names
+    """
+    accounts: list[str] = []
+    seen = {"default"}
+    for account in value:
+        if (
+            isinstance(account, str)
+            and fullmatch(_ACCOUNT_NAME_PATTERN, account) is not None
+            and account.casefold() not in seen
+        ):
+            seen.add(account.casefold())
+            accounts.append(account)
+    return accounts
+
+
 def _serialize_config_to_json(config: Config) -> dict[str, bool | str | ProxySettings | None]:
     """Convert a config instance to json dict.
 
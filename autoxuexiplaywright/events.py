@@ -4,6 +4,7 @@ from enum import Enum
 from typing import Any
 from typing import Callable
 from contextlib import suppress
+from contextvars import ContextVar
 from typing_extensions import override
 
 
@@ -71,6 +72,21 @@ class NoSuchEventException(Exception):
 
 
 _events: list[Event] = [Event(_id) for _id in EventID if _id != EventID.NONE]
+_isolated_events: ContextVar[list[Event] | None] = ContextVar("isolated_events", default=None)
+
+
+def isolate_events():
+    """Give current context its own events.
+
+    Callbacks added before are copied, callbacks added in this context later are only
+    called by events invoked in this context, and the other way round.
+    """
+    events: list[Event] = []
+    for event in _events:
+        isolated = Event(event.id_)
+        isolated.callbacks = list(event.callbacks)
+        events.append(isolated)
+    _ = _isolated_events.set(events)
 
 
 def find_event_by_id(_id: EventID) -> Event:
@@ -85,7 +101,7 @@ def find_event_by_id(_id: EventID) -> Event:
     Returns:
         Event: The event
     """
-    for event in _events:
+    for event in _isolated_events.get() or _events:
         if event.id_ == _id:
             return event
     raise NoSuchEventException(_id)
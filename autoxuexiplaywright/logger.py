@@ -13,12 +13,28 @@ from logging import StreamHandler
 from logging import getLogger
 from .defines import APPNAME
 from .storage import get_cache_path
+from contextvars import ContextVar
 
 
 _LOGGING_STRING_FMT = "%(asctime)s-%(levelname)s-%(message)s"
 _LOGGING_DATE_FMT = "%Y-%m-%d %H:%M:%S"
 _logger = getLogger(APPNAME)
 _context = {"init": False}
+_prefix: ContextVar[str] = ContextVar("log_prefix", default="")
+
+
+def set_log_prefix(prefix: str):
+    """Set the prefix of messages logged in current context, like `[alice] `.
+
+    Args:
+        prefix (str): The prefix
+    """
+    _ = _prefix.set(prefix)
+
+
+def _add_prefix(msg: object) -> object:
+    prefix = _prefix.get()
+    return msg if not prefix else "%s%s" % (prefix, msg)
 
 
 def debug(msg: object) -> None:
@@ -29,7 +45,7 @@ def debug(msg: object) -> None:
 
     """
     if _context["init"]:
-        return _logger.debug(msg)
+        return _logger.debug(_add_prefix(msg))
     return None
 
 
@@ -41,7 +57,7 @@ def info(msg: object) -> None:
 
     """
     if _context["init"]:
-        return _logger.info(msg)
+        return _logger.info(_add_prefix(msg))
     return None
 
 
@@ -53,7 +69,7 @@ def warning(msg: object) -> None:
 
     """
     if _context["init"]:
-        return _logger.warning(msg)
+        return _logger.warning(_add_prefix(msg))
     return None
 
 
@@ -65,7 +81,7 @@ def error(msg: object) -> None:
 
     """
     if _context["init"]:
-        return _logger.error(msg)
+        return _logger.error(_add_prefix(msg))
     return None
 
 
@@ -3,17 +3,21 @@
 from shutil import rmtree
 
 # Relative imports
-from .common import cache
 from .common import clean_tasks
 from .common import register_tasks
-from .common import tasks_to_be_done
 from pathlib import Path
 from ..config import get_runtime_config
 from ..logger import warning
 from ..storage import get_cache_path
 from ..storage import get_modules_file_paths
 from ..languages import get_language_string
+from .common.content import clear_content_queues
 from .common.modules import load_modules
+from .common.reading import read_summary
+from .common.visited import get_visited_index
+from .common.visited import close_visited_index
+from .common.blocking import block_counter
+from .common.httpcache import close_http_cache
 from .common.answer.sources import load_all_answer_sources
 from .common.answer.sources import close_all_answer_sources
 
@@ -29,8 +33,11 @@ MODULE_EXT = ".py"
 
 def _on_processor_started():
     """Called on processor started."""
-    cache.clear()
-    tasks_to_be_done.clear()
+    # Processor may be started again, do not add the last run to summaries
+    read_summary.clear()
+    block_counter.clear()
+    # Open it before workers use it in other threads
+    _ = get_visited_index()
     if _config.async_mode:
         from .async_api.read import NewsTask
         from .async_api.read import VideoTask
@@ -63,8 +70,9 @@ def _on_processor_stopped():
     """Called when processor stopped."""
     close_all_answer_sources()
     clean_tasks()
-    tasks_to_be_done.clear()
-    cache.clear()
+    clear_content_queues()
+    close_visited_index()
+    close_http_cache()
     if not _config.debug:
         target_files = ("video.mp4", "qr.png", "video.m3u8", "cookies.json")
         for f in get_cache_path("").iterdir():
@@ -3,108 +3,197 @@
 from time import time
 
 # Relative imports
+from .pool import PagePool
 from .task import do_task
-from asyncio import Task
-from asyncio import TaskGroup
+from asyncio import Queue
+from asyncio import Semaphore
 from asyncio import run
+from asyncio import gather
+from asyncio import to_thread
+from asyncio import create_task
 from ..common import WAIT_PAGE_SECS
-from ..common import TaskQueue
-from ..common import TaskStatus
-from ..common import scores
-from ..common import tasks_to_be_done
-from ..common import set_task_status_by_task_title
-from ..common import create_queues_from_existing_task_titles
+from ..common import WAIT_PROGRESS_SECS
+from ..common import SCORE_PROGRESS_REGEX
+from ..common import get_tasks_to_be_done
 from ...config import get_runtime_config
 from ...events import EventID
+from ...events import isolate_events
 from ...events import find_event_by_id
 from ...logger import info
 from ...logger import debug
 from ...logger import error
 from ...logger import warning
+from ...logger import set_log_prefix
+from functools import partial
 from ...storage import get_cache_path
+from contextlib import suppress
 from ...languages import get_language_string
 from ..common.urls import POINTS_PAGE
+from ..common.launch import get_launch_options
+from ..common.launch import get_context_options
+from ..common.status import STATUS_SCRIPT
+from ..common.status import STATUS_SCRIPT_ARGS
+from ..common.status import StatusCollector
+from ..common.reading import log_read_summary
+from ..common.accounts import DEFAULT_ACCOUNT
+from ..common.accounts import set_current_account
+from ..common.accounts import get_storage_state_path
+from ..common.blocking import BLOCK_PROFILES
+from ..common.blocking import BlockProfile
+from ..common.blocking import should_block
+from ..common.blocking import block_counter
+from ..common.blocking import log_block_summary
+from ..common.progress import parse_progress
+from ..common.httpcache import HttpCache
+from ..common.httpcache import get_ttl
+from ..common.httpcache import is_cacheable
+from ..common.httpcache import get_http_cache
+from ..common.scheduler import TaskNode
+from ..common.scheduler import TaskScheduler
 from ..common.selectors import PointsSelectors
 from playwright.async_api import Page
-from playwright.async_api import Locator
+from playwright.async_api import Error
+from playwright.async_api import Route
+from playwright.async_api import Browser
+from playwright.async_api import Playwright
 from playwright.async_api import BrowserContext
 from playwright.async_api import async_playwright
+from ..common.answer.sources import log_answer_source_health
 
 
 _config = get_runtime_config()
 
 
-async def _is_card_finished(card: Locator) -> bool:
-    progress_value = 0.0
-    progress = card.locator(PointsSelectors.CARD_PROGRESS).first
-    style = await progress.get_attribute("style") or ""
-    if style.startswith("width"):
-        progress_percent = (
-            style.removeprefix("width").replace(":", "").removesuffix(";").strip().removesuffix("%")
-        )
-        try:
-            progress_value = float(progress_percent) / 100
-        except ValueError:
-            warning(get_language_string("core-warning-failed-to-parse-progress"))
-    return progress_value == 1.0
+async def _route_request(route: Route, profile: BlockProfile):
+    request = route.request
+    try:
+        page_url = request.frame.url
+    except Error:
+        # Requests of service workers do not have a frame
+        page_url = ""
+    if should_block(profile, request.resource_type, request.url, page_url):
+        block_counter.record(request.resource_type)
+        await route.abort("blockedbyclient")
+    else:
+        await route.fallback()
 
 
-async def _get_status_from_page(page: Page, close: bool) -> bool:
-    await page.goto(POINTS_PAGE)
-    tasks_to_be_done.clear()
+async def _cache_request(route: Route, cache: HttpCache):
+    request = route.request
+    if not is_cacheable(request.method, request.resource_type, request.url):
+        await route.fallback()
+        return
+    # The cache reads index and files, do not block other pages and accounts
+    cached = await to_thread(cache.get, request.url)
+    try:
+        if cached is not None:
+            headers, body = cached
+            await route.fulfill(status=200, headers=headers, body=body)
+            return
+        response = await route.fetch()
+        body = await response.body()
+        await route.fulfill(response=response, body=body)
+    except Error as e:
+        # Let the browser load it itself, this fails too if the route is already handled
+        debug(get_language_string("core-debug-http-cache-failed") % (request.url, e))
+        with suppress(Error):
+            await route.fallback()
+        return
+    # Cache after fulfilling, so a broken cache never leaves the request pending
+    ttl = get_ttl(response.headers) if response.status == 200 else None
+    if ttl is not None:
+        await to_thread(cache.put, request.url, response.headers, body, ttl)
 
-    points = page.locator(PointsSelectors.POINTS_SPAN)
+
+async def _install_routes(context: BrowserContext):
+    # Routes registered later run first, so blocked requests never reach the cache
+    if _config.http_cache_size_mb > 0:
+        cache = get_http_cache(_config.http_cache_size_mb * 1024 * 1024)
+        await context.route("**/*", partial(_cache_request, cache=cache))
+    profile = BLOCK_PROFILES.get(_config.block_profile)
+    if profile is None:
+        warning(get_language_string("core-warning-unknown-block-profile") % _config.block_profile)
+    elif len(profile.resource_types) > 0 or len(profile.hosts) > 0:
+        await context.route("**/*", partial(_route_request, profile=profile))
+
+
+async def _get_status_from_page(page: Page, collector: StatusCollector) -> bool:
+    # Keep the points page open and reload it instead of opening a new one every round,
+    # progress from API is exact, cards on page only have a rounded width
     try:
-        await points.nth(0).wait_for()
-        await points.nth(1).wait_for()
-        scores[0] = int(await points.nth(0).inner_text())
-        scores[1] = int(await points.nth(1).inner_text())
-    except ValueError:
-        error(get_language_string("core-error-update-score-failed"))
-    else:
-        info(get_language_string("core-info-update-score-success") % tuple(scores))
-
-    cards = page.locator(PointsSelectors.POINTS_CARDS)
-    await cards.last.wait_for()
-    for i in range(await cards.count()):
-        card = cards.nth(i)
-        title = (await card.locator(PointsSelectors.CARD_TITLE).first.inner_text()).strip()
-        if (title in _config.skipped) and not set_task_status_by_task_title(
-            title,
-            TaskStatus.SKIPPED,
-        ):
-            warning(get_language_string("core-warning-failed-to-skip-task") % title)
-        elif (not await _is_card_finished(card)) and (title not in tasks_to_be_done):
-            tasks_to_be_done.append(title)
-    find_event_by_id(EventID.SCORE_UPDATED).invoke(tuple(scores))
-
-    if close and not page.is_closed():
-        await page.close()
-    return len(tasks_to_be_done) == 0
-
-
-async def _finish_queue(queue: TaskQueue, context: BrowserContext, close: bool):
-    debug(
-        get_language_string("core-debug-current-queue") % ", ".join([str(task) for task in queue]),
-    )
+        async with page.expect_response(
+            SCORE_PROGRESS_REGEX,
+            timeout=WAIT_PROGRESS_SECS * 1000,
+        ) as event:
+            if page.url.startswith(POINTS_PAGE):
+                _ = await page.reload()
+            else:
+                _ = await page.goto(POINTS_PAGE)
+        progress = parse_progress(await (await event.value).json())
+    except (Error, ValueError) as e:
+        debug(get_language_string("core-debug-parse-progress-failed") % e)
+        progress = None
+    await page.locator(PointsSelectors.POINTS_SPAN).nth(1).wait_for()
+    await page.locator(PointsSelectors.POINTS_CARDS).last.wait_for()
+    if progress is not None:
+        return collector.apply_progress(progress)
+    return collector.apply(await page.evaluate(STATUS_SCRIPT, STATUS_SCRIPT_ARGS))
+
+
+async def _do_task_in_pool(pool: PagePool, task_title: str) -> bool:
+    page = await pool.acquire()
+    try:
+        return await do_task(page, task_title, close=False)
+    finally:
+        await pool.release(page)
+
+
+async def _finish_node(node: TaskNode, pool: PagePool) -> bool:
+    debug(get_language_string("core-debug-current-queue") % ", ".join(node.titles))
     results: list[bool] = []
-    for task in queue:
-        task_result = await do_task(await context.new_page(), task, close)
-        debug(get_language_string("core-debug-task-result") % (str(task), str(task_result)))
+    for task_title in node.titles:
+        task_result = await _do_task_in_pool(pool, task_title)
+        debug(get_language_string("core-debug-task-result") % (task_title, str(task_result)))
         results.append(task_result)
-    if not all(results):
+    return all(results)
+
+
+async def _finish_scheduler(scheduler: TaskScheduler, pool: PagePool):
+    queue: Queue[TaskNode] = Queue()
+
+    async def work():
+        while True:
+            node = await queue.get()
+            try:
+                result = await _finish_node(node, pool)
+            except Exception as e:
+                error(get_language_string("core-err-process-exception") % e)
+                result = False
+            scheduler.finish(node, result)
+            for ready_node in scheduler.take_ready():
+                queue.put_nowait(ready_node)
+            queue.task_done()
+
+    for node in scheduler.take_ready():
+        queue.put_nowait(node)
+    workers = [create_task(work()) for _ in range(scheduler.budget)]
+    await queue.join()
+    for worker in workers:
+        _ = worker.cancel()
+    if len(scheduler.dropped) > 0 or not all(entry.success for entry in scheduler.timeline):
         warning(get_language_string("core-warning-some-tasks-failed"))
+    scheduler.log_timeline()
 
 
 async def _finish_all(context: BrowserContext, close: bool = True):
-    await do_task(await context.new_page(), "登录", close)
-    while not await _get_status_from_page(await context.new_page(), close):
-        debug(get_language_string("core-debug-task-to-be-done-is") % str(tasks_to_be_done))
-        queues = create_queues_from_existing_task_titles(*tasks_to_be_done)
-        tasks: list[Task[None]] = []
-        async with TaskGroup() as tg:
-            for queue in queues:
-                tasks.append(tg.create_task(_finish_queue(queue, context, close)))
+    collector = StatusCollector()
+    async with PagePool(context, _config.page_budget) as pool:
+        _ = await _do_task_in_pool(pool, "登录")
+        status_page = await context.new_page()
+        tasks_to_be_done = get_tasks_to_be_done()
+        while not await _get_status_from_page(status_page, collector):
+            debug(get_language_string("core-debug-task-to-be-done-is") % str(tasks_to_be_done))
+            await _finish_scheduler(TaskScheduler(pool.size, *tasks_to_be_done), pool)
 
     if close:
         for page in context.pages:
@@ -112,27 +201,65 @@ async def _finish_all(context: BrowserContext, close: bool = True):
                 await page.close()
 
 
-async def _start():
-    start_time = time()
-    async with async_playwright() as p:
-        context = await p[_config.browser_id].launch_persistent_context(
-            user_data_dir=get_cache_path("browser-data") / _config.browser_id,
-            headless=not _config.debug,
-            proxy=_config.proxy,
-            channel=_config.browser_channel,
-            args=["--mute-audio"],
-            devtools=not _config.debug,
-            executable_path=_config.executable_path,
-            firefox_user_prefs={"media.volume_scale": "0.0"},
+async def _finish_account(browser: Browser, semaphore: Semaphore, account: str):
+    # gather() runs every account in its own task, so these only change this account
+    set_current_account(account)
+    isolate_events()
+    if account != DEFAULT_ACCOUNT:
+        set_log_prefix("[%s] " % account)
+    async with semaphore:
+        if account != DEFAULT_ACCOUNT:
+            info(get_language_string("core-info-account-started") % account)
+        state_path = get_storage_state_path(account)
+        context = await browser.new_context(
+            storage_state=state_path if state_path.exists() else None,
+            **get_context_options(_config),
         )
-
         context.set_default_timeout(WAIT_PAGE_SECS * 1000)
+        await _install_routes(context)
         try:
-            await _finish_all(context)
+            await _finish_all(context, close=False)
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            _ = await context.storage_state(path=state_path)
         except Exception as e:
             error(get_language_string("core-err-process-exception") % e)
         finally:
             await context.close()
+
+
+async def _finish_accounts(p: Playwright, accounts: list[str]):
+    # Accounts share one browser, each of them only costs a context
+    browser = await p[_config.browser_id].launch(**get_launch_options(_config))
+    semaphore = Semaphore(max(_config.account_concurrency, 1))
+    try:
+        _ = await gather(
+            *[_finish_account(browser, semaphore, account) for account in dict.fromkeys(accounts)],
+        )
+    finally:
+        await browser.close()
+
+
+async def _start():
+    start_time = time()
+    async with async_playwright() as p:
+        if len(_config.accounts) > 0 or not _config.persistent_profile:
+            # Without profile, the login state is restored from storage state
+            await _finish_accounts(p, _config.accounts or [DEFAULT_ACCOUNT])
+        else:
+            context = await p[_config.browser_id].launch_persistent_context(
+                user_data_dir=get_cache_path("browser-data") / _config.browser_id,
+                **get_launch_options(_config),
+                **get_context_options(_config),
+            )
+
+            context.set_default_timeout(WAIT_PAGE_SECS * 1000)
+            await _install_routes(context)
+            try:
+                await _finish_all(context)
+            except Exception as e:
+                error(get_language_string("core-err-process-exception") % e)
+            finally:
+                await context.close()
     delta_mins, delta_secs = divmod(time() - start_time, 60)
     delta_hrs, delta_mins = divmod(delta_mins, 60)
     finish_str = get_language_string("core-info-all-finished").format(
@@ -141,6 +268,9 @@ async def _start():
         int(delta_secs),
     )
     info(finish_str)
+    log_answer_source_health()
+    log_read_summary()
+    log_block_summary()
     find_event_by_id(EventID.FINISHED).invoke(finish_str)
 
 
@@ -9,13 +9,20 @@ from ..common import CHECK_ELEMENT_TIMEOUT_SECS
 from ...events import EventID
 from ...events import find_event_by_id
 from ...logger import info
+from ...logger import debug
 from ...logger import error
 from ...storage import get_cache_path
 from ...languages import get_language_string
 from ..common.urls import LOGIN_PAGE
+from ..common.urls import SCORE_PROGRESS_API
+from ..common.session import is_logged_in
+from ..common.accounts import get_current_account
+from ..common.accounts import get_account_file_name
+from ..common.accounts import get_storage_state_path
 from typing_extensions import override
 from ..common.selectors import LoginSelectors
 from playwright.async_api import Page
+from playwright.async_api import Error
 from playwright.async_api import Locator
 from playwright.async_api import TimeoutError
 
@@ -35,12 +42,18 @@ class LoginTask(Task):
 
     @override
     async def __aenter__(self) -> Self:
-        await self.last_page.goto(LOGIN_PAGE)
-        await self.last_page.bring_to_front()
+        # Check saved session before opening any page, login page is slow
+        self._session_valid = await self._check_session()
+        if not self._session_valid:
+            await self.last_page.goto(LOGIN_PAGE)
+            await self.last_page.bring_to_front()
         return self
 
     @override
     async def finish(self) -> bool:
+        if self._session_valid:
+            info(get_language_string("core-info-session-reuse-success"))
+            return True
         success = False
         if await self._wait_locator(
             self.last_page.locator(LoginSelectors.LOGIN_CHECK).first,
@@ -86,8 +99,27 @@ class LoginTask(Task):
                         find_event_by_id(EventID.QR_UPDATED).invoke("".encode())
                         success = True
 
+        if success:
+            await self._save_session()
         return success
 
+    async def _check_session(self) -> bool:
+        try:
+            response = await self.last_page.context.request.get(
+                SCORE_PROGRESS_API,
+                timeout=CHECK_ELEMENT_TIMEOUT_SECS * 1000,
+            )
+            payload = await response.json() if response.ok else None
+        except (Error, ValueError) as e:
+            debug(get_language_string("core-debug-session-check-failed") % e)
+            return False
+        return is_logged_in(response.status, payload)
+
+    async def _save_session(self):
+        path = get_storage_state_path(get_current_account())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ = await self.last_page.context.storage_state(path=path)
+
     async def _on_timeout(
         self,
         failed_times: int,
@@ -113,7 +145,7 @@ class LoginTask(Task):
             image_src_data = image_src_type_and_data[1]
             if image_src_type.endswith("base64"):
                 image_src_bytes = b64decode(image_src_data)
-                with get_cache_path("qr.png").open("wb") as writer:
+                with get_cache_path(get_account_file_name("qr.png")).open("wb") as writer:
                     writer.write(image_src_bytes)
                 return image_src_bytes
         raise RuntimeError("Not a valid image locator")
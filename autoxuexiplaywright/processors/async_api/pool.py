@@ -0,0 +1,113 @@
+"""Classes for reusing pages in async mode."""
+
+from types import TracebackType
+from typing import Self
+
+# Relative imports
+from asyncio import Queue
+from asyncio import gather
+from ...logger import debug
+from ...languages import get_language_string
+from playwright.async_api import Page
+from playwright.async_api import Error
+from playwright.async_api import BrowserContext
+
+
+BLANK_PAGE = "about:blank"
+
+
+class PagePool:
+    """A bounded pool of pages in a browser context.
+
+    Pages are created before they are needed and reset to a blank page when they are
+    released, so tasks do not pay for creating pages and the number of pages
+    opened by the pool never exceeds `size`.
+    """
+
+    def __init__(self, context: BrowserContext, size: int):
+        """Create a PagePool instance, use `async with` to warm and close it.
+
+        Args:
+            context (BrowserContext): The context where pages are created
+            size (int): Max pages in pool
+        """
+        self.context = context
+        self.size = max(size, 1)
+        self._idle: Queue[Page] = Queue()
+        self._pages: set[Page] = set()
+        self._creating = 0
+
+    async def warm(self):
+        """Fill the pool, pages already opened in context are reused."""
+        for page in self.context.pages:
+            if len(self._pages) < self.size and page not in self._pages:
+                self._add(page)
+        _ = await gather(*[self._create() for _ in range(self.size - self._count)])
+
+    async def acquire(self) -> Page:
+        """Get a page, wait until a page is released if all pages are used.
+
+        Returns:
+            Page: The page
+        """
+        if self._idle.empty() and self._count < self.size:
+            await self._create()
+        return await self._idle.get()
+
+    async def release(self, page: Page):
+        """Reset the page and put it back.
+
+        Closed or broken pages are replaced with new ones.
+
+        Args:
+            page (Page): The page from `acquire()`
+        """
+        if not page.is_closed():
+            try:
+                _ = await page.goto(BLANK_PAGE)
+            except Error as e:
+                debug(get_language_string("core-debug-reset-page-failed") % e)
+                await page.close()
+            else:
+                self._idle.put_nowait(page)
+                return
+        self._pages.discard(page)
+        await self._create()
+
+    async def close(self):
+        """Close all pages in pool."""
+        for page in self._pages:
+            if not page.is_closed():
+                await page.close()
+        self._pages.clear()
+
+    async def __aenter__(self) -> Self:
+        """Implements context manager."""
+        await self.warm()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[Exception] | None,
+        exc_value: Exception | None,
+        trace_back: TracebackType | None,
+    ):
+        """Implements context manager."""
+        await self.close()
+
+    @property
+    def _count(self) -> int:
+        return len(self._pages) + self._creating
+
+    def _add(self, page: Page):
+        self._pages.add(page)
+        self._idle.put_nowait(page)
+
+    async def _create(self):
+        # Count the page before awaiting so concurrent calls do not exceed size
+        self._creating += 1
+        try:
+            page = await self.context.new_page()
+        finally:
+            self._creating -= 1
+        self._add(page)
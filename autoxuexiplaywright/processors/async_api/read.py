@@ -1,5 +1,7 @@
 """Classes and functions for handling read task."""
 
+from re import Pattern
+from abc import abstractmethod
 from time import time
 
 # Relative imports
@@ -8,75 +10,209 @@ from .task import TaskStatus
 from random import randint
 from random import uniform
 from typing import Self
+from asyncio import Lock
+from asyncio import gather
 from ..common import READ_TIME_SECS
+from ..common import NEWS_PAGE_REGEX
+from ..common import VIDEO_PAGE_REGEX
+from ..common import CONTENT_LIST_REGEX
 from ..common import READ_SLEEPS_MAX_SECS
 from ..common import READ_SLEEPS_MIN_SECS
-from ..common import cache
 from ..common import clean_string
+from ...config import get_runtime_config
 from ...logger import info
 from ...logger import debug
 from ...logger import error
 from ...logger import warning
 from ...languages import get_language_string
+from ..common.scan import ROWS_SCRIPT
+from ..common.scan import NEWS_ROWS_ARGS
+from ..common.scan import VIDEO_ROWS_ARGS
+from ..common.scan import parse_rows
+from ..common.scan import find_unvisited_row
 from ..common.urls import MAIN_PAGE
+from ..common.content import get_content_queue
+from ..common.content import parse_content_list
+from ..common.reading import plan_read
+from ..common.reading import record_read
+from ..common.visited import get_visited_index
 from typing_extensions import override
 from ..common.selectors import Selectors
 from ..common.selectors import ReadSelectors
+from playwright.async_api import Page
+from playwright.async_api import Error
 from playwright.async_api import Locator
+from playwright.async_api import Response
 from playwright.async_api import TimeoutError
 
 
+_config = get_runtime_config()
+
+
 class _ReadTask(Task):
     @property
     @override
     def requires(self) -> list[str]:
         return ["登录"]
 
+    @override
+    def ready(self, page: Page, task_title: str, close: bool = True) -> Self:
+        self._task_title = task_title
+        self._plan = plan_read(task_title)
+        self._start_time = time()
+        self._open_secs = 0.0
+        self._list_page: Page | None = None
+        self._queue = get_content_queue(type(self).__name__, self._page_regex)
+        return super().ready(page, task_title, close)
+
+    @override
+    async def __aenter__(self) -> Self:
+        if self._plan.items == 0:
+            info(get_language_string("core-info-read-skipped") % self._task_title)
+            return self
+        info(
+            get_language_string("core-info-read-plan")
+            % (self._task_title, self._plan.items, self._plan.dwell_secs),
+        )
+        self._first_item = await self._open_next()
+        if self._first_item is None:
+            self.status = TaskStatus.FAILED
+        self._open_secs = time() - self._start_time
+        return self
+
     @override
     async def finish(self) -> bool:
-        scroll_paragraphs_in_order = True
-        scroll_video_subtitles_in_order = True
-        start_time = time()
-        while (time() - start_time) <= READ_TIME_SECS:
-            await self.last_page.wait_for_timeout(
-                uniform(READ_SLEEPS_MIN_SECS, READ_SLEEPS_MAX_SECS) * 1000,
-            )
-            try:
-                player = self.last_page.locator(ReadSelectors.VIDEO_PLAYER)
-                if await player.count() > 0:
-                    await player.last.wait_for(timeout=READ_TIME_SECS * 1000)
-                    for i in range(await player.count()):
-                        if await player.nth(i).locator(ReadSelectors.REPLAY_BTN).count() == 0:
-                            await player.nth(i).hover()
-                            play_btn = player.nth(i).locator(ReadSelectors.PLAY_BTN)
-                            if "playing" not in (await play_btn.get_attribute("class") or ""):
-                                await play_btn.click()
-
-                await self._scroll_elements(
-                    self.last_page.locator(ReadSelectors.VIDEO_SUBTITLE),
-                    scroll_video_subtitles_in_order,
-                )
-                scroll_video_subtitles_in_order = False
+        if self._plan.items == 0:
+            record_read(self._task_title, self._plan, self._open_secs, time() - self._start_time)
+            return True
+        if self._first_item is None:
+            return False
+        # Read items in parallel tabs, a tab opens the next item when it finished its own
+        self._items_left = self._plan.items - 1
+        self._open_lock = Lock()
+        tabs = min(max(_config.read_tabs, 1), self._plan.items)
+        results = await gather(
+            self._read_items(self._first_item),
+            *[self._read_items(None) for _ in range(tabs - 1)],
+        )
+        record_read(self._task_title, self._plan, self._open_secs, time() - self._start_time)
+        return all(results)
 
-                await self._scroll_elements(
-                    self.last_page.locator(ReadSelectors.PAGE_PARAGRAPHS),
-                    scroll_paragraphs_in_order,
-                )
-                scroll_paragraphs_in_order = False
-            except TimeoutError:
-                pass
-            except Exception as e:
-                debug(get_language_string("core-debug-read-failed") % e)
+    @property
+    @abstractmethod
+    def _page_regex(self) -> Pattern[str]:
+        """The pattern of urls of items read by this task."""
+
+    @abstractmethod
+    async def _open_list(self):
+        """Open the list of items, the list page is the last page after this."""
+
+    @abstractmethod
+    async def _open_from_list(self, list_page: Page) -> Page | None:
+        """Open the first item not read in list page.
+
+        Args:
+            list_page (Page): The page from `_open_list()`
+
+        Returns:
+            Page | None: The page of item, None if there is no item
+        """
+
+    async def _open_next(self) -> Page | None:
+        # Items found in list data are opened directly, the list is only opened when
+        # nothing is queued, and it fills the queue for later items
+        item = self._queue.pop()
+        if item is None:
+            if self._list_page is None:
+                await self._open_list()
+                self._list_page = self.last_page
+            return await self._open_from_list(self._list_page)
+        info(get_language_string("core-info-processing-content") % item.title)
+        page = await self.pages[0].context.new_page()
+        self.pages.append(page)
+        _ = await page.goto(item.url)
+        get_visited_index().add(item.title, item.url)
+        return page
+
+    def _watch_list(self, page: Page) -> Page:
+        page.on("response", self._on_list_response)
+        return page
+
+    async def _on_list_response(self, response: Response):
+        if CONTENT_LIST_REGEX.match(response.url) is None:
+            return
+        try:
+            count = self._queue.put_many(parse_content_list(await response.json()))
+        except (Error, ValueError) as e:
+            debug(get_language_string("core-debug-parse-content-list-failed") % e)
+            return
+        debug(get_language_string("core-debug-content-queued") % count)
+
+    async def _read_items(self, page: Page | None) -> bool:
+        while True:
+            if page is None:
+                # Only one tab can click on list page at the same time
+                async with self._open_lock:
+                    if self._items_left <= 0:
+                        return True
+                    self._items_left -= 1
+                    page = await self._open_next()
+                if page is None:
+                    return False
+            result = await self._read(page, self._plan.dwell_secs)
+            await page.close()
+            if not result:
                 return False
+            page = None
+
+    async def _read(self, page: Page, dwell_secs: float) -> bool:
+        in_order = True
+        start_time = time()
+        while (time() - start_time) <= dwell_secs:
+            if not await self._read_step(page, in_order, start_time + dwell_secs):
+                return False
+            in_order = False
         return True
 
-    async def _scroll_elements(self, elements: Locator, order: bool):
+    async def _read_step(self, page: Page, in_order: bool, deadline: float) -> bool:
+        await page.wait_for_timeout(uniform(READ_SLEEPS_MIN_SECS, READ_SLEEPS_MAX_SECS) * 1000)
+        try:
+            player = page.locator(ReadSelectors.VIDEO_PLAYER)
+            if await player.count() > 0:
+                await player.last.wait_for(timeout=READ_TIME_SECS * 1000)
+                for i in range(await player.count()):
+                    if await player.nth(i).locator(ReadSelectors.REPLAY_BTN).count() == 0:
+                        await player.nth(i).hover()
+                        play_btn = player.nth(i).locator(ReadSelectors.PLAY_BTN)
+                        if "playing" not in (await play_btn.get_attribute("class") or ""):
+                            await play_btn.click()
+            await self._scroll_elements(
+                page.locator(ReadSelectors.VIDEO_SUBTITLE),
+                in_order,
+                deadline,
+            )
+            await self._scroll_elements(
+                page.locator(ReadSelectors.PAGE_PARAGRAPHS),
+                in_order,
+                deadline,
+            )
+        except TimeoutError:
+            pass
+        except Exception as e:
+            debug(get_language_string("core-debug-read-failed") % e)
+            return False
+        return True
+
+    async def _scroll_elements(self, elements: Locator, in_order: bool, deadline: float):
         if await elements.count() > 0:
             for i in range(await elements.count()):
-                await self.last_page.wait_for_timeout(
+                if time() > deadline:
+                    # Do not stay longer than needed
+                    return
+                await elements.page.wait_for_timeout(
                     timeout=uniform(READ_SLEEPS_MIN_SECS, READ_SLEEPS_MAX_SECS) * 1000,
                 )
-                if order:
+                if in_order:
                     await elements.nth(i).scroll_into_view_if_needed()
                 else:
                     await elements.nth(
@@ -92,46 +228,52 @@ class NewsTask(_ReadTask):
     def handles(self) -> list[str]:
         return ["我要选读文章"]
 
+    @property
     @override
-    async def __aenter__(self) -> Self:
+    def _page_regex(self) -> Pattern[str]:
+        return NEWS_PAGE_REGEX
+
+    @override
+    async def _open_list(self):
         await self.last_page.goto(MAIN_PAGE)
         title_span = self.last_page.locator(ReadSelectors.NEWS_TITLE_SPAN).first
         await title_span.wait_for()
-        async with self.last_page.context.expect_page() as event:
+        async with self.last_page.expect_popup() as event:
             await title_span.click()
-        self.pages.append(await event.value)
-        news_list = self.last_page.locator(ReadSelectors.NEWS_LIST)
+        self.pages.append(self._watch_list(await event.value))
+
+    @override
+    async def _open_from_list(self, list_page: Page) -> Page | None:
+        news_list = list_page.locator(ReadSelectors.NEWS_LIST)
         await news_list.last.wait_for()
         news_title = await self._get_first_available_news_title(news_list)
         while not news_title:
-            next_btn = self.last_page.locator(ReadSelectors.NEXT_PAGE)
+            next_btn = list_page.locator(ReadSelectors.NEXT_PAGE)
             warning(get_language_string("core-warning-no-news-on-current-page"))
             if await next_btn.count() == 0:
-                # No more page(s) for news, mark task failed and end this function
+                # No more page(s) for news
                 error(get_language_string("core-error-no-available-news"))
-                self.status = TaskStatus.FAILED
-                return self
+                return None
             await next_btn.first.click()
-            await self.last_page.locator(Selectors.LOADING).wait_for(state="hidden")
+            await list_page.locator(Selectors.LOADING).wait_for(state="hidden")
             news_title = await self._get_first_available_news_title(news_list)
         info(
             get_language_string("core-info-processing-news")
             % clean_string(await news_title.inner_text()),
         )
-        async with self.last_page.context.expect_page() as event:
+        async with list_page.expect_popup() as event:
             await news_title.click()
-        self.pages.append(await event.value)
-        cache.add(clean_string(await news_title.inner_text()))
-
-        return self
+        page = await event.value
+        self.pages.append(page)
+        get_visited_index().add(await news_title.inner_text())
+        return page
 
     async def _get_first_available_news_title(self, news_list: Locator) -> Locator | None:
-        for i in range(await news_list.count()):
-            news = news_list.nth(i)
-            title_element = news.locator(ReadSelectors.NEWS_TITLE_TEXT)
-            if clean_string(await title_element.inner_text()) not in cache:
-                return title_element
-        return None
+        rows = parse_rows(await news_list.evaluate_all(ROWS_SCRIPT, NEWS_ROWS_ARGS))
+        index = find_unvisited_row(rows, get_visited_index())
+        if index is None:
+            return None
+        return news_list.nth(index).locator(ReadSelectors.NEWS_TITLE_TEXT)
 
 
 class VideoTask(_ReadTask):
@@ -142,42 +284,47 @@ class VideoTask(_ReadTask):
     def handles(self) -> list[str]:
         return ["视听学习", "视听学习时长", "我要视听学习"]
 
+    @property
+    @override
+    def _page_regex(self) -> Pattern[str]:
+        return VIDEO_PAGE_REGEX
+
     @override
-    async def __aenter__(self) -> Self:
+    async def _open_list(self):
         await self.last_page.goto(MAIN_PAGE)
-        async with self.last_page.context.expect_page() as event:
+        async with self.last_page.expect_popup() as event:
             await self.last_page.locator(ReadSelectors.VIDEO_ENTRANCE).first.click()
         self.pages.append(await event.value)
-        async with self.last_page.context.expect_page() as event:
+        async with self.last_page.expect_popup() as event:
             await self.last_page.locator(ReadSelectors.VIDEO_LIBRARY).first.click()
-        self.pages.append(await event.value)
-        text_wrappers = self.last_page.locator(ReadSelectors.VIDEO_TEXT_WRAPPER)
+        self.pages.append(self._watch_list(await event.value))
+
+    @override
+    async def _open_from_list(self, list_page: Page) -> Page | None:
+        text_wrappers = list_page.locator(ReadSelectors.VIDEO_TEXT_WRAPPER)
         await text_wrappers.last.wait_for()
         text_wrapper = await self._get_first_available_video_title(text_wrappers)
         while not text_wrapper:
-            next_btn = self.last_page.locator(ReadSelectors.NEXT_PAGE)
+            next_btn = list_page.locator(ReadSelectors.NEXT_PAGE)
             warning(get_language_string("core-warning-no-videos-on-current-page"))
             if await next_btn.count() == 0:
                 error(get_language_string("core-error-no-available-videos"))
-                self.status = TaskStatus.FAILED
-                return self
+                return None
             await next_btn.first.click()
-            await self.last_page.locator(Selectors.LOADING).wait_for(state="hidden")
+            await list_page.locator(Selectors.LOADING).wait_for(state="hidden")
             text_wrapper = await self._get_first_available_video_title(text_wrappers)
         info(
             get_language_string("core-info-processing-video")
             % clean_string(await text_wrapper.inner_text()),
         )
-        async with self.last_page.context.expect_page() as event:
+        async with list_page.expect_popup() as event:
             await text_wrapper.click()
-        self.pages.append(await event.value)
-        cache.add(clean_string(await text_wrapper.inner_text()))
-
-        return self
+        page = await event.value
+        self.pages.append(page)
+        get_visited_index().add(await text_wrapper.inner_text())
+        return page
 
     async def _get_first_available_video_title(self, video_list: Locator) -> Locator | None:
-        for i in range(await video_list.count()):
-            video = video_list.nth(i)
-            if clean_string(await video.inner_text()) not in cache:
-                return video
-        return None
+        rows = parse_rows(await video_list.evaluate_all(ROWS_SCRIPT, VIDEO_ROWS_ARGS))
+        index = find_unvisited_row(rows, get_visited_index())
+        return None if index is None else video_list.nth(index)
@@ -30,7 +30,8 @@ class Task(AbstractBaseTask):
         Args:
             page(Page): The page to work on
             task_title(str): The task's name
-            close(bool): Close the page after finished, defaults to True
+            close(bool): Close the page after finished, defaults to True.
+                Other pages opened by task are always closed
         """
         self.pages = [page]
         self.close = close
@@ -65,8 +66,10 @@ class Task(AbstractBaseTask):
         trace_back: TracebackType | None,
     ) -> bool:
         """Implements context manager."""
-        if self.close and not all(page.is_closed() for page in self.pages):
-            [await page.close() for page in self.pages]
+        # Pages opened by task are always closed, the first one is given by caller
+        for page in self.pages if self.close else self.pages[1:]:
+            if not page.is_closed():
+                await page.close()
         if self.status == TaskStatus.READY:
             self.status = TaskStatus.SUCCESS
         return all(not exc for exc in [exc_type, exc_value, trace_back])
@@ -1,18 +1,22 @@
 """Classes and functions for handling test."""
 
 # Relative imports
+from abc import abstractmethod
 from .task import Task
 from .task import TaskStatus
 from queue import Queue
+from types import TracebackType
 from random import randint
 from random import uniform
 from typing import Self
 from ..common import ANSWER_CONNECTOR
 from ..common import WAIT_CHOICE_SECS
 from ..common import WAIT_RESULT_SECS
+from ..common import PAPER_REQUEST_REGEX
 from ..common import VIDEO_REQUEST_REGEX
 from ..common import ANSWER_SLEEP_MAX_SECS
 from ..common import ANSWER_SLEEP_MIN_SECS
+from ..common import HINT_ANSWER_CONFIDENCE
 from ..common import clean_string
 from .captcha import handle_drag_captcha
 from ...config import get_runtime_config
@@ -25,18 +29,32 @@ from ...logger import warning
 from ...storage import get_cache_path
 from ...languages import get_language_string
 from urllib.parse import urlparse
+from ..common.scan import ROWS_SCRIPT
+from ..common.scan import WEEK_ROWS_ARGS
+from ..common.scan import SPECIAL_ROWS_ARGS
+from ..common.scan import parse_rows
+from ..common.scan import find_unmarked_row
+from ..common.scan import find_marker_without
 from ..common.urls import DAILY_EXAM_PAGE
 from ..common.urls import WEEKLY_EXAM_PAGE
 from ..common.urls import SPECIAL_EXAM_PAGE
+from ..common.paper import PaperQuestion
+from ..common.paper import parse_paper
+from ..common.paper import find_paper_question
 from typing_extensions import override
 from ..common.selectors import Selectors
 from ..common.selectors import TestSelectors
+from playwright.async_api import Page
 from playwright.async_api import Locator
+from playwright.async_api import Response
 from playwright.async_api import TimeoutError
+from ..common.answer.utils import parse_solution
 from ..common.answer.utils import is_valid_answer
 from ..common.answer.utils import gen_random_string
+from ..common.answer.sources import report_wrong_answer
+from ..common.answer.sources import prefetch_answers_async
 from ..common.answer.sources import add_answer_to_all_sources
-from ..common.answer.sources import find_answer_in_answer_sources
+from ..common.answer.sources import find_answer_in_answer_sources_async
 
 
 _config = get_runtime_config()
@@ -48,6 +66,67 @@ class _TestTask(Task):
     def requires(self) -> list[str]:
         return ["登录"]
 
+    @override
+    def ready(self, page: Page, task_title: str, close: bool = True) -> Self:
+        self._paper: list[PaperQuestion] = []
+        self._paper_index = 0
+        if _config.capture_paper:
+            page.on("response", self._on_response)
+        return super().ready(page, task_title, close)
+
+    @override
+    async def __aexit__(
+        self,
+        exc_type: type[Exception] | None,
+        exc_value: Exception | None,
+        trace_back: TracebackType | None,
+    ) -> bool:
+        self._stop_capture()
+        return await super().__aexit__(exc_type, exc_value, trace_back)
+
+    @override
+    async def __aenter__(self) -> Self:
+        try:
+            await self._open_test()
+        except BaseException:
+            # __aexit__ is not called when entering failed
+            self._stop_capture()
+            raise
+        return self
+
+    @abstractmethod
+    async def _open_test(self):
+        """Open the test page, set `status` to `TaskStatus.FAILED` if there is no test."""
+
+    def _stop_capture(self):
+        if _config.capture_paper:
+            # The page may be reused by other tasks
+            self.pages[0].remove_listener("response", self._on_response)
+
+    async def _on_response(self, response: Response):
+        if PAPER_REQUEST_REGEX.match(response.url) is None:
+            return
+        try:
+            paper = parse_paper(await response.json())
+        except Exception as e:
+            debug(get_language_string("core-debug-parse-paper-failed") % e)
+            return
+        if len(paper) > 0:
+            debug(get_language_string("core-debug-paper-captured") % len(paper))
+            self._paper = paper
+            self._paper_index = 0
+            await prefetch_answers_async([question.title for question in paper])
+
+    def _get_paper_question(self, title: str) -> PaperQuestion | None:
+        # Title on page is always used, the paper only gives hints of the same question
+        index = find_paper_question(self._paper, self._paper_index, title)
+        if index is None:
+            if len(self._paper) > 0:
+                debug(get_language_string("core-debug-paper-question-mismatch") % title)
+            return None
+        self._paper_index = index
+        return self._paper[index]
+
     @override
     async def finish(self) -> bool:
         while not await self._is_test_finished():
@@ -59,9 +138,12 @@ class _TestTask(Task):
             title_element = question.locator(TestSelectors.QUESTION_TITLE).last
             await title_element.scroll_into_view_if_needed()
             title = clean_string(await title_element.inner_text())
+            paper_question = self._get_paper_question(title)
             info(get_language_string("core-info-current-question-title") % title)
             tips = [title]
-            match await choices.count():
+            options: list[str] = []
+            choices_count = await choices.count()
+            match choices_count:
                 case 0:
                     # Blank
                     items_to_answer = question.locator(TestSelectors.BLANK)
@@ -69,27 +151,42 @@ class _TestTask(Task):
                 case 1:
                     # Choice
                     items_to_answer = choices.locator(TestSelectors.ANSWER_ITEM)
+                    options = [
+                        clean_string(item) for item in await items_to_answer.all_inner_texts()
+                    ]
                     tips.append(
                         get_language_string("core-available-answers")
-                        + ANSWER_CONNECTOR.join(
-                            [
-                                clean_string(item)
-                                for item in await items_to_answer.all_inner_texts()
-                            ],
-                        ),
+                        + ANSWER_CONNECTOR.join(options),
                     )
                     debug(get_language_string("core-debug-current-question-type-choice"))
                 case _:
                     self.status = TaskStatus.FAILED
                     return False
-            if not await self._do_answer(items_to_answer, await choices.count() == 0, tips):
+            if not await self._do_answer(
+                items_to_answer,
+                choices_count == 0,
+                tips,
+                options,
+                paper_question.hints if paper_question else None,
+            ):
                 error(get_language_string("core-error-answer-failed"))
+            self._paper_index += 1
             await self._go_to_next_question()
             if await self.last_page.locator(TestSelectors.TEST_SOLUTION).count() > 0:
                 error(get_language_string("core-error-answer-is-wrong") % title)
+                await self._learn_from_solution(title, options)
                 await self._go_to_next_question()
         return True
 
+    async def _learn_from_solution(self, title: str, options: list[str]):
+        solution = self.last_page.locator(TestSelectors.TEST_SOLUTION).first
+        answers = parse_solution(await solution.inner_text(), options)
+        if len(answers) > 0:
+            info(get_language_string("core-info-answer-learned") % (title, answers))
+            add_answer_to_all_sources(title, answers)
+        else:
+            report_wrong_answer(title)
+
     async def _get_answer_from_page(self) -> list[str]:
         answer_on_page: list[str] = []
         tips = self.last_page.locator(TestSelectors.QUESTION).locator(TestSelectors.TIPS)
@@ -143,38 +240,37 @@ class _TestTask(Task):
         elements: Locator,
         blank: bool,
         tips: list[str],
-        title: str | None = None,
+        options: list[str],
+        hints: list[str] | None = None,
     ) -> bool:
         async def do_answer(answers: list[str]) -> bool:
             handled = False
             if len(answers) > 0:
-                if len(answers) > await elements.count():
+                elements_count = await elements.count()
+                if len(answers) > elements_count:
                     warning(get_language_string("core-warning-too-much-answers"))
                 debug(get_language_string("core-debug-final-answer-list") % answers)
 
                 for i in range(len(answers)):
                     if blank:
-                        if i <= await elements.count():
+                        if i < elements_count:
                             debug(get_language_string("core-debug-filling-blank"))
                             await self._fill_blank(elements.nth(i), answers[i])
                             handled = True
                     else:
-                        for j in range(await elements.count()):
-                            if answers[i] in clean_string(await elements.nth(j).inner_text()):
-                                debug(
-                                    get_language_string("core-debug-choosing-choice")
-                                    % elements.nth(j),
-                                )
+                        for j, option in enumerate(options):
+                            if answers[i] in option:
+                                debug(get_language_string("core-debug-choosing-choice") % option)
                                 await self._chose_answer(elements.nth(j))
                                 handled = True
             return handled
 
-        if not title:
-            title = tips[0]
-        if await do_answer(find_answer_in_answer_sources(title)):
+        title = tips[0]
+        if await do_answer(await find_answer_in_answer_sources_async(title)):
             return True
-        answer_from_page = await self._get_answer_from_page()
+        answer_from_page = hints or await self._get_answer_from_page()
         if await do_answer(answer_from_page):
+            add_answer_to_all_sources(title, answer_from_page, HINT_ANSWER_CONFIDENCE)
             return True
         error(get_language_string("core-error-no-answer-found"))
         tips.append(
@@ -188,8 +284,8 @@ class _TestTask(Task):
         if blank:
             for i in range(await elements.count()):
                 await self._fill_blank(elements.nth(i), gen_random_string())
-        else:
-            await self._chose_answer(elements.nth(randint(0, await elements.count())))
+        elif len(options) > 0:
+            await self._chose_answer(elements.nth(randint(0, len(options) - 1)))
         return False
 
     async def _handle_captcha(self) -> bool:
@@ -270,10 +366,9 @@ class DailyTestTask(_TestTask):
         return ["每日答题"]
 
     @override
-    async def __aenter__(self) -> Self:
+    async def _open_test(self):
         await self.last_page.goto(DAILY_EXAM_PAGE)
         info(get_language_string("core-info-processing-daily-test"))
-        return self
 
 
 class WeeklyTestTask(_TestTask):
@@ -285,7 +380,7 @@ class WeeklyTestTask(_TestTask):
         return ["每周答题"]
 
     @override
-    async def __aenter__(self) -> Self:
+    async def _open_test(self):
         await self.last_page.goto(WEEKLY_EXAM_PAGE)
         await self.last_page.locator(Selectors.LOADING).wait_for(state="hidden")
         weeks = self.last_page.locator(TestSelectors.TEST_WEEKS)
@@ -297,22 +392,18 @@ class WeeklyTestTask(_TestTask):
             if (await next_btn.get_attribute("aria-disabled") or "") == "true":
                 error(get_language_string("core-error-no-available-test"))
                 self.status = TaskStatus.FAILED
-                return self
+                return
             await next_btn.first.click()
             await self.last_page.locator(Selectors.LOADING).wait_for(state="hidden")
             week = await self._get_first_available_week(weeks)
         title = clean_string(await week.locator(TestSelectors.TEST_WEEK_TITLE).inner_text())
         info(get_language_string("core-info-processing-weekly-test") % title)
         await week.locator(TestSelectors.TEST_BTN).click()
-        return self
 
     async def _get_first_available_week(self, weeks: Locator) -> Locator | None:
-        for i in range(await weeks.count()):
-            week = weeks.nth(i)
-            stat = await week.locator(TestSelectors.TEST_WEEK_STAT).get_attribute("class") or "done"
-            if "done" not in stat:
-                return week
-        return None
+        rows = parse_rows(await weeks.evaluate_all(ROWS_SCRIPT, WEEK_ROWS_ARGS))
+        index = find_marker_without(rows, "done")
+        return None if index is None else weeks.nth(index)
 
 
 class SpecialTestTask(_TestTask):
@@ -324,7 +415,7 @@ class SpecialTestTask(_TestTask):
         return ["专项答题"]
 
     @override
-    async def __aenter__(self) -> Self:
+    async def _open_test(self):
         await self.last_page.goto(SPECIAL_EXAM_PAGE)
         await self.last_page.locator(Selectors.LOADING).wait_for(state="hidden")
         items = self.last_page.locator(TestSelectors.TEST_ITEMS)
@@ -336,7 +427,7 @@ class SpecialTestTask(_TestTask):
             if (await next_btn.get_attribute("aria-disabled") or "") == "true":
                 error(get_language_string("core-error-no-available-test"))
                 self.status = TaskStatus.FAILED
-                return self
+                return
             await next_btn.first.click()
             await self.last_page.locator(Selectors.LOADING).wait_for(state="hidden")
             item = await self._get_first_available_item(items)
@@ -352,11 +443,8 @@ class SpecialTestTask(_TestTask):
         )
         info(get_language_string("core-info-processing-special-test") % title)
         await item.locator(TestSelectors.TEST_BTN).click()
-        return self
 
     async def _get_first_available_item(self, items: Locator) -> Locator | None:
-        for i in range(await items.count()):
-            item = items.nth(i)
-            if await item.locator(TestSelectors.TEST_SPECIAL_SOLUTION).count() == 0:
-                return item
-        return None
+        rows = parse_rows(await items.evaluate_all(ROWS_SCRIPT, SPECIAL_ROWS_ARGS))
+        index = find_unmarked_row(rows)
+        return None if index is None else items.nth(index)
@@ -5,6 +5,9 @@ from abc import ABC
 from abc import abstractmethod
 from enum import Enum
 
+# Relative imports
+from .accounts import AccountLocal
+
 
 class TaskStatus(Enum):
     """Status of task."""
@@ -35,6 +38,8 @@ class AbstractBaseTask(ABC):
 
 
 WAIT_PAGE_SECS = 300
+# Cards on points page are scraped if progress API is not requested in time
+WAIT_PROGRESS_SECS = 60
 RETRY_TIMES = 3
 CHECK_ELEMENT_TIMEOUT_SECS = 5
 WAIT_RESULT_SECS = CHECK_ELEMENT_TIMEOUT_SECS
@@ -42,24 +47,75 @@ WAIT_CHOICE_SECS = CHECK_ELEMENT_TIMEOUT_SECS
 ANSWER_SLEEP_MIN_SECS = 2.0
 ANSWER_SLEEP_MAX_SECS = 5.0
 READ_TIME_SECS = 60
+READ_POINTS_PER_ITEM = 1
+# Rules like 视听学习时长 give a point for every minute
+TIME_RULE_SUFFIX = "时长"
+READ_SECS_PER_TIME_POINT = 60
+VISITED_RETENTION_DAYS = 30
 READ_SLEEPS_MIN_SECS = 2.0
 READ_SLEEPS_MAX_SECS = 5.0
+ANSWER_CACHE_SIZE = 4096
+ANSWER_NEGATIVE_CACHE_SECS = 60
+FUZZY_MATCH_THRESHOLD = 0.85
+FUZZY_ANSWER_MIN_CONFIDENCE = 0.8
+HINT_ANSWER_CONFIDENCE = 0.8
+ANSWER_SERVER_PORT = 18086
+ANSWER_SERVER_POOL_SIZE = 4
+ANSWER_SERVER_BATCH_SECS = 0.02
+SOURCE_HEALTH_WINDOW = 10
+SOURCE_LATENCY_BUDGET_SECS = 3.0
+SOURCE_ERROR_BUDGET = 0.5
+SOURCE_COOLDOWN_SECS = 120
+# Threads querying answer sources, calls ignoring their timeout cannot take more
+SOURCE_MAX_WORKERS = 16
+HTTP_CACHE_DIRNAME = "http-cache"
+HTTP_CACHE_DEFAULT_TTL_SECS = 86400
 
 VIDEO_REQUEST_REGEX = compile("https://.+.(m3u8|mp4)")
+# Daily tests are random papers, weekly and special tests are queried by id
+PAPER_REQUEST_REGEX = compile(
+    r"https://pc-proxy-api\.xuexi\.cn/api/exam/service/"
+    r"(common/deduplicateRandomSearchV\d+|detail/queryV\d+)\?.+",
+)
+SCORE_PROGRESS_REGEX = compile(
+    r"https://pc-proxy-api\.xuexi\.cn/delegate/score/days/listScoreProgress.*",
+)
+CONTENT_LIST_REGEX = compile(r"https://www\.xuexi\.cn/lgdata/.+\.json.*")
+NEWS_PAGE_REGEX = compile(r"https://www\.xuexi\.cn/lgpage/detail/index\.html\?id=")
+VIDEO_PAGE_REGEX = compile(r"https://www\.xuexi\.cn/[0-9a-f]{32}/[0-9a-f]{32}\.html")
+CONTENT_PAGE_REGEX = compile("%s|%s" % (NEWS_PAGE_REGEX.pattern, VIDEO_PAGE_REGEX.pattern))
 
 ANSWER_CONNECTOR = "#"
 
-cache: set[str] = set()
-tasks_to_be_done: list[str] = []
-scores: list[int] = [-1, -1]
+_task_types: list[type[AbstractBaseTask]] = []
+# Tasks remember their pages, so every account has its own instances
+_known_tasks: AccountLocal[list[AbstractBaseTask]] = AccountLocal(
+    lambda: [task_type() for task_type in _task_types],
+)
+_tasks_to_be_done: AccountLocal[list[str]] = AccountLocal(list)
+_scores: AccountLocal[list[int]] = AccountLocal(lambda: [-1, -1])
+
+
+def get_tasks_to_be_done() -> list[str]:
+    """Get titles of tasks to be done of current account.
+
+    Returns:
+        list[str]: The titles, change it in place to update them
+    """
+    return _tasks_to_be_done.get()
 
-TaskQueue = list[str]
 
-_known_tasks: list[AbstractBaseTask] = []
+def get_scores() -> list[int]:
+    """Get total and today scores of current account.
+
+    Returns:
+        list[int]: The total and today scores, -1 means unknown
+    """
+    return _scores.get()
 
 
 def _is_task_registered(task_type: type[AbstractBaseTask]) -> bool:
-    return any(isinstance(task, task_type) for task in _known_tasks)
+    return task_type in _task_types
 
 
 def get_task_by_task_title(task_title: str) -> AbstractBaseTask | None:
@@ -71,7 +127,7 @@ def get_task_by_task_title(task_title: str) -> AbstractBaseTask | None:
     Returns:
         AbstractBaseTask | None: The task instance or None if not found
     """
-    for task in _known_tasks:
+    for task in _known_tasks.get():
         if task_title in task.handles:
             return task
     return None
@@ -90,14 +146,19 @@ def register_tasks(*tasks: type[AbstractBaseTask]) -> bool:
         if _is_task_registered(task):
             results.append(False)
         else:
-            _known_tasks.append(task())
+            _task_types.append(task)
+            for known_tasks in _known_tasks.values():
+                known_tasks.append(task())
             results.append(True)
     return all(results)
 
 
 def clean_tasks():
-    """Remove all the registered tasks."""
+    """Remove all the registered tasks and forget tasks to be done and scores."""
+    _task_types.clear()
     _known_tasks.clear()
+    _tasks_to_be_done.clear()
+    _scores.clear()
 
 
 def set_task_status_by_task_title(task_title: str, status: TaskStatus) -> bool:
@@ -117,29 +178,6 @@ def set_task_status_by_task_title(task_title: str, status: TaskStatus) -> bool:
     return False
 
 
-def create_queues_from_existing_task_titles(*task_titles: str) -> list[TaskQueue]:
-    """Create task queue from titles.
-
-    Args:
-        *task_titles (str): The list of task title
-
-    Returns:
-        list[TaskQueue]: The queues ordered by requires
-    """
-    queues_dict: dict[int, TaskQueue] = {}
-    for task_title in task_titles:
-        task = get_task_by_task_title(task_title)
-        if task:
-            requires_count = len(task.requires)
-            if requires_count in queues_dict:
-                queues_dict[requires_count].append(task_title)
-            else:
-                queues_dict[requires_count] = [task_title]
-    keys = list(queues_dict.keys())
-    keys.sort()
-    return list({key: queues_dict[key] for key in keys}.values())
-
-
 def clean_string(string: str) -> str:
     """Clean the string.
 
@@ -0,0 +1,112 @@
+"""Classes and functions for running many accounts in one browser."""
+
+from typing import Generic
+from typing import TypeVar
+from typing import Callable
+from pathlib import Path
+
+# Relative imports
+from threading import Lock
+from ...storage import get_cache_path
+from contextvars import ContextVar
+
+
+ACCOUNTS_DIRNAME = "accounts"
+DEFAULT_ACCOUNT = ""
+
+_T = TypeVar("_T")
+
+_current_account: ContextVar[str] = ContextVar("current_account", default=DEFAULT_ACCOUNT)
+
+
+def get_current_account() -> str:
+    """Get the account of current context.
+
+    Returns:
+        str: The name of account, `DEFAULT_ACCOUNT` if no account is set
+    """
+    return _current_account.get()
+
+
+def set_current_account(name: str):
+    """Set the account of current context.
+
+    **Note**: Every asyncio task has its own copy of context, so setting it in a task
+              does not change the account of other tasks
+
+    Args:
+        name (str): The name of account
+    """
+    _ = _current_account.set(name)
+
+
+def get_storage_state_path(name: str) -> Path:
+    """Get the path of storage state file of account.
+
+    **Note**: The file may not be exist
+
+    Args:
+        name (str): The name of account
+
+    Returns:
+        Path: The full path
+    """
+    return get_cache_path(ACCOUNTS_DIRNAME) / ("%s.json" % (name or "default"))
+
+
+def get_account_file_name(name: str) -> str:
+    """Add account of current context to a file name, like `alice-qr.png`.
+
+    Args:
+        name (str): The file name
+
+    Returns:
+        str: The file name for current account, `name` for `DEFAULT_ACCOUNT`
+    """
+    account = get_current_account()
+    return name if account == DEFAULT_ACCOUNT else "%s-%s" % (account, name)
+
+
+class AccountLocal(Generic[_T]):
+    """A value for each account, like `threading.local()` but keyed by current account.
+
+    Values are created by `factory` when an account uses it first time, it is locked, so
+    it can be shared by threads.
+    """
+
+    def __init__(self, factory: Callable[[], _T]):
+        """Create an AccountLocal instance.
+
+        Args:
+            factory (Callable[[], _T]): The function creating value for a new account
+        """
+        self._factory = factory
+        self._values: dict[str, _T] = {}
+        self._lock = Lock()
+
+    def get(self) -> _T:
+        """Get the value of current account."""
+        account = get_current_account()
+        with self._lock:
+            if account not in self._values:
+                self._values[account] = self._factory()
+            return self._values[account]
+
+    def set(self, value: _T):
+        """Set the value of current account.
+
+        Args:
+            value (_T): The value
+        """
+        with self._lock:
+            self._values[get_current_account()] = value
+
+    def values(self) -> list[_T]:
+        """Values of all accounts which have used it."""
+        with self._lock:
+            return list(self._values.values())
+
+    def clear(self):
+        """Forget values of all accounts."""
+        with self._lock:
+            self._values.clear()
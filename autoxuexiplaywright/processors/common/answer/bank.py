@@ -0,0 +1,123 @@
+"""Functions for importing and exporting answer banks.
+
+An answer bank is a JSONL file whose lines are like `{"question": "...", "answers": ["..."]}`,
+or a CSV file whose rows are like `question,answer`, multiple answers in CSV are joined by
+ANSWER_CONNECTOR.
+"""
+
+from csv import reader
+from csv import writer
+from json import dumps
+from json import loads
+
+# Relative imports
+from .store import AnswerStore
+from typing import Iterator
+from pathlib import Path
+from ...common import ANSWER_CONNECTOR
+from ....logger import warning
+from ....languages import get_language_string
+
+
+_CSV_HEADER = ["question", "answer"]
+
+
+def _get_format(path: Path) -> str:
+    match path.suffix.lower():
+        case ".jsonl":
+            return "jsonl"
+        case ".csv":
+            return "csv"
+        case _:
+            raise ValueError("Unsupported answer bank format: " + path.suffix)
+
+
+def _to_answer(value: object) -> list[str]:
+    if isinstance(value, str):
+        return [answer for answer in value.split(ANSWER_CONNECTOR) if answer]
+    if isinstance(value, list):
+        return [str(answer) for answer in value if answer]  # type: ignore
+    return []
+
+
+def _read_jsonl(path: Path) -> Iterator[tuple[str, list[str]]]:
+    with path.open("r", encoding="utf-8") as lines:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                item = loads(line)
+            except ValueError:
+                item = None
+            if not isinstance(item, dict):
+                # One broken line should not stop importing others
+                warning(get_language_string("core-warning-answer-bank-line-skipped") % number)
+                continue
+            question = item.get("question")  # type: ignore
+            answer = _to_answer(item.get("answers", item.get("answer")))  # type: ignore
+            if isinstance(question, str) and question.strip() and len(answer) > 0:
+                yield question.strip(), answer
+
+
+def _read_csv(path: Path) -> Iterator[tuple[str, list[str]]]:
+    with path.open("r", encoding="utf-8", newline="") as rows:
+        for row in reader(rows):
+            if len(row) < len(_CSV_HEADER) or row == _CSV_HEADER:
+                continue
+            answer = _to_answer(row[1])
+            if row[0].strip() and len(answer) > 0:
+                yield row[0].strip(), answer
+
+
+def import_answer_bank(path: Path, store: AnswerStore) -> int:
+    """Import answers in an answer bank to store.
+
+    Questions with the same normalized key are de-duplicated and the last answer wins.
+
+    Args:
+        path (Path): The path to answer bank, ends with `.jsonl` or `.csv`
+        store (AnswerStore): The store to import to
+
+    Raises:
+        ValueError: When the format of answer bank is not supported
+
+    Returns:
+        int: How many items are imported
+    """
+    match _get_format(path):
+        case "jsonl":
+            return store.add_many(_read_jsonl(path))
+        case _:
+            return store.add_many(_read_csv(path))
+
+
+def export_answer_bank(path: Path, store: AnswerStore) -> int:
+    """Export all answers in store to an answer bank.
+
+    Args:
+        path (Path): The path to answer bank, ends with `.jsonl` or `.csv`
+        store (AnswerStore): The store to export from
+
+    Raises:
+        ValueError: When the format of answer bank is not supported
+
+    Returns:
+        int: How many items are exported
+    """
+    count = 0
+    match _get_format(path):
+        case "jsonl":
+            with path.open("w", encoding="utf-8") as lines:
+                for question, answer in store.iter_items():
+                    _ = lines.write(
+                        dumps({"question": question, "answers": answer}, ensure_ascii=False) + "\n",
+                    )
+                    count += 1
+        case _:
+            with path.open("w", encoding="utf-8", newline="") as rows:
+                csv_writer = writer(rows)
+                csv_writer.writerow(_CSV_HEADER)
+                for question, answer in store.iter_items():
+                    csv_writer.writerow([question, ANSWER_CONNECTOR.join(answer)])
+                    count += 1
+    return count
@@ -0,0 +1,18 @@
+"""Base classes of answer sources which can learn answers."""
+
+from abc import abstractmethod
+
+# Relative imports
+from ....sdk.answer import AnswerSource
+
+
+class AddSupportedAnswerSource(AnswerSource):
+    """Answer source which answers can be added to and penalized in."""
+
+    @abstractmethod
+    def add(self, title: str, answer: list[str], confidence: float):
+        """Add answer to source."""
+
+    @abstractmethod
+    def penalize(self, title: str):
+        """Lower confidence of answer in source after it is found wrong."""
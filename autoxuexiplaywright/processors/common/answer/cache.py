@@ -0,0 +1,99 @@
+"""Classes for caching answers in memory."""
+
+from time import monotonic
+
+# Relative imports
+from .utils import normalize_question
+from threading import Lock
+from collections import OrderedDict
+
+
+class AnswerCache:
+    """LRU cache for found answers with a short-lived negative cache for misses.
+
+    The cache is locked, so it can be shared by tasks running in threads.
+    """
+
+    def __init__(self, max_size: int, negative_ttl_secs: float):
+        """Create an AnswerCache instance.
+
+        Args:
+            max_size (int): How many answers can be cached
+            negative_ttl_secs (float): How long a miss is remembered
+        """
+        self.max_size = max_size
+        self.negative_ttl_secs = negative_ttl_secs
+        self.hits = 0
+        self.misses = 0
+        self._answers: OrderedDict[str, list[str]] = OrderedDict()
+        self._negatives: dict[str, float] = {}
+        self._lock = Lock()
+
+    def __contains__(self, title: str) -> bool:
+        """Check if the question is cached, counters are not changed."""
+        key = normalize_question(title)
+        with self._lock:
+            return key in self._answers or self._negatives.get(key, 0) > monotonic()
+
+    def get(self, title: str) -> list[str] | None:
+        """Get cached answer of the question.
+
+        Args:
+            title (str): The question title
+
+        Returns:
+            list[str] | None: The answers, an empty list if the question is known to have no
+                answer, None if the question is not cached
+        """
+        key = normalize_question(title)
+        with self._lock:
+            if key in self._answers:
+                self._answers.move_to_end(key)
+                self.hits += 1
+                return list(self._answers[key])
+            expire_time = self._negatives.get(key)
+            if expire_time is not None:
+                if expire_time > monotonic():
+                    self.hits += 1
+                    return []
+                del self._negatives[key]
+            self.misses += 1
+            return None
+
+    def put(self, title: str, answer: list[str]):
+        """Cache answer of the question.
+
+        Args:
+            title (str): The question title
+            answer (list[str]): The answers, an empty list means a miss
+        """
+        key = normalize_question(title)
+        with self._lock:
+            if len(answer) == 0:
+                _ = self._answers.pop(key, None)
+                self._negatives[key] = monotonic() + self.negative_ttl_secs
+                return
+            _ = self._negatives.pop(key, None)
+            self._answers[key] = list(answer)
+            self._answers.move_to_end(key)
+            while len(self._answers) > self.max_size:
+                _ = self._answers.popitem(last=False)
+
+    def invalidate(self, title: str):
+        """Remove the question from cache.
+
+        Args:
+            title (str): The question title
+        """
+        key = normalize_question(title)
+        with self._lock:
+            _ = self._answers.pop(key, None)
+            _ = self._negatives.pop(key, None)
+
+    def clear(self):
+        """Remove everything from cache and reset counters."""
+        with self._lock:
+            self._answers.clear()
+            self._negatives.clear()
+            self.hits = 0
+            self.misses = 0
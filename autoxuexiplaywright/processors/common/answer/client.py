@@ -0,0 +1,199 @@
+"""Classes for getting answers from a shared answer server."""
+
+from json import dumps
+from json import loads
+from time import sleep
+
+# Relative imports
+from .base import AddSupportedAnswerSource
+from .cache import AnswerCache
+from .server import ADD_PATH
+from .server import QUERY_PATH
+from .server import TOKEN_HEADER
+from .server import PENALIZE_PATH
+from ...common import ANSWER_CACHE_SIZE
+from ...common import ANSWER_SERVER_POOL_SIZE
+from ...common import ANSWER_SERVER_BATCH_SECS
+from ...common import ANSWER_NEGATIVE_CACHE_SECS
+from threading import Lock
+from ....logger import debug
+from ....defines import APPAUTHOR
+from http.client import HTTPException
+from http.client import HTTPConnection
+from http.client import HTTPSConnection
+from urllib.parse import urlparse
+from ....languages import get_language_string
+from typing_extensions import override
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HttpAnswerSource(AddSupportedAnswerSource):
+    """Get answers from an `AnswerServer`.
+
+    Connections are kept alive and reused, questions asked at almost the same time
+    are sent in one request, and answers are cached locally. Answers added and
+    penalized are queued and sent by a worker thread, so callers never wait for them.
+    """
+
+    def __init__(self, url: str, token: str | None = None):
+        """Create a HttpAnswerSource instance.
+
+        Args:
+            url (str): The url of server, like `http://127.0.0.1:18086`
+            token (str | None, optional): The token of server. Defaults to None.
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in {"http", "https"} or parsed.hostname is None:
+            raise ValueError("Invalid answer server url: %s" % url)
+        self._https = parsed.scheme == "https"
+        self._host = parsed.hostname
+        self._port = parsed.port
+        self._token = token
+        self._cache = AnswerCache(ANSWER_CACHE_SIZE, ANSWER_NEGATIVE_CACHE_SECS)
+        self._connections: list[HTTPConnection] = []
+        self._connections_lock = Lock()
+        self._pending: dict[str, Future[list[str]]] = {}
+        self._pending_lock = Lock()
+        # One worker keeps writes in order
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="answer-server-writer")
+
+    @override
+    def get_answer(self, title: str) -> list[str]:
+        cached = self._cache.get(title)
+        if cached is not None:
+            return cached
+        with self._pending_lock:
+            leader = len(self._pending) == 0
+            future = self._pending.get(title)
+            if future is None:
+                future = Future[list[str]]()
+                self._pending[title] = future
+        if leader:
+            # Wait for other questions so they can be sent in one request
+            sleep(ANSWER_SERVER_BATCH_SECS)
+            self._flush_pending()
+        return future.result(self.timeout)
+
+    @override
+    def get_answers(self, titles: list[str]) -> dict[str, list[str]]:
+        answers: dict[str, list[str]] = {}
+        titles_to_query: list[str] = []
+        for title in dict.fromkeys(titles):
+            cached = self._cache.get(title)
+            if cached is None:
+                titles_to_query.append(title)
+            elif len(cached) > 0:
+                answers[title] = cached
+        if len(titles_to_query) > 0:
+            response = self._post(QUERY_PATH, {"questions": titles_to_query})
+            queried: dict[str, list[str]] = response["answers"]  # type: ignore
+            for title in titles_to_query:
+                answer = queried.get(title, [])
+                self._cache.put(title, answer)
+                if len(answer) > 0:
+                    answers[title] = answer
+        return answers
+
+    @override
+    def add(self, title: str, answer: list[str], confidence: float):
+        self._cache.invalidate(title)
+        self._write(
+            ADD_PATH,
+            {"items": [{"question": title, "answers": answer, "confidence": confidence}]},
+        )
+
+    @override
+    def penalize(self, title: str):
+        self._cache.invalidate(title)
+        self._write(PENALIZE_PATH, {"questions": [title]})
+
+    def flush(self):
+        """Wait until all queued answers are sent."""
+        self._writer.submit(lambda: None).result()
+
+    @override
+    def close(self):
+        self._writer.shutdown()
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._cache.clear()
+
+    @property
+    @override
+    def priority(self) -> int:
+        # Shared answers are preferred to external modules but not to the local database
+        return 50
+
+    @property
+    @override
+    def name(self) -> str:
+        return "HttpAnswerSource"
+
+    @property
+    @override
+    def author(self) -> str:
+        return APPAUTHOR
+
+    def _flush_pending(self):
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = {}
+        try:
+            answers = self.get_answers(list(pending))
+        except Exception as e:
+            for future in pending.values():
+                future.set_exception(e)
+        else:
+            for title, future in pending.items():
+                future.set_result(answers.get(title, []))
+
+    def _write(self, path: str, payload: dict[str, object]):
+        self._writer.submit(self._post, path, payload).add_done_callback(self._on_written)
+
+    def _on_written(self, future: Future[dict[str, object]]):
+        e = future.exception()
+        if e is not None:
+            debug(get_language_string("core-debug-failed-to-add-answer") % e)
+
+    def _post(self, path: str, payload: dict[str, object]) -> dict[str, object]:
+        body = dumps(payload, ensure_ascii=False).encode()
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        if self._token is not None:
+            headers[TOKEN_HEADER] = self._token
+        # Pooled connections may be closed by server already, so retry once with a new one
+        for retry in (False, True):
+            connection = self._get_connection(new=retry)
+            try:
+                connection.request("POST", path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (HTTPException, OSError):
+                connection.close()
+                if retry:
+                    raise
+                continue
+            if response.status != 200:
+                connection.close()
+                raise HTTPException("Answer server responded %d" % response.status)
+            self._put_connection(connection)
+            return loads(data)
+        raise HTTPException("Unreachable")
+
+    def _get_connection(self, new: bool) -> HTTPConnection:
+        if not new:
+            with self._connections_lock:
+                if len(self._connections) > 0:
+                    return self._connections.pop()
+        if self._https:
+            return HTTPSConnection(self._host, self._port, timeout=self.timeout)
+        return HTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def _put_connection(self, connection: HTTPConnection):
+        with self._connections_lock:
+            if len(self._connections) < ANSWER_SERVER_POOL_SIZE:
+                self._connections.append(connection)
+                return
+        connection.close()
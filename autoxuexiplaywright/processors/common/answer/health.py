@@ -0,0 +1,119 @@
+"""Classes for tracking health of answer sources."""
+
+from time import monotonic
+
+# Relative imports
+from bisect import bisect_left
+from threading import Lock
+from collections import deque
+
+
+LATENCY_BUCKETS_SECS = (0.01, 0.1, 0.5, 1.0, 5.0)
+
+
+class SourceHealth:
+    """Latency histogram, error rate and circuit breaker of an answer source.
+
+    The breaker opens when recent calls exceed the latency or error budget, the source
+    is skipped until cooldown passes, then only a single trial call is allowed and it
+    decides whether the breaker is closed again or stays open for another cooldown. If
+    the trial call never finishes, like it is cancelled, another one is allowed after
+    cooldown. It is locked, so it can be shared by threads.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        latency_budget_secs: float,
+        error_budget: float,
+        cooldown_secs: float,
+    ):
+        """Create a SourceHealth instance.
+
+        Args:
+            window (int): How many recent calls are checked against budgets
+            latency_budget_secs (float): Max average latency of recent calls
+            error_budget (float): Max ratio of failed recent calls
+            cooldown_secs (float): How long the source is skipped after breaker opened
+        """
+        self.latency_budget_secs = latency_budget_secs
+        self.error_budget = error_budget
+        self.cooldown_secs = cooldown_secs
+        self.calls = 0
+        self.errors = 0
+        self.skips = 0
+        self.trips = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_SECS) + 1)
+        self._recent: deque[tuple[float, bool]] = deque(maxlen=window)
+        self._opened_at: float | None = None
+        self._trial_at: float | None = None
+        self._lock = Lock()
+
+    @property
+    def error_rate(self) -> float:
+        """Ratio of failed calls in all calls."""
+        return self.errors / self.calls if self.calls > 0 else 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """If the breaker is open and the source should be skipped now."""
+        return self._opened_at is not None and monotonic() - self._opened_at < self.cooldown_secs
+
+    def allow(self) -> bool:
+        """Check if the source can be called, skipped calls are counted.
+
+        Returns:
+            bool: If the source can be called, only one caller gets True after cooldown
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = monotonic()
+            if not self.is_open and (
+                self._trial_at is None or now - self._trial_at >= self.cooldown_secs
+            ):
+                self._trial_at = now
+                return True
+            self.skips += 1
+            return False
+
+    def record(self, latency_secs: float, ok: bool):
+        """Record a finished call.
+
+        Args:
+            latency_secs (float): How long the call took
+            ok (bool): If the call succeeded
+        """
+        with self._lock:
+            self.calls += 1
+            self.errors += 0 if ok else 1
+            self.histogram[bisect_left(LATENCY_BUCKETS_SECS, latency_secs)] += 1
+            if self._opened_at is not None:
+                if self._trial_at is None:
+                    # A call started before breaker opened, it decides nothing
+                    return
+                # This is the trial call after cooldown
+                self._trial_at = None
+                if ok and latency_secs <= self.latency_budget_secs:
+                    self._opened_at = None
+                    self._recent.clear()
+                else:
+                    self._opened_at = monotonic()
+                return
+            self._recent.append((latency_secs, ok))
+            if len(self._recent) == self._recent.maxlen and self._is_over_budget():
+                self._opened_at = monotonic()
+                self.trips += 1
+
+    def format_histogram(self) -> str:
+        """Format the latency histogram like `<=0.01s:3 <=0.1s:1 >5.0s:0`."""
+        labels = ["<=%ss" % bound for bound in LATENCY_BUCKETS_SECS]
+        labels.append(">%ss" % LATENCY_BUCKETS_SECS[-1])
+        return " ".join(
+            "%s:%d" % (label, count) for label, count in zip(labels, self.histogram, strict=True)
+        )
+
+    def _is_over_budget(self) -> bool:
+        latency = sum(latency for latency, _ in self._recent) / len(self._recent)
+        errors = sum(1 for _, ok in self._recent if not ok) / len(self._recent)
+        return latency > self.latency_budget_secs or errors > self.error_budget
@@ -0,0 +1,120 @@
+"""Classes for finding similar questions."""
+
+from re import compile
+from math import ceil
+
+# Relative imports
+from .utils import simplify_question
+
+
+# Variants of a question often differ only in a year, a count or a negation which
+# gives the opposite answer, so these words should be the same in similar questions
+_MARKER_REGEX = compile(r"\d+|[零〇一二两三四五六七八九十百千万亿]+|不正确|没有|错误|正确|不|非")
+
+
+def _get_markers(text: str) -> list[str]:
+    return _MARKER_REGEX.findall(text)
+
+
+def _get_grams(text: str, size: int) -> set[str]:
+    if len(text) <= size:
+        return {text} if len(text) > 0 else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+class QuestionIndex:
+    """N-gram inverted index of question keys."""
+
+    def __init__(self, threshold: float, size: int = 3):
+        """Create a QuestionIndex instance.
+
+        Args:
+            threshold (float): The minimum similarity of a match, between 0 and 1
+            size (int, optional): How many chars in a gram. Defaults to 3.
+        """
+        self.threshold = threshold
+        self.size = size
+        self._keys: list[str] = []
+        self._simplified: list[str] = []
+        self._markers: list[list[str]] = []
+        self._known: set[str] = set()
+        self._postings: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        """Get how many keys are indexed."""
+        return len(self._keys)
+
+    def add(self, key: str):
+        """Add a question key to index.
+
+        Args:
+            key (str): The key of question in answer store
+        """
+        if key in self._known:
+            return
+        self._known.add(key)
+        key_id = len(self._keys)
+        simplified = simplify_question(key)
+        self._keys.append(key)
+        self._simplified.append(simplified)
+        self._markers.append(_get_markers(simplified))
+        for gram in _get_grams(simplified, self.size):
+            self._postings.setdefault(gram, []).append(key_id)
+
+    def find(self, title: str) -> str | None:
+        """Find the most similar question key.
+
+        Args:
+            title (str): The question title
+
+        Returns:
+            str | None: The key of the most similar question, None if no question is similar
+                enough
+        """
+        match = self.match(title)
+        return None if match is None else match[0]
+
+    def match(self, title: str) -> tuple[str, float] | None:
+        """Find the most similar question key and how similar it is.
+
+        Similarity is the Dice coefficient of grams of simplified titles, and numbers and
+        negations like `不` or `错误` in both titles should be the same.
+
+        Args:
+            title (str): The question title
+
+        Returns:
+            tuple[str, float] | None: The key and similarity, None if no question is similar
+                enough
+        """
+        simplified = simplify_question(title)
+        grams = _get_grams(simplified, self.size)
+        if len(grams) == 0:
+            return None
+        markers = _get_markers(simplified)
+        # A match shares at least min_shared grams, so it must appear in one of the
+        # len(grams) - min_shared + 1 rarest grams' postings
+        min_shared = ceil(self.threshold * len(grams) / (2 - self.threshold))
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, [])))
+        candidates: set[int] = set()
+        for gram in rarest[: len(grams) - min_shared + 1]:
+            candidates.update(self._postings.get(gram, []))
+        best_key: str | None = None
+        best_similarity = 0.0
+        for key_id in sorted(candidates):
+            if self._markers[key_id] != markers:
+                continue
+            candidate_grams = _get_grams(self._simplified[key_id], self.size)
+            similarity = 2 * len(grams & candidate_grams) / (len(grams) + len(candidate_grams))
+            if similarity >= self.threshold and similarity > best_similarity:
+                best_key = self._keys[key_id]
+                best_similarity = similarity
+        return None if best_key is None else (best_key, best_similarity)
+
+    def clear(self):
+        """Remove all keys from index."""
+        self._keys.clear()
+        self._simplified.clear()
+        self._markers.clear()
+        self._known.clear()
+        self._postings.clear()
@@ -0,0 +1,177 @@
+"""Classes for sharing an answer store with other nodes over HTTP."""
+
+from hmac import compare_digest
+from json import dumps
+from json import loads
+
+# Relative imports
+from .store import AnswerStore
+from threading import Lock
+from http.server import ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler
+
+
+QUERY_PATH = "/query"
+ADD_PATH = "/add"
+PENALIZE_PATH = "/penalize"
+TOKEN_HEADER = "X-Answer-Token"  # noqa: S105
+
+_MAX_BODY_SIZE = 16 * 1024 * 1024
+
+
+class _AnswerRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections alive so clients can reuse them
+    protocol_version = "HTTP/1.1"
+    server: "AnswerServer"
+
+    def do_POST(self):  # noqa: N802
+        if not self.server.check_token(self.headers.get(TOKEN_HEADER)):
+            # The body is not read, so it must not be parsed as the next request
+            self.close_connection = True
+            self.send_error(401)
+            return
+        length = self._get_body_length()
+        if length is None:
+            return
+        try:
+            body = loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise TypeError("Request body should be an object")
+            if self.path == QUERY_PATH:
+                response = self.server.query(body.get("questions", []))  # type: ignore
+            elif self.path == ADD_PATH:
+                response = self.server.add(body.get("items", []))  # type: ignore
+            elif self.path == PENALIZE_PATH:
+                response = self.server.penalize(body.get("questions", []))  # type: ignore
+            else:
+                self.send_error(404)
+                return
+        except (ValueError, TypeError, KeyError) as e:
+            self.send_error(400, str(e))
+            return
+        data = dumps(response, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        _ = self.wfile.write(data)
+
+    def _get_body_length(self) -> int | None:
+        # Errors are sent if the length is invalid, and the body is not read
+        length = self.headers.get("Content-Length")
+        if length is None:
+            status = 411
+        elif not (length.isascii() and length.isdigit()):
+            status = 400
+        elif int(length) > _MAX_BODY_SIZE:
+            status = 413
+        else:
+            return int(length)
+        self.close_connection = True
+        self.send_error(status)
+        return None
+
+    def log_message(self, format: str, *args: object):  # noqa: A002
+        pass
+
+
+class AnswerServer(ThreadingHTTPServer):
+    """HTTP server sharing an answer store.
+
+    All requests are `POST` with json body, and the token should be sent in
+    `TOKEN_HEADER` header if the server has one:
+
+    - `/query`: `{"questions": [...]}` -> `{"answers": {question: [...]}}`
+    - `/add`: `{"items": [{"question": ..., "answers": [...], "confidence": 1.0}]}`
+        -> `{"added": count}`
+    - `/penalize`: `{"questions": [...]}` -> `{"penalized": count}`
+    """
+
+    daemon_threads = True
+
+    def __init__(self, store: AnswerStore, host: str, port: int, token: str | None = None):
+        """Create an AnswerServer instance, call `serve_forever()` to start serving.
+
+        Args:
+            store (AnswerStore): The store shared, it should not be used by others
+            host (str): The host to bind
+            port (int): The port to bind, 0 means a random port
+            token (str | None, optional): The token clients should send, None means
+                no token is required. Defaults to None.
+        """
+        super().__init__((host, port), _AnswerRequestHandler)
+        self.store = store
+        self._token = token
+        self._lock = Lock()
+
+    @property
+    def url(self) -> str:
+        """The url of server."""
+        host, port = self.server_address[:2]
+        return "http://%s:%d" % (host, port)  # type: ignore
+
+    def check_token(self, token: str | None) -> bool:
+        """Check the token sent by client.
+
+        Args:
+            token (str | None): The token, None if it is not sent
+
+        Returns:
+            bool: If the request is allowed
+        """
+        if self._token is None:
+            return True
+        return token is not None and compare_digest(token.encode(), self._token.encode())
+
+    def query(self, questions: list[str]) -> dict[str, dict[str, list[str]]]:
+        """Get answers of questions.
+
+        Args:
+            questions (list[str]): The question titles
+
+        Returns:
+            dict[str, dict[str, list[str]]]: The response
+        """
+        titles = [str(question) for question in questions]
+        with self._lock:
+            return {"answers": self.store.get_many(titles)}
+
+    def add(self, items: list[dict[str, object]]) -> dict[str, int]:
+        """Add answers of questions.
+
+        Args:
+            items (list[dict[str, object]]): The questions, answers and confidence
+
+        Returns:
+            dict[str, int]: The response
+        """
+        added = 0
+        with self._lock:
+            for item in items:
+                answers = item["answers"]
+                if not isinstance(answers, list):
+                    raise TypeError("Answers should be a list")
+                confidence = item.get("confidence", 1.0)
+                if not isinstance(confidence, int | float):
+                    raise TypeError("Confidence should be a number")
+                if self.store.add(
+                    str(item["question"]),
+                    [str(answer) for answer in answers],  # type: ignore
+                    confidence,
+                ):
+                    added += 1
+        return {"added": added}
+
+    def penalize(self, questions: list[str]) -> dict[str, int]:
+        """Lower confidence of questions.
+
+        Args:
+            questions (list[str]): The question titles
+
+        Returns:
+            dict[str, int]: The response
+        """
+        with self._lock:
+            for question in questions:
+                self.store.penalize(str(question))
+        return {"penalized": len(questions)}
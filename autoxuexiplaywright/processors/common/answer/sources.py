@@ -1,73 +1,149 @@
 """Classes and functions for getting answers."""
 
-from abc import abstractmethod
-from base64 import b64decode
-from base64 import b64encode
-from sqlite3 import connect
-from ...common import ANSWER_CONNECTOR
+from time import monotonic
+
+# Relative imports
+from .base import AddSupportedAnswerSource
+from .cache import AnswerCache
+from .index import QuestionIndex
+from .store import ANSWER_DB_FILENAME
+from .store import AnswerStore
+from .utils import normalize_question
+from typing import TypeVar
+from typing import Callable
+from typing import Awaitable
+from .client import HttpAnswerSource
+from .health import SourceHealth
+from asyncio import Task
+from asyncio import wait as async_wait
+from asyncio import wait_for
+from asyncio import create_task
+from asyncio import get_running_loop
+from pathlib import Path
+from ...common import ANSWER_CACHE_SIZE
+from ...common import SOURCE_MAX_WORKERS
+from ...common import SOURCE_ERROR_BUDGET
+from ...common import SOURCE_COOLDOWN_SECS
+from ...common import SOURCE_HEALTH_WINDOW
+from ...common import FUZZY_MATCH_THRESHOLD
+from ...common import ANSWER_NEGATIVE_CACHE_SECS
+from ...common import SOURCE_LATENCY_BUDGET_SECS
+from ...common import FUZZY_ANSWER_MIN_CONFIDENCE
+from threading import Lock
+from ....config import get_runtime_config
+from ....logger import info
 from ....logger import debug
 from ....logger import warning
 from ....defines import APPAUTHOR
 from ....storage import get_data_path
+from collections import Counter
 from ....languages import get_language_string
 from ....sdk.answer import AnswerSource
-
-# Relative imports
 from ....sdk.module import get_modules_by_type
 from typing_extensions import override
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
 
-_ANSWER_DB_FILENAME = "data.db"
 _ANSWER_SOURCE_MOD_EXT = ".as.py"
 
+_config = get_runtime_config()
+
+_R = TypeVar("_R")
+
 _answer_sources: list[AnswerSource] = []
+_answer_cache = AnswerCache(ANSWER_CACHE_SIZE, ANSWER_NEGATIVE_CACHE_SECS)
+_source_hits: Counter[AnswerSource] = Counter()
+_source_misses: Counter[AnswerSource] = Counter()
+_source_health: dict[AnswerSource, SourceHealth] = {}
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
 
 
-class _AddSupportedAnswerSource(AnswerSource):
-    @abstractmethod
-    def add(self, title: str, answer: list[str]):
-        """Add answer to source."""
+class SqliteAnswerSource(AddSupportedAnswerSource):
+    """Get answers from sqlite database.
+
+    If a question is unknown, the answer of a similar question is used, its confidence
+    is lowered by similarity and it is not used if the confidence is lower than
+    `FUZZY_ANSWER_MIN_CONFIDENCE`. Reporting it wrong penalizes the similar question.
+    """
 
+    def __init__(self, path: Path | None = None):
+        """Create a SqliteAnswerSource instance.
 
-class SqliteAnswerSource(_AddSupportedAnswerSource):
-    """Get answers from sqlite database."""
+        Args:
+            path (Path | None, optional): The database, the one in data folder if None.
+                Defaults to None.
+        """
+        self._path = path
 
     @override
     def start(self):
-        self._conn = connect(get_data_path(_ANSWER_DB_FILENAME))
-        self._conn.execute(
-            "CREATE TABLE IF NOT EXISTS 'answer' ('QUESTION' TEXT NOT NULL UNIQUE,'ANSWER' TEXT NOT NULL)",
-        )
-        self._conn.commit()
+        self._lock = Lock()
+        self._store = AnswerStore(self._path or get_data_path(ANSWER_DB_FILENAME))
+        self._index = QuestionIndex(FUZZY_MATCH_THRESHOLD)
+        self._matched: dict[str, str] = {}
+        for key in self._store.iter_keys():
+            self._index.add(key)
 
     @override
     def get_answer(self, title: str) -> list[str]:
-        title_encoded = b64encode(title.encode()).decode()
-        answer = []
-        answer_str_encoded = self._conn.execute(
-            "SELECT ANSWER FROM 'answer' WHERE 'QUESTION'= ?",
-            (title_encoded,),
-        ).fetchone()
-        if isinstance(answer_str_encoded, str):
-            answer_str = b64decode(answer_str_encoded).decode()
-            answer = answer_str.split(ANSWER_CONNECTOR)
+        with self._lock:
+            answer = self._store.get(title)
+            if len(answer) == 0:
+                answer = self._get_similar_answer(title)
         return answer
 
+    def _get_similar_answer(self, title: str) -> list[str]:
+        match = self._index.match(title)
+        if match is None:
+            return []
+        key, similarity = match
+        confidence = (self._store.get_confidence(key) or 0.0) * similarity
+        if confidence < FUZZY_ANSWER_MIN_CONFIDENCE:
+            return []
+        debug(get_language_string("core-debug-similar-question-found") % (title, key))
+        if len(self._matched) >= ANSWER_CACHE_SIZE:
+            _ = self._matched.pop(next(iter(self._matched)))
+        self._matched[normalize_question(title)] = key
+        return self._store.get(key)
+
     @override
-    def add(self, title: str, answer: list[str]):
-        answer_str = ANSWER_CONNECTOR.join(answer)
-        title_encoded = b64encode(title.encode()).decode()
-        answer_str_encoded = b64encode(answer_str.encode()).decode()
-        self._conn.execute(
-            "INSERT OR REPLACE INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
-            (title_encoded, answer_str_encoded),
-        )
-        self._conn.commit()
+    def get_answers(self, titles: list[str]) -> dict[str, list[str]]:
+        with self._lock:
+            answers = self._store.get_many(titles)
+        for title in titles:
+            if title not in answers:
+                answer = self.get_answer(title)
+                if len(answer) > 0:
+                    answers[title] = answer
+        return answers
+
+    @override
+    def add(self, title: str, answer: list[str], confidence: float):
+        with self._lock:
+            _ = self._matched.pop(normalize_question(title), None)
+            if self._store.add(title, answer, confidence):
+                self._index.add(normalize_question(title))
+
+    @override
+    def penalize(self, title: str):
+        with self._lock:
+            # The answer may be of a similar question
+            self._store.penalize(self._matched.pop(normalize_question(title), title))
 
     @override
     def close(self):
-        self._conn.commit()
-        self._conn.close()
+        with self._lock:
+            self._store.close()
+
+    @property
+    @override
+    def priority(self) -> int:
+        # Local database is the most reliable source and answers in microseconds
+        return 100
 
     @property
     @override
@@ -80,13 +156,33 @@ class SqliteAnswerSource(_AddSupportedAnswerSource):
         return APPAUTHOR
 
 
-def _add_source_manually(source: type[AnswerSource]):
-    instance = source()
+def _add_source(instance: AnswerSource):
     if instance not in _answer_sources:
         instance.start()
         _answer_sources.append(instance)
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(SOURCE_MAX_WORKERS, "answer-source")
+        return _executor
+
+
+def _shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            # Calls still running are not waited, their results are not needed any more
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _add_source_manually(source: type[AnswerSource]):
+    _add_source(source())
+
+
 def load_all_answer_sources():
     """Load all answer sources."""
     for module in get_modules_by_type(AnswerSource):
@@ -94,6 +190,11 @@ def load_all_answer_sources():
             _answer_sources.append(module)
 
     _add_source_manually(SqliteAnswerSource)
+    if _config.answer_server:
+        try:
+            _add_source(HttpAnswerSource(_config.answer_server, _config.answer_server_token))
+        except ValueError as e:
+            warning(get_language_string("core-warning-answer-server-invalid") % e)
     debug(
         get_language_string("core-debug-current-modules-num")
         % (len(_answer_sources), str(_answer_sources)),
@@ -102,8 +203,144 @@ def load_all_answer_sources():
         warning(get_language_string("core-warning-using-external-modules"))
 
 
+def _get_health(answer_source: AnswerSource) -> SourceHealth:
+    if answer_source not in _source_health:
+        _source_health[answer_source] = SourceHealth(
+            SOURCE_HEALTH_WINDOW,
+            SOURCE_LATENCY_BUDGET_SECS,
+            SOURCE_ERROR_BUDGET,
+            SOURCE_COOLDOWN_SECS,
+        )
+    return _source_health[answer_source]
+
+
+def _get_sorted_sources() -> list[AnswerSource]:
+    """Get sources sorted by priority, sources with open circuit breaker are skipped."""
+    return sorted(
+        [answer_source for answer_source in _answer_sources if _get_health(answer_source).allow()],
+        key=lambda answer_source: -answer_source.priority,
+    )
+
+
+def _record_call(answer_source: AnswerSource, latency_secs: float, ok: bool):
+    health = _get_health(answer_source)
+    trips = health.trips
+    health.record(latency_secs, ok)
+    if health.trips > trips:
+        warning(
+            get_language_string("core-warning-answer-source-demoted")
+            % (answer_source.author, answer_source.name, health.cooldown_secs),
+        )
+
+
+def _pick_answer(
+    answer_sources: list[AnswerSource],
+    results: dict[AnswerSource, list[str]],
+) -> list[str] | None:
+    """Pick the answer from the source with the highest priority.
+
+    Returns:
+        list[str] | None: The answer, None if a source with higher priority is still running
+    """
+    for answer_source in answer_sources:
+        if answer_source not in results:
+            return None
+        if len(results[answer_source]) > 0:
+            return results[answer_source]
+    return []
+
+
+def _on_source_failed(answer_source: AnswerSource, e: BaseException, latency_secs: float):
+    _record_call(answer_source, latency_secs, False)
+    if isinstance(e, TimeoutError):
+        debug(
+            get_language_string("core-debug-answer-source-timeout")
+            % (answer_source.author, answer_source.name, answer_source.timeout),
+        )
+    else:
+        debug(
+            get_language_string("core-debug-answer-source-failed")
+            % (answer_source.author, answer_source.name, e),
+        )
+
+
+def _on_answer_picked(title: str, answer: list[str], results: dict[AnswerSource, list[str]]):
+    for answer_source, result in results.items():
+        if len(result) > 0:
+            _source_hits[answer_source] += 1
+        else:
+            _source_misses[answer_source] += 1
+    _answer_cache.put(title, answer)
+
+
+def _wait_futures(
+    futures: dict[Future[_R], AnswerSource],
+    results: dict[AnswerSource, _R],
+    default: _R,
+    decided: Callable[[], bool],
+):
+    """Collect results of sources until decided or all sources finished.
+
+    Failed or timed out sources get `default` as result, pending ones are cancelled.
+    """
+    start_time = monotonic()
+    pending = set(futures)
+    while len(pending) > 0 and not decided():
+        deadline = min(start_time + futures[future].timeout for future in pending)
+        done, pending = wait(
+            pending,
+            timeout=max(deadline - monotonic(), 0),
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                _on_source_failed(futures[future], e, monotonic() - start_time)
+                results[futures[future]] = default
+            else:
+                _record_call(futures[future], monotonic() - start_time, True)
+        for future in pending.copy():
+            if monotonic() >= start_time + futures[future].timeout:
+                _on_source_failed(futures[future], TimeoutError(), futures[future].timeout)
+                results[futures[future]] = default
+                pending.remove(future)
+    for future in pending:
+        _ = future.cancel()
+
+
+async def _wait_tasks(
+    tasks: dict[Task[_R], AnswerSource],
+    results: dict[AnswerSource, _R],
+    default: _R,
+    decided: Callable[[], bool],
+):
+    """Same as `_wait_futures`, but for asyncio tasks which have timeout already."""
+    start_time = monotonic()
+    pending = set(tasks)
+    try:
+        while len(pending) > 0 and not decided():
+            done, pending = await async_wait(pending, return_when=FIRST_COMPLETED)
+            for task in done:
+                try:
+                    results[tasks[task]] = task.result()
+                except Exception as e:
+                    _on_source_failed(tasks[task], e, monotonic() - start_time)
+                    results[tasks[task]] = default
+                else:
+                    _record_call(tasks[task], monotonic() - start_time, True)
+    finally:
+        for task in pending:
+            _ = task.cancel()
+
+
 def find_answer_in_answer_sources(title: str) -> list[str]:
-    """Find first answer in answer sources.
+    """Find answer in answer sources.
+
+    All sources are queried concurrently in threads, the answer from the source with
+    the highest priority is returned as soon as it is known and the rest are cancelled.
+    Answers and misses are cached, so asking the same question again
+    will not query the sources.
 
     Args:
         title (str): The question
@@ -111,31 +348,201 @@ def find_answer_in_answer_sources(title: str) -> list[str]:
     Returns:
         list[str]: The result, will be an empty list if no answer
     """
-    for answer_source in _answer_sources:
-        try:
-            result = answer_source.get_answer(title)
-        except Exception as e:
-            debug(
-                get_language_string("core-debug-answer-source-failed")
-                % (answer_source.author, answer_source.name, e),
-            )
-        else:
-            if len(result) > 0:
-                return result
-    return []
+    cached = _answer_cache.get(title)
+    if cached is not None:
+        return cached
+    answer_sources = _get_sorted_sources()
+    results: dict[AnswerSource, list[str]] = {}
+    _wait_futures(
+        {
+            _get_executor().submit(answer_source.get_answer, title): answer_source
+            for answer_source in answer_sources
+        },
+        results,
+        [],
+        lambda: _pick_answer(answer_sources, results) is not None,
+    )
+    answer = _pick_answer(answer_sources, results) or []
+    _on_answer_picked(title, answer, results)
+    return answer
+
+
+def _get_answer_async(answer_source: AnswerSource, title: str) -> Awaitable[list[str]]:
+    # Blocking sources share the bounded threads of sync mode, and they are shut down
+    # with them, only sources doing their I/O in asyncio run on the loop
+    if type(answer_source).get_answer_async is AnswerSource.get_answer_async:
+        return get_running_loop().run_in_executor(_get_executor(), answer_source.get_answer, title)
+    return answer_source.get_answer_async(title)
+
+
+async def find_answer_in_answer_sources_async(title: str) -> list[str]:
+    """Find answer in answer sources without blocking the event loop.
+
+    Same as `find_answer_in_answer_sources`, but sources are queried with
+    `AnswerSource.get_answer_async`.
+
+    Args:
+        title (str): The question
+
+    Returns:
+        list[str]: The result, will be an empty list if no answer
+    """
+    cached = _answer_cache.get(title)
+    if cached is not None:
+        return cached
+    answer_sources = _get_sorted_sources()
+    results: dict[AnswerSource, list[str]] = {}
+    await _wait_tasks(
+        {
+            create_task(
+                wait_for(_get_answer_async(answer_source, title), answer_source.timeout),
+            ): answer_source
+            for answer_source in answer_sources
+        },
+        results,
+        [],
+        lambda: _pick_answer(answer_sources, results) is not None,
+    )
+    answer = _pick_answer(answer_sources, results) or []
+    _on_answer_picked(title, answer, results)
+    return answer
+
+
+def _get_titles_to_prefetch(titles: list[str]) -> list[str]:
+    return [title for title in dict.fromkeys(titles) if title and title not in _answer_cache]
+
+
+def _get_title_results(
+    title: str,
+    answer_sources: list[AnswerSource],
+    results: dict[AnswerSource, dict[str, list[str]] | None],
+) -> dict[AnswerSource, list[str]]:
+    # Sources still running are left out, so `_pick_answer` waits for them
+    return {
+        answer_source: (results[answer_source] or {}).get(title, [])
+        for answer_source in answer_sources
+        if answer_source in results
+    }
+
+
+def _is_prefetch_decided(
+    titles: list[str],
+    answer_sources: list[AnswerSource],
+    results: dict[AnswerSource, dict[str, list[str]] | None],
+) -> bool:
+    return all(
+        _pick_answer(answer_sources, _get_title_results(title, answer_sources, results)) is not None
+        for title in titles
+    )
+
+
+def _on_answers_prefetched(
+    titles: list[str],
+    answer_sources: list[AnswerSource],
+    results: dict[AnswerSource, dict[str, list[str]] | None],
+):
+    # Misses are cached only if all sources answered, failed ones will be asked again later
+    all_answered = all(results.get(answer_source) is not None for answer_source in answer_sources)
+    for title in titles:
+        title_results = _get_title_results(title, answer_sources, results)
+        answer = _pick_answer(answer_sources, title_results) or []
+        if all_answered or len(answer) > 0:
+            _on_answer_picked(title, answer, title_results)
+
+
+def prefetch_answers(titles: list[str]):
+    """Find answers of many questions at once and cache them.
+
+    Each source is asked once with `AnswerSource.get_answers`, later calls of
+    `find_answer_in_answer_sources` with those questions will hit the cache. Sources
+    with lower priority are cancelled once every question is decided by others.
+
+    Args:
+        titles (list[str]): The questions
+    """
+    titles = _get_titles_to_prefetch(titles)
+    if len(titles) == 0:
+        return
+    answer_sources = _get_sorted_sources()
+    results: dict[AnswerSource, dict[str, list[str]] | None] = {}
+    _wait_futures(
+        {
+            _get_executor().submit(answer_source.get_answers, titles): answer_source
+            for answer_source in answer_sources
+        },
+        results,
+        None,
+        lambda: _is_prefetch_decided(titles, answer_sources, results),
+    )
+    _on_answers_prefetched(titles, answer_sources, results)
+
 
+async def prefetch_answers_async(titles: list[str]):
+    """Find answers of many questions at once and cache them without blocking the event loop.
+
+    Args:
+        titles (list[str]): The questions
+    """
+    titles = _get_titles_to_prefetch(titles)
+    if len(titles) == 0:
+        return
+    answer_sources = _get_sorted_sources()
+    results: dict[AnswerSource, dict[str, list[str]] | None] = {}
+    await _wait_tasks(
+        {
+            create_task(
+                wait_for(
+                    get_running_loop().run_in_executor(
+                        _get_executor(),
+                        answer_source.get_answers,
+                        titles,
+                    ),
+                    answer_source.timeout,
+                ),
+            ): answer_source
+            for answer_source in answer_sources
+        },
+        results,
+        None,
+        lambda: _is_prefetch_decided(titles, answer_sources, results),
+    )
+    _on_answers_prefetched(titles, answer_sources, results)
 
-def add_answer_to_all_sources(title: str, answer: list[str]):
+
+def add_answer_to_all_sources(title: str, answer: list[str], confidence: float = 1.0):
     """Add answer to all supported sources.
 
     Args:
         title (str): The question title
         answer (list[str]): The question answer
+        confidence (float, optional): How much the answer is trusted, answers with higher
+            confidence in sources are kept. Defaults to 1.0.
+    """
+    _answer_cache.invalidate(title)
+    for answer_source in _answer_sources:
+        if isinstance(answer_source, AddSupportedAnswerSource):
+            try:
+                answer_source.add(title, answer, confidence)
+            except Exception as e:
+                debug(get_language_string("core-debug-failed-to-add-answer") % e)
+    if len(answer) > 0:
+        _answer_cache.put(title, answer)
+
+
+def report_wrong_answer(title: str):
+    """Report that the answer of the question is wrong.
+
+    The answer is removed from cache and its confidence is lowered in all supported
+    sources, so it will not be used again until a better answer is added.
+
+    Args:
+        title (str): The question title
     """
+    _answer_cache.invalidate(title)
     for answer_source in _answer_sources:
-        if isinstance(answer_source, _AddSupportedAnswerSource):
+        if isinstance(answer_source, AddSupportedAnswerSource):
             try:
-                answer_source.add(title, answer)
+                answer_source.penalize(title)
             except Exception as e:
                 debug(get_language_string("core-debug-failed-to-add-answer") % e)
 
@@ -152,5 +559,46 @@ def close_all_answer_sources():
         else:
             return False
 
+    _shutdown_executor()
     if len(list(filter(try_close, _answer_sources))) > 0:
         warning(get_language_string("core-warning-exisis-sources-failed-to-close"))
+    _log_answer_stats()
+    _answer_cache.clear()
+    _source_hits.clear()
+    _source_misses.clear()
+    _source_health.clear()
+
+
+def _log_answer_stats():
+    debug(
+        get_language_string("core-debug-answer-cache-stats")
+        % (_answer_cache.hits, _answer_cache.misses),
+    )
+    for answer_source in _answer_sources:
+        debug(
+            get_language_string("core-debug-answer-source-stats")
+            % (
+                answer_source.author,
+                answer_source.name,
+                _source_hits[answer_source],
+                _source_misses[answer_source],
+            ),
+        )
+
+
+def log_answer_source_health():
+    """Log latency histogram, error rate and breaker status of all answer sources."""
+    for answer_source in _answer_sources:
+        health = _get_health(answer_source)
+        info(
+            get_language_string("core-info-answer-source-health")
+            % (
+                answer_source.author,
+                answer_source.name,
+                health.calls,
+                health.error_rate * 100,
+                health.skips,
+                health.trips,
+                health.format_histogram(),
+            ),
+        )
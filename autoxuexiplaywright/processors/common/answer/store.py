@@ -0,0 +1,277 @@
+"""Classes and functions for storaging answers in sqlite database."""
+
+# Relative imports
+from json import dumps
+from .utils import normalize_question
+from base64 import b64decode
+from typing import Iterable
+from typing import Iterator
+from pathlib import Path
+from sqlite3 import connect
+from operator import itemgetter
+from ...common import ANSWER_CONNECTOR
+from itertools import islice
+from itertools import groupby
+
+
+ANSWER_DB_FILENAME = "data.db"
+SCHEMA_VERSION = 2
+ADD_BATCH_SIZE = 5000
+MIN_CONFIDENCE = 0.5
+WRONG_ANSWER_PENALTY = 0.25
+
+_LEGACY_TABLE = "answer"
+_SELECT_LEGACY_ROWS = "SELECT QUESTION, ANSWER FROM 'answer'"
+_DROP_LEGACY_TABLE = "DROP TABLE 'answer'"
+
+_CREATE_QUESTIONS = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    confidence REAL NOT NULL DEFAULT 1.0
+)
+"""
+_CREATE_ANSWERS = """
+CREATE TABLE IF NOT EXISTS answers (
+    question_id INTEGER NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (question_id, position)
+) WITHOUT ROWID
+"""
+_SELECT_ANSWERS = """
+SELECT answers.content FROM questions
+JOIN answers ON answers.question_id = questions.id
+WHERE questions.key = ? AND questions.confidence >= ?
+ORDER BY answers.position
+"""
+_SELECT_MANY_ANSWERS = """
+SELECT questions.key, answers.content FROM questions
+JOIN answers ON answers.question_id = questions.id
+WHERE questions.key IN (SELECT value FROM json_each(?)) AND questions.confidence >= ?
+ORDER BY questions.id, answers.position
+"""
+_INSERT_QUESTION = """
+INSERT INTO questions (key, title, confidence) VALUES (?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET title = excluded.title, confidence = excluded.confidence
+WHERE excluded.confidence >= questions.confidence OR questions.confidence < ?
+RETURNING id
+"""
+_SELECT_ITEMS = """
+SELECT questions.id, questions.title, answers.content FROM questions
+JOIN answers ON answers.question_id = questions.id
+ORDER BY questions.id, answers.position
+"""
+_SELECT_CONFIDENCE = "SELECT confidence FROM questions WHERE key = ?"
+_PENALIZE_QUESTION = "UPDATE questions SET confidence = confidence * ? WHERE key = ?"
+_ADD_CONFIDENCE_COLUMN = "ALTER TABLE questions ADD COLUMN confidence REAL NOT NULL DEFAULT 1.0"
+_DELETE_ANSWERS = "DELETE FROM answers WHERE question_id = ?"
+_INSERT_ANSWER = "INSERT INTO answers (question_id, position, content) VALUES (?, ?, ?)"
+
+
+class AnswerStore:
+    """Answers storaged in sqlite database, indexed by normalized question.
+
+    Every question has a confidence, answers are only replaced by answers with the same
+    or higher confidence, and answers reported wrong are ignored until replaced.
+
+    **Note**: The store can be used in other threads but it is not locked,
+    callers should not use it in many threads at the same time.
+    """
+
+    def __init__(self, path: Path | str):
+        """Open the database and migrate it to the latest schema.
+
+        Args:
+            path (Path | str): The path to the database file
+        """
+        self._conn = connect(path, check_same_thread=False)
+        _ = self._conn.execute("PRAGMA journal_mode = WAL")
+        _ = self._conn.execute("PRAGMA synchronous = NORMAL")
+        _ = self._conn.execute("PRAGMA foreign_keys = ON")
+        self._migrate()
+
+    def get(self, title: str) -> list[str]:
+        """Get answers of the question.
+
+        Args:
+            title (str): The question title
+
+        Returns:
+            list[str]: The answers, will be an empty list if no answer
+        """
+        rows = self._conn.execute(
+            _SELECT_ANSWERS,
+            (normalize_question(title), MIN_CONFIDENCE),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_many(self, titles: list[str]) -> dict[str, list[str]]:
+        """Get answers of many questions in one query.
+
+        Args:
+            titles (list[str]): The question titles
+
+        Returns:
+            dict[str, list[str]]: The answers of questions, questions without answer are omitted
+        """
+        titles_of_key: dict[str, list[str]] = {}
+        for title in titles:
+            titles_of_key.setdefault(normalize_question(title), []).append(title)
+        answers: dict[str, list[str]] = {}
+        rows = self._conn.execute(
+            _SELECT_MANY_ANSWERS,
+            (dumps(list(titles_of_key)), MIN_CONFIDENCE),
+        )
+        for key, group in groupby(rows, key=itemgetter(0)):
+            answer = [row[1] for row in group]
+            for title in titles_of_key[key]:
+                answers[title] = list(answer)
+        return answers
+
+    def iter_keys(self) -> Iterator[str]:
+        """Iterate over normalized keys of all questions.
+
+        Yields:
+            str: The key of question
+        """
+        for row in self._conn.execute("SELECT key FROM questions"):
+            yield row[0]
+
+    def get_confidence(self, title: str) -> float | None:
+        """Get confidence of the question.
+
+        Args:
+            title (str): The question title
+
+        Returns:
+            float | None: The confidence, None if the question is unknown
+        """
+        row = self._conn.execute(_SELECT_CONFIDENCE, (normalize_question(title),)).fetchone()
+        return None if row is None else row[0]
+
+    def add(self, title: str, answer: list[str], confidence: float = 1.0) -> bool:
+        """Add answers of the question.
+
+        Existing answers will be replaced unless they have a higher confidence.
+
+        Args:
+            title (str): The question title
+            answer (list[str]): The answers
+            confidence (float, optional): How much the answers are trusted. Defaults to 1.0.
+
+        Returns:
+            bool: If answers are written
+        """
+        with self._conn:
+            return self._add(title, answer, confidence)
+
+    def penalize(self, title: str, factor: float = WRONG_ANSWER_PENALTY):
+        """Lower confidence of the question after its answers are found wrong.
+
+        Args:
+            title (str): The question title
+            factor (float, optional): The confidence is multiplied by it.
+                Defaults to WRONG_ANSWER_PENALTY.
+        """
+        with self._conn:
+            _ = self._conn.execute(_PENALIZE_QUESTION, (factor, normalize_question(title)))
+
+    def add_many(
+        self,
+        items: Iterable[tuple[str, list[str]]],
+        batch_size: int = ADD_BATCH_SIZE,
+    ) -> int:
+        """Add answers of many questions, existing answers will be replaced.
+
+        Items are committed in batches so memory usage does not grow with the items.
+
+        Args:
+            items (Iterable[tuple[str, list[str]]]): The question titles and their answers
+            batch_size (int, optional): How many items in a transaction.
+                Defaults to ADD_BATCH_SIZE.
+
+        Returns:
+            int: How many items are added
+        """
+        count = 0
+        iterator = iter(items)
+        batch = list(islice(iterator, batch_size))
+        while len(batch) > 0:
+            with self._conn:
+                for title, answer in batch:
+                    self._add(title, answer)
+            count += len(batch)
+            batch = list(islice(iterator, batch_size))
+        return count
+
+    def iter_items(self) -> Iterator[tuple[str, list[str]]]:
+        """Iterate over all questions and their answers.
+
+        Yields:
+            tuple[str, list[str]]: The question title and its answers
+        """
+        rows = self._conn.execute(_SELECT_ITEMS)
+        for _, group in groupby(rows, key=itemgetter(0)):
+            group_rows = list(group)
+            yield group_rows[0][1], [row[2] for row in group_rows]
+
+    def close(self):
+        """Commit changes and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+    def _add(self, title: str, answer: list[str], confidence: float = 1.0) -> bool:
+        rows = self._conn.execute(
+            _INSERT_QUESTION,
+            (normalize_question(title), title, confidence, MIN_CONFIDENCE),
+        ).fetchall()
+        if len(rows) == 0:
+            # Existing answers are more trusted
+            return False
+        question_id: int = rows[0][0]
+        _ = self._conn.execute(_DELETE_ANSWERS, (question_id,))
+        _ = self._conn.executemany(
+            _INSERT_ANSWER,
+            [(question_id, position, content) for position, content in enumerate(answer)],
+        )
+        return True
+
+    def _migrate(self):
+        version: int = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self._conn:
+            if version < 1:
+                _ = self._conn.execute(_CREATE_QUESTIONS)
+                _ = self._conn.execute(_CREATE_ANSWERS)
+                if self._has_table(_LEGACY_TABLE):
+                    self._migrate_legacy_table()
+            elif version < 2:
+                _ = self._conn.execute(_ADD_CONFIDENCE_COLUMN)
+            _ = self._conn.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+
+    def _has_table(self, name: str) -> bool:
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (name,),
+            ).fetchone()
+            is not None
+        )
+
+    def _migrate_legacy_table(self):
+        # Legacy table storages base64 encoded question and answers joined by ANSWER_CONNECTOR
+        for question_encoded, answer_encoded in self._conn.execute(_SELECT_LEGACY_ROWS).fetchall():
+            try:
+                title = b64decode(question_encoded, validate=True).decode()
+                answer = b64decode(answer_encoded, validate=True).decode()
+            except ValueError:
+                # Includes binascii.Error, UnicodeDecodeError and non-ASCII strings
+                continue
+            if not title.strip() or not answer:
+                # Broken rows, for example "!!!" is decoded to ""
+                continue
+            _ = self._add(title, answer.split(ANSWER_CONNECTOR))
+        _ = self._conn.execute(_DROP_LEGACY_TABLE)
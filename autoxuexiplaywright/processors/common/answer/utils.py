@@ -1,8 +1,16 @@
 """Utils for processing answers and questions."""
 
+from re import compile
 from random import sample
 from string import digits
 from string import ascii_letters
+from unicodedata import category
+from unicodedata import normalize
+
+
+_SOLUTION_REGEX = compile(r"正确答案\s*[:\uff1a]\s*(.+)")
+_SOLUTION_SEPARATOR_REGEX = compile(r"[\s,\uff0c\u3001;\uff1b]+")
+_OPTION_PREFIX_REGEX = compile(r"^[A-Z]\s*[.\uff0e\u3001:\uff1a]\s*")
 
 
 def _has_chinese_char(chars: str) -> bool:
@@ -59,3 +67,62 @@ def gen_random_string(length: int = 4) -> str:
         str: The generated string
     """
     return "".join(sample(ascii_letters + digits, length))
+
+
+def normalize_question(title: str) -> str:
+    """Normalize a question title to the key used by answer stores.
+
+    Full-width characters are folded to half-width and all whitespace is removed,
+    so the same question scraped in different runs gets the same key.
+
+    Args:
+        title (str): The question title
+
+    Returns:
+        str: The normalized key
+    """
+    return "".join(normalize("NFKC", title).split())
+
+
+def simplify_question(title: str) -> str:
+    """Simplify a question title for fuzzy matching.
+
+    Besides `normalize_question`, punctuation, symbols and blank placeholders are
+    removed and letters are lowercased.
+
+    Args:
+        title (str): The question title
+
+    Returns:
+        str: The simplified title
+    """
+    return "".join(
+        char
+        for char in normalize_question(title).lower()
+        if not category(char).startswith(("P", "S"))
+    )
+
+
+def parse_solution(solution: str, options: list[str]) -> list[str]:
+    """Parse answers from the solution shown after answering wrong.
+
+    Option letters like `A`, `B` are translated to the text of options, so answers can
+    be matched with options in the next run even if options are shuffled.
+
+    Args:
+        solution (str): The text of solution, like `正确答案: A B`
+        options (list[str]): The options of choice question, empty for blank question
+
+    Returns:
+        list[str]: The answers, will be an empty list if solution can not be parsed
+    """
+    match = _SOLUTION_REGEX.search(solution)
+    if match is None:
+        return []
+    answers = [answer for answer in _SOLUTION_SEPARATOR_REGEX.split(match.group(1)) if answer]
+    if len(options) == 0:
+        return answers
+    letters = [ord(answer) - ord("A") for answer in answers if len(answer) == 1]
+    if len(letters) != len(answers) or not all(0 <= i < len(options) for i in letters):
+        return []
+    return [_OPTION_PREFIX_REGEX.sub("", options[i]) for i in letters]
@@ -0,0 +1,67 @@
+"""Classes and functions for comparing browsers and launch profiles."""
+
+# Relative imports
+from typing import NamedTuple
+from pathlib import Path
+from statistics import median
+
+
+PROC_PATH = Path("/proc")
+
+
+class BenchmarkResult(NamedTuple):
+    """How a browser with a launch profile performs."""
+
+    browser_id: str
+    profile: str
+    launch_secs: float
+    load_secs: list[float]
+    rss: int | None
+
+    @property
+    def median_load_secs(self) -> float:
+        """The median time of loading page."""
+        return median(self.load_secs) if len(self.load_secs) > 0 else 0.0
+
+
+def _read_ppid(stat: str) -> int:
+    # The command name may contain spaces and parentheses, fields after it are fixed
+    return int(stat[stat.rindex(")") + 2 :].split()[1])
+
+
+def read_tree_rss(pid: int, proc: Path = PROC_PATH) -> int | None:
+    """Sum resident memory of all descendants of the process.
+
+    Args:
+        pid (int): The process id, it is not counted
+        proc (Path, optional): The procfs mount point. Defaults to PROC_PATH.
+
+    Returns:
+        int | None: The memory in bytes, None if procfs is not available
+    """
+    if not proc.is_dir():
+        return None
+    # sysconf is not available on Windows, which does not have procfs either
+    from os import sysconf
+
+    children: dict[int, list[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            ppid = _read_ppid((entry / "stat").read_text())
+        except (OSError, ValueError, IndexError):
+            # The process exited or the file is not readable
+            continue
+        children.setdefault(ppid, []).append(int(entry.name))
+    page_size = sysconf("SC_PAGE_SIZE")
+    rss = 0
+    pending = list(children.get(pid, []))
+    while len(pending) > 0:
+        child = pending.pop()
+        pending.extend(children.get(child, []))
+        try:
+            rss += int((proc / str(child) / "statm").read_text().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            continue
+    return rss
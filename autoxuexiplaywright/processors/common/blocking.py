@@ -0,0 +1,107 @@
+"""Classes and functions for blocking requests not needed by tasks."""
+
+# Relative imports
+from typing import NamedTuple
+from ...logger import info
+from threading import Lock
+from ...languages import get_language_string
+from urllib.parse import urlparse
+
+
+class BlockProfile(NamedTuple):
+    """What to block, resource types are only blocked on content pages."""
+
+    name: str
+    resource_types: frozenset[str]
+    hosts: tuple[str, ...]
+
+
+# Articles and videos are on these hosts, login, points and exam pages are not touched
+CONTENT_HOSTS = ("www.xuexi.cn", "xuexi.cn")
+ANALYTICS_HOSTS = (
+    "hm.baidu.com",
+    "cnzz.com",
+    "umeng.com",
+    "arms-retcode.aliyuncs.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+)
+BLOCK_PROFILES = {
+    profile.name: profile
+    for profile in (
+        BlockProfile("off", frozenset(), ()),
+        BlockProfile("balanced", frozenset({"image", "font"}), ANALYTICS_HOSTS),
+        # Videos may not report progress without media, use it only if it works for you
+        BlockProfile("aggressive", frozenset({"image", "font", "media"}), ANALYTICS_HOSTS),
+    )
+}
+
+
+def should_block(profile: BlockProfile, resource_type: str, url: str, page_url: str) -> bool:
+    """Check if a request should be blocked.
+
+    Args:
+        profile (BlockProfile): The profile
+        resource_type (str): The resource type of request, like `image`
+        url (str): The url of request
+        page_url (str): The url of frame sending the request
+
+    Returns:
+        bool: If the request should be blocked
+    """
+    host = urlparse(url).hostname or ""
+    if any(host == blocked or host.endswith("." + blocked) for blocked in profile.hosts):
+        return True
+    return (
+        resource_type in profile.resource_types
+        and (urlparse(page_url).hostname or "") in CONTENT_HOSTS
+    )
+
+
+class BlockCounter:
+    """Count requests blocked by resource type, it can be shared by threads.
+
+    **Note**: Blocked responses are never downloaded, so only requests are counted.
+    """
+
+    def __init__(self):
+        """Create a BlockCounter instance."""
+        self.counts: dict[str, int] = {}
+        self._lock = Lock()
+
+    @property
+    def total(self) -> int:
+        """Requests blocked."""
+        with self._lock:
+            return sum(self.counts.values())
+
+    def record(self, resource_type: str):
+        """Count a blocked request.
+
+        Args:
+            resource_type (str): The resource type of request
+        """
+        with self._lock:
+            self.counts[resource_type] = self.counts.get(resource_type, 0) + 1
+
+    def clear(self):
+        """Forget requests counted."""
+        with self._lock:
+            self.counts.clear()
+
+    def format_counts(self) -> str:
+        """Format counts like `image: 3, font: 1`."""
+        with self._lock:
+            return ", ".join("%s: %d" % item for item in self.counts.items())
+
+
+block_counter = BlockCounter()
+
+
+def log_block_summary():
+    """Log how many requests are blocked."""
+    if block_counter.total > 0:
+        info(
+            get_language_string("core-info-requests-blocked")
+            % (block_counter.total, block_counter.format_counts()),
+        )
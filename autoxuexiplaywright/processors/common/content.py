@@ -0,0 +1,138 @@
+"""Classes and functions for queueing articles and videos found in list data."""
+
+# Relative imports
+from . import CONTENT_PAGE_REGEX
+from . import clean_string
+from re import Pattern
+from typing import Container
+from typing import NamedTuple
+from .visited import get_visited_index
+from .accounts import AccountLocal
+from threading import Lock
+from collections import deque
+
+
+class ContentItem(NamedTuple):
+    """An article or video."""
+
+    title: str
+    url: str
+
+
+class ContentQueue:
+    """Articles or videos not visited, in the order of list data.
+
+    The queue is locked, so it can be shared by tasks running in threads.
+    """
+
+    def __init__(self, visited: Container[str], page_regex: Pattern[str]):
+        """Create a ContentQueue instance.
+
+        Args:
+            visited (Container[str]): Titles and urls visited, they are never queued
+            page_regex (Pattern[str]): Urls of items to queue, like `NEWS_PAGE_REGEX`,
+                lists of news may link to videos and they are not queued
+        """
+        self._visited = visited
+        self._page_regex = page_regex
+        self._items: deque[ContentItem] = deque()
+        self._seen: set[str] = set()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Count items queued."""
+        with self._lock:
+            return len(self._items)
+
+    def put_many(self, items: list[ContentItem]) -> int:
+        """Queue items matching `page_regex`, not visited and not queued before.
+
+        Args:
+            items (list[ContentItem]): The items
+
+        Returns:
+            int: How many items are queued
+        """
+        count = 0
+        with self._lock:
+            for item in items:
+                if (
+                    self._page_regex.match(item.url) is None
+                    or item.url in self._seen
+                    or self._is_visited(item)
+                ):
+                    continue
+                self._seen.add(item.url)
+                self._items.append(item)
+                count += 1
+        return count
+
+    def pop(self) -> ContentItem | None:
+        """Take the first item not visited.
+
+        Returns:
+            ContentItem | None: The item, None if the queue is empty
+        """
+        with self._lock:
+            while len(self._items) > 0:
+                item = self._items.popleft()
+                if not self._is_visited(item):
+                    return item
+        return None
+
+    def _is_visited(self, item: ContentItem) -> bool:
+        return item.title in self._visited or item.url in self._visited
+
+
+_content_queues: AccountLocal[dict[str, ContentQueue]] = AccountLocal(dict)
+_content_queues_lock = Lock()
+
+
+def parse_content_list(payload: object) -> list[ContentItem]:
+    """Parse articles or videos from list data like `https://www.xuexi.cn/lgdata/*.json`.
+
+    Args:
+        payload (object): The json payload, a list of items with `title` and `url`
+
+    Returns:
+        list[ContentItem]: The items, items not linking to an article or video are omitted
+    """
+    items: list[ContentItem] = []
+    if isinstance(payload, list):
+        for item in payload:  # type: ignore
+            if not isinstance(item, dict):
+                continue
+            title = item.get("title")  # type: ignore
+            url = item.get("url")  # type: ignore
+            if (
+                isinstance(title, str)
+                and isinstance(url, str)
+                and CONTENT_PAGE_REGEX.match(url) is not None
+            ):
+                items.append(ContentItem(clean_string(title), url))
+    return items
+
+
+def get_content_queue(name: str, page_regex: Pattern[str]) -> ContentQueue:
+    """Get the queue shared by tasks of current account in this run.
+
+    Args:
+        name (str): The name of queue, like the name of task class
+        page_regex (Pattern[str]): Urls of items to queue, used when the queue is created
+
+    Returns:
+        ContentQueue: The queue
+    """
+    queues = _content_queues.get()
+    with _content_queues_lock:
+        queue = queues.get(name)
+        if queue is None:
+            queue = ContentQueue(get_visited_index(), page_regex)
+            queues[name] = queue
+        return queue
+
+
+def clear_content_queues():
+    """Forget all queued items of all accounts."""
+    with _content_queues_lock:
+        _content_queues.clear()
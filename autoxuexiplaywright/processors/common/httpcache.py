@@ -0,0 +1,248 @@
+"""Classes and functions for caching static assets on disk."""
+
+# Relative imports
+from . import HTTP_CACHE_DIRNAME
+from . import HTTP_CACHE_DEFAULT_TTL_SECS
+from re import compile
+from json import dumps
+from json import loads
+from time import time
+from hashlib import sha256
+from pathlib import Path
+from sqlite3 import connect
+from ...logger import info
+from threading import Lock
+from ...storage import get_cache_path
+from email.utils import parsedate_to_datetime
+from ...languages import get_language_string
+from urllib.parse import urlparse
+
+
+INDEX_FILENAME = "index.db"
+CACHEABLE_RESOURCE_TYPES = frozenset({"script", "stylesheet", "font", "image"})
+CACHEABLE_HOST_SUFFIX = "xuexi.cn"
+# Headers needed to use the body again, encoding headers are dropped as body is decoded
+KEPT_HEADERS = ("content-type", "access-control-allow-origin", "last-modified", "etag")
+
+_MAX_AGE_REGEX = compile(r"max-age=(\d+)")
+
+_CREATE_ENTRIES = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID
+"""
+_CREATE_BLOBS = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+_SELECT_ENTRY = "SELECT digest, headers, expires_at FROM entries WHERE url = ?"
+_TOUCH_ENTRY = "UPDATE entries SET last_used = ? WHERE url = ?"
+_DELETE_ENTRY = "DELETE FROM entries WHERE url = ?"
+_INSERT_ENTRY = "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)"
+_INSERT_BLOB = "INSERT OR IGNORE INTO blobs VALUES (?, ?)"
+_SELECT_TOTAL_SIZE = "SELECT COALESCE(SUM(size), 0) FROM blobs"
+# Expired entries are removed first
+_SELECT_OLDEST = "SELECT url, digest FROM entries ORDER BY expires_at > ?, last_used"
+_COUNT_DIGEST = "SELECT COUNT(*) FROM entries WHERE digest = ?"
+_DELETE_BLOB = "DELETE FROM blobs WHERE digest = ? RETURNING size"
+
+
+def is_cacheable(method: str, resource_type: str, url: str) -> bool:
+    """Check if a request is for a static asset which can be cached.
+
+    Args:
+        method (str): The method of request
+        resource_type (str): The resource type of request, like `script`
+        url (str): The url of request
+
+    Returns:
+        bool: If the request can be served from cache
+    """
+    host = urlparse(url).hostname or ""
+    return (
+        method == "GET"
+        and resource_type in CACHEABLE_RESOURCE_TYPES
+        and (host == CACHEABLE_HOST_SUFFIX or host.endswith("." + CACHEABLE_HOST_SUFFIX))
+    )
+
+
+def get_ttl(headers: dict[str, str]) -> float | None:
+    """Get how long a response can be cached from its headers.
+
+    Responses are only cached when they have an explicit lifetime from `max-age` or
+    `Expires`, or a validator like `ETag` or `Last-Modified`. Cached responses are
+    never revalidated, so `no-cache` is treated like `no-store`.
+
+    Args:
+        headers (dict[str, str]): The headers of response, names are in lower case
+
+    Returns:
+        float | None: The seconds, None if the response should not be cached
+    """
+    cache_control = headers.get("cache-control", "")
+    if any(directive in cache_control for directive in ("no-store", "no-cache", "private")):
+        return None
+    max_age = _MAX_AGE_REGEX.search(cache_control)
+    if max_age is not None:
+        return float(max_age.group(1)) or None
+    if "expires" in headers:
+        # An invalid date like `0` means the response is already expired
+        expires = _parse_http_date(headers["expires"])
+        now = _parse_http_date(headers.get("date", "")) or time()
+        return None if expires is None or expires <= now else expires - now
+    if "etag" in headers or "last-modified" in headers:
+        return HTTP_CACHE_DEFAULT_TTL_SECS
+    return None
+
+
+def _parse_http_date(value: str) -> float | None:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpCache:
+    """Response bodies storaged by their sha256, urls with the same body share a file.
+
+    When total size exceeds `max_size`, expired urls and then urls used least recently
+    are removed, and files not used by any url are deleted. The cache is locked, so it
+    can be shared by threads.
+    """
+
+    def __init__(self, folder: Path, max_size: int):
+        """Open the cache in the folder.
+
+        Args:
+            folder (Path): The folder to storage bodies and index
+            max_size (int): Max bytes of all bodies
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self._folder = folder
+        self._folder.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = connect(folder / INDEX_FILENAME, check_same_thread=False)
+        _ = self._conn.execute("PRAGMA journal_mode = WAL")
+        _ = self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._conn:
+            _ = self._conn.execute(_CREATE_ENTRIES)
+            _ = self._conn.execute(_CREATE_BLOBS)
+
+    def get(self, url: str) -> tuple[dict[str, str], bytes] | None:
+        """Get the cached response of url.
+
+        Args:
+            url (str): The url
+
+        Returns:
+            tuple[dict[str, str], bytes] | None: The headers and body,
+                None if not cached or expired
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(_SELECT_ENTRY, (url,)).fetchone()
+            body = None
+            if row is not None and row[2] > time():
+                try:
+                    body = (self._folder / row[0]).read_bytes()
+                except OSError:
+                    _ = self._conn.execute(_DELETE_ENTRY, (url,))
+            if body is None:
+                self.misses += 1
+                return None
+            _ = self._conn.execute(_TOUCH_ENTRY, (time(), url))
+            self.hits += 1
+            self.bytes_served += len(body)
+            return loads(row[1]), body
+
+    def put(self, url: str, headers: dict[str, str], body: bytes, ttl: float):
+        """Cache the response of url.
+
+        Args:
+            url (str): The url
+            headers (dict[str, str]): The headers of response, names are in lower case
+            body (bytes): The body of response
+            ttl (float): How long the response can be used, in seconds
+        """
+        if len(body) > self.max_size:
+            return
+        digest = sha256(body).hexdigest()
+        kept = {name: headers[name] for name in KEPT_HEADERS if name in headers}
+        with self._lock, self._conn:
+            path = self._folder / digest
+            if not path.exists():
+                # Write to a temporary file so readers never see a partial body
+                temp = path.with_suffix(".tmp")
+                _ = temp.write_bytes(body)
+                _ = temp.replace(path)
+            now = time()
+            old = self._conn.execute(_SELECT_ENTRY, (url,)).fetchone()
+            _ = self._conn.execute(_INSERT_BLOB, (digest, len(body)))
+            _ = self._conn.execute(_INSERT_ENTRY, (url, digest, dumps(kept), now + ttl, now))
+            if old is not None and old[0] != digest:
+                # The body of url changed, its old body may be used by nothing now
+                _ = self._delete_unused_blob(old[0])
+            self._evict()
+
+    def close(self):
+        """Close the index."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        total = self._conn.execute(_SELECT_TOTAL_SIZE).fetchone()[0]
+        if total <= self.max_size:
+            return
+        for url, digest in self._conn.execute(_SELECT_OLDEST, (time(),)).fetchall():
+            _ = self._conn.execute(_DELETE_ENTRY, (url,))
+            total -= self._delete_unused_blob(digest)
+            if total <= self.max_size:
+                return
+
+    def _delete_unused_blob(self, digest: str) -> int:
+        if self._conn.execute(_COUNT_DIGEST, (digest,)).fetchone()[0] > 0:
+            return 0
+        row = self._conn.execute(_DELETE_BLOB, (digest,)).fetchone()
+        (self._folder / digest).unlink(missing_ok=True)
+        return 0 if row is None else row[0]
+
+
+_http_cache: HttpCache | None = None
+_http_cache_lock = Lock()
+
+
+def get_http_cache(max_size: int) -> HttpCache:
+    """Get the cache in cache folder, it is opened when first used.
+
+    Args:
+        max_size (int): Max bytes of all bodies
+
+    Returns:
+        HttpCache: The cache
+    """
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(get_cache_path(HTTP_CACHE_DIRNAME), max_size)
+        return _http_cache
+
+
+def close_http_cache():
+    """Log hits of the cache and close it if it is opened."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is not None:
+            info(
+                get_language_string("core-info-http-cache-summary")
+                % (_http_cache.hits, _http_cache.misses, _http_cache.bytes_served / 1024 / 1024),
+            )
+            _http_cache.close()
+            _http_cache = None
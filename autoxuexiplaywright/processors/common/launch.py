@@ -0,0 +1,102 @@
+"""Functions for getting options to launch browsers."""
+
+from typing import Any
+
+# Relative imports
+from ...config import Config
+from ...config import BrowserType
+from ...logger import warning
+from ...languages import get_language_string
+
+
+LAUNCH_PROFILES = ("default", "performance")
+
+# Background timers are not throttled so tabs read in parallel keep counting
+_CHROMIUM_PERFORMANCE_ARGS = [
+    "--mute-audio",
+    "--disable-gpu",
+    "--disable-gpu-compositing",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disk-cache-size=33554432",
+]
+_FIREFOX_PERFORMANCE_PREFS: dict[str, str | float | bool] = {
+    "media.volume_scale": "0.0",
+    "layers.acceleration.disabled": True,
+    "gfx.canvas.accelerated": False,
+    "browser.cache.disk.capacity": 32768,
+    "browser.cache.memory.capacity": 16384,
+    "browser.sessionhistory.max_entries": 2,
+    "dom.timeout.enable_budget_timer_throttling": False,
+    "extensions.update.enabled": False,
+    "network.prefetch-next": False,
+}
+PERFORMANCE_VIEWPORT = {"width": 1024, "height": 640}
+
+
+def get_launch_options(
+    config: Config,
+    browser_id: BrowserType | None = None,
+    profile: str | None = None,
+) -> dict[str, Any]:
+    """Get options for `launch()` of browser type.
+
+    Unknown profiles are treated as `default`.
+
+    Args:
+        config (Config): The config
+        browser_id (BrowserType | None, optional): The browser, `config.browser_id` if None.
+            Defaults to None.
+        profile (str | None, optional): The launch profile, `config.launch_profile` if None.
+            Defaults to None.
+
+    Returns:
+        dict[str, Any]: The options
+    """
+    browser_id = browser_id or config.browser_id
+    profile = profile or config.launch_profile
+    if profile not in LAUNCH_PROFILES:
+        warning(get_language_string("core-warning-unknown-launch-profile") % profile)
+    options: dict[str, Any] = {
+        "headless": not config.debug,
+        "proxy": config.proxy,
+        "channel": config.browser_channel,
+        "args": ["--mute-audio"],
+        "devtools": not config.debug,
+        "executable_path": config.executable_path,
+        "firefox_user_prefs": {"media.volume_scale": "0.0"},
+    }
+    if profile == "performance":
+        options["devtools"] = False
+        match browser_id:
+            case "chromium":
+                options["args"] = list(_CHROMIUM_PERFORMANCE_ARGS)
+            case "firefox":
+                options["firefox_user_prefs"] = dict(_FIREFOX_PERFORMANCE_PREFS)
+            case _:
+                # WebKit does not accept tuning flags
+                options["args"] = []
+    return options
+
+
+def get_context_options(config: Config, profile: str | None = None) -> dict[str, Any]:
+    """Get options for `new_context()` of browser, they also work on persistent context.
+
+    Args:
+        config (Config): The config
+        profile (str | None, optional): The launch profile, `config.launch_profile` if None.
+            Defaults to None.
+
+    Returns:
+        dict[str, Any]: The options
+    """
+    if (profile or config.launch_profile) == "performance":
+        return {"viewport": dict(PERFORMANCE_VIEWPORT)}
+    return {}
@@ -0,0 +1,109 @@
+"""Classes and functions for parsing exam papers from network responses."""
+
+# Relative imports
+from . import clean_string
+from re import DOTALL
+from re import sub
+from re import compile
+from json import loads
+from base64 import b64decode
+from typing import NamedTuple
+from binascii import Error as Base64Error
+from .answer.utils import is_valid_answer
+from .answer.utils import simplify_question
+
+
+_HINT_REGEX = compile(r"<font[^>]*color=[\"']?red[\"']?[^>]*>(.*?)</font>", DOTALL)
+_TAG_REGEX = compile(r"<[^>]+>")
+
+
+class PaperQuestion(NamedTuple):
+    """A question in exam paper."""
+
+    title: str
+    options: list[str]
+    hints: list[str]
+
+
+def _strip_tags(html: str) -> str:
+    return clean_string(sub(_TAG_REGEX, "", html))
+
+
+def _find_questions(payload: object) -> list[object]:
+    if isinstance(payload, str):
+        try:
+            payload = loads(b64decode(payload, validate=True))
+        except (Base64Error, UnicodeDecodeError, ValueError):
+            return []
+    if isinstance(payload, dict):
+        questions = payload.get("questions")  # type: ignore
+        if isinstance(questions, list):
+            return questions  # type: ignore
+        for key in ("data_str", "data"):
+            if key in payload:
+                found = _find_questions(payload[key])  # type: ignore
+                if len(found) > 0:
+                    return found
+    return []
+
+
+def _parse_question(question: object) -> PaperQuestion | None:
+    if not isinstance(question, dict):
+        return None
+    body = question.get("body")  # type: ignore
+    if not isinstance(body, str):
+        return None
+    options: list[str] = []
+    answers = question.get("answers")  # type: ignore
+    if isinstance(answers, list):
+        for answer in answers:  # type: ignore
+            if isinstance(answer, dict) and isinstance(answer.get("content"), str):  # type: ignore
+                options.append(_strip_tags(answer["content"]))  # type: ignore
+    hints: list[str] = []
+    description = question.get("questionDesc")  # type: ignore
+    if isinstance(description, str):
+        for raw_hint in _HINT_REGEX.findall(description):
+            hint = _strip_tags(raw_hint)
+            if is_valid_answer(hint):
+                hints.append(hint)
+    return PaperQuestion(_strip_tags(body), options, hints)
+
+
+def parse_paper(payload: object) -> list[PaperQuestion]:
+    """Parse questions from the json payload of exam API.
+
+    The questions may be placed at `questions`, `data.questions` or in base64 encoded
+    json at `data_str`.
+
+    Args:
+        payload (object): The json payload
+
+    Returns:
+        list[PaperQuestion]: The questions, will be an empty list if no question found
+    """
+    return [
+        question
+        for question in map(_parse_question, _find_questions(payload))
+        if question is not None
+    ]
+
+
+def find_paper_question(paper: list[PaperQuestion], index: int, title: str) -> int | None:
+    """Find the question shown on page in the paper.
+
+    The question at `index` is checked first, then the whole paper, because questions
+    may be skipped or in another order than the paper.
+
+    Args:
+        paper (list[PaperQuestion]): The paper
+        index (int): The index of question expected
+        title (str): The title of question on page
+
+    Returns:
+        int | None: The index of question, None if the question is not in the paper
+    """
+    key = simplify_question(title)
+    for i in (index, *range(len(paper))):
+        if 0 <= i < len(paper) and simplify_question(paper[i].title) == key:
+            return i
+    return None
@@ -0,0 +1,85 @@
+"""Classes and functions for parsing points progress from backend API."""
+
+from typing import NamedTuple
+
+
+class RuleProgress(NamedTuple):
+    """Points got today and the daily cap of a rule, like a card on points page."""
+
+    title: str
+    current: int
+    cap: int
+
+    @property
+    def remaining(self) -> int:
+        """How many points can still be got today."""
+        return max(self.cap - self.current, 0)
+
+    @property
+    def ratio(self) -> float:
+        """Progress between 0 and 1, a rule without cap is finished."""
+        return min(self.current / self.cap, 1.0) if self.cap > 0 else 1.0
+
+
+class Progress(NamedTuple):
+    """Points progress of today."""
+
+    total: int | None
+    rules: list[RuleProgress]
+
+    @property
+    def today(self) -> int:
+        """Points got today."""
+        return sum(rule.current for rule in self.rules)
+
+    def get(self, title: str) -> RuleProgress | None:
+        """Get progress of the rule.
+
+        Args:
+            title (str): The title of rule
+
+        Returns:
+            RuleProgress | None: The progress, None if not found
+        """
+        for rule in self.rules:
+            if rule.title == title:
+                return rule
+        return None
+
+
+def _parse_rule(rule: object) -> RuleProgress | None:
+    if not isinstance(rule, dict):
+        return None
+    title = rule.get("title")  # type: ignore
+    current = rule.get("currentScore")  # type: ignore
+    cap = rule.get("dayMaxScore")  # type: ignore
+    if not isinstance(title, str) or not isinstance(current, int) or not isinstance(cap, int):
+        return None
+    return RuleProgress(title.strip(), current, cap)
+
+
+def parse_progress(payload: object) -> Progress | None:
+    """Parse progress from the json payload of score progress API.
+
+    Rules are read from `data.taskProgress`, the total score is read from
+    `data.totalScore` if it exists.
+
+    Args:
+        payload (object): The json payload
+
+    Returns:
+        Progress | None: The progress, None if the payload is not a valid progress
+    """
+    if not isinstance(payload, dict):
+        return None
+    data = payload.get("data")  # type: ignore
+    if not isinstance(data, dict):
+        return None
+    raw_rules = data.get("taskProgress")  # type: ignore
+    if not isinstance(raw_rules, list):
+        return None
+    rules = [rule for rule in map(_parse_rule, raw_rules) if rule is not None]  # type: ignore
+    if len(rules) == 0:
+        return None
+    total = data.get("totalScore")  # type: ignore
+    return Progress(total if isinstance(total, int) else None, rules)
@@ -0,0 +1,96 @@
+"""Classes and functions for planning how long to read."""
+
+# Relative imports
+from . import READ_TIME_SECS
+from . import TIME_RULE_SUFFIX
+from . import READ_POINTS_PER_ITEM
+from . import READ_SECS_PER_TIME_POINT
+from math import ceil
+from typing import NamedTuple
+from .status import get_rule_progress
+from ...logger import info
+from threading import Lock
+from ...languages import get_language_string
+
+
+class ReadPlan(NamedTuple):
+    """How many articles or videos to read and how long to stay on each of them."""
+
+    items: int
+    dwell_secs: float
+
+
+class ReadSummary:
+    """Items read and time spent by read tasks, it can be shared by threads."""
+
+    def __init__(self):
+        """Create a ReadSummary instance."""
+        self.items = 0
+        self.dwell_secs = 0.0
+        self.spent_secs = 0.0
+        self._lock = Lock()
+
+    def record(self, plan: ReadPlan, spent_secs: float):
+        """Add a finished read task.
+
+        Args:
+            plan (ReadPlan): The plan of task
+            spent_secs (float): How long the task took
+        """
+        with self._lock:
+            self.items += plan.items
+            self.dwell_secs += plan.items * plan.dwell_secs
+            self.spent_secs += spent_secs
+
+    def clear(self):
+        """Forget read tasks added."""
+        with self._lock:
+            self.items = 0
+            self.dwell_secs = 0.0
+            self.spent_secs = 0.0
+
+
+read_summary = ReadSummary()
+
+
+def plan_read(task_title: str) -> ReadPlan:
+    """Plan reading by points can still be got from the rule.
+
+    Every article or video gives `READ_POINTS_PER_ITEM` points after `READ_TIME_SECS`.
+    Rules ending with `TIME_RULE_SUFFIX` count time instead, every point needs
+    `READ_SECS_PER_TIME_POINT`, so one item is read until the time is reached. One
+    item is read if progress from API is not available.
+
+    Args:
+        task_title (str): The title of task on points page
+
+    Returns:
+        ReadPlan: The plan, `items` is 0 if nothing needs to be read
+    """
+    progress = get_rule_progress(task_title)
+    if progress is None:
+        return ReadPlan(1, READ_TIME_SECS)
+    if task_title.endswith(TIME_RULE_SUFFIX):
+        return ReadPlan(min(progress.remaining, 1), progress.remaining * READ_SECS_PER_TIME_POINT)
+    return ReadPlan(ceil(progress.remaining / READ_POINTS_PER_ITEM), READ_TIME_SECS)
+
+
+def record_read(task_title: str, plan: ReadPlan, open_secs: float, spent_secs: float):
+    """Log how long a finished read task took and add it to the summary.
+
+    Args:
+        task_title (str): The title of task on points page
+        plan (ReadPlan): The plan of task
+        open_secs (float): How long it took to open the list and the first item
+        spent_secs (float): How long the task took, including `open_secs`
+    """
+    info(get_language_string("core-info-read-finished") % (task_title, spent_secs, open_secs))
+    read_summary.record(plan, spent_secs)
+
+
+def log_read_summary():
+    """Log how many items are read and how long read tasks took."""
+    info(
+        get_language_string("core-info-read-summary")
+        % (read_summary.items, read_summary.dwell_secs, read_summary.spent_secs),
+    )
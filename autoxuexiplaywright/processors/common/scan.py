@@ -0,0 +1,96 @@
+"""Classes and functions for scanning rows of lists in one round-trip."""
+
+from typing import Container
+from typing import NamedTuple
+
+# Relative imports
+from .selectors import ReadSelectors
+from .selectors import TestSelectors
+
+
+# Read text and a marker of every row in one round-trip
+ROWS_SCRIPT = """(rows, [textSelector, markerSelector, markerAttribute]) => rows.map((row) => {
+    const text = textSelector ? row.querySelector(textSelector) : row;
+    const marker = markerSelector ? row.querySelector(markerSelector) : null;
+    return {
+        text: text?.innerText ?? "",
+        marker: marker && (markerAttribute ? marker.getAttribute(markerAttribute) : ""),
+    };
+})"""
+# Arguments are the text selector, the marker selector and the attribute of marker,
+# the row itself is used if text selector is empty and marker is "" if attribute is empty
+NEWS_ROWS_ARGS = [ReadSelectors.NEWS_TITLE_TEXT, "", ""]
+VIDEO_ROWS_ARGS = ["", "", ""]
+WEEK_ROWS_ARGS = [TestSelectors.TEST_WEEK_TITLE, TestSelectors.TEST_WEEK_STAT, "class"]
+SPECIAL_ROWS_ARGS = ["", TestSelectors.TEST_SPECIAL_SOLUTION, ""]
+
+
+class Row(NamedTuple):
+    """Text and marker of a row.
+
+    Marker is None if the marker element or its attribute is not found.
+    """
+
+    text: str
+    marker: str | None
+
+
+def parse_rows(result: list[dict[str, str | None]]) -> list[Row]:
+    """Parse result of `ROWS_SCRIPT`.
+
+    Args:
+        result (list[dict[str, str | None]]): The result of script
+
+    Returns:
+        list[Row]: The rows
+    """
+    return [Row((row["text"] or "").strip().replace("\n", ""), row["marker"]) for row in result]
+
+
+def find_unvisited_row(rows: list[Row], visited: Container[str]) -> int | None:
+    """Find the first row whose text is not visited.
+
+    Args:
+        rows (list[Row]): The rows
+        visited (Container[str]): The texts visited
+
+    Returns:
+        int | None: The index of row, None if all rows are visited
+    """
+    for i, row in enumerate(rows):
+        if row.text not in visited:
+            return i
+    return None
+
+
+def find_unmarked_row(rows: list[Row]) -> int | None:
+    """Find the first row without marker.
+
+    Args:
+        rows (list[Row]): The rows
+
+    Returns:
+        int | None: The index of row, None if all rows have marker
+    """
+    for i, row in enumerate(rows):
+        if row.marker is None:
+            return i
+    return None
+
+
+def find_marker_without(rows: list[Row], text: str) -> int | None:
+    """Find the first row whose marker does not contain the text.
+
+    Rows without marker are treated as containing the text.
+
+    Args:
+        rows (list[Row]): The rows
+        text (str): The text
+
+    Returns:
+        int | None: The index of row, None if all markers contain the text
+    """
+    for i, row in enumerate(rows):
+        if row.marker is not None and text not in row.marker:
+            return i
+    return None
@@ -0,0 +1,147 @@
+"""Classes and functions for scheduling tasks by their dependencies."""
+
+# Relative imports
+from . import TaskStatus
+from . import AbstractBaseTask
+from . import get_task_by_task_title
+from time import monotonic
+from typing import NamedTuple
+from ...logger import info
+from ...logger import warning
+from ...languages import get_language_string
+
+
+class TaskNode(NamedTuple):
+    """Titles handled by the same task, they are done one by one."""
+
+    task: AbstractBaseTask
+    titles: tuple[str, ...]
+
+
+class TimelineEntry(NamedTuple):
+    """When a node is started and finished, relative to the start of scheduler."""
+
+    node: TaskNode
+    start: float
+    end: float
+    success: bool
+
+
+class TaskScheduler:
+    """Schedule task nodes as a dependency graph.
+
+    A node is ready as soon as all nodes handling its `requires` succeeded, and at most
+    `budget` nodes run at the same time. Requirements not in the graph are treated as
+    done unless their task failed. If a node failed, nodes depending on it are dropped.
+
+    The scheduler only does bookkeeping, runners call `take_ready()` to get nodes to
+    start and `finish()` when nodes finished.
+    """
+
+    def __init__(self, budget: int, *task_titles: str):
+        """Create a TaskScheduler instance.
+
+        Args:
+            budget (int): How many nodes can run at the same time
+            *task_titles (str): The titles of tasks to be done, unknown titles are ignored
+        """
+        self.budget = max(budget, 1)
+        self.timeline: list[TimelineEntry] = []
+        self.dropped: list[TaskNode] = []
+        self._start_time = monotonic()
+        titles_of_task: dict[AbstractBaseTask, list[str]] = {}
+        for task_title in dict.fromkeys(task_titles):
+            task = get_task_by_task_title(task_title)
+            if task:
+                titles_of_task.setdefault(task, []).append(task_title)
+        self._pending = sorted(
+            [TaskNode(task, tuple(titles)) for task, titles in titles_of_task.items()],
+            key=lambda node: len(node.task.requires),
+        )
+        self._running: dict[TaskNode, float] = {}
+        self._succeeded: set[AbstractBaseTask] = set()
+        self._failed: set[AbstractBaseTask] = set()
+
+    @property
+    def done(self) -> bool:
+        """If there is nothing to run or running."""
+        return len(self._pending) == 0 and len(self._running) == 0
+
+    def take_ready(self) -> list[TaskNode]:
+        """Take nodes which can be started now, they are marked as running.
+
+        Returns:
+            list[TaskNode]: The nodes, ordered by how many requirements they have
+        """
+        ready: list[TaskNode] = []
+        now = monotonic()
+        for node in self._pending.copy():
+            if len(self._running) >= self.budget:
+                break
+            match self._get_requirements_state(node):
+                case TaskStatus.SUCCESS:
+                    ready.append(node)
+                    self._pending.remove(node)
+                    self._running[node] = now
+                case TaskStatus.FAILED:
+                    self._drop(node)
+                case _:
+                    pass
+        if len(ready) == 0 and len(self._running) == 0:
+            # Nothing can make progress, requirements are circular
+            for node in self._pending.copy():
+                self._drop(node)
+        return ready
+
+    def finish(self, node: TaskNode, success: bool):
+        """Mark a running node as finished.
+
+        Args:
+            node (TaskNode): The node
+            success (bool): If all titles of the node are done successfully
+        """
+        start = self._running.pop(node)
+        (self._succeeded if success else self._failed).add(node.task)
+        self.timeline.append(
+            TimelineEntry(
+                node,
+                start - self._start_time,
+                monotonic() - self._start_time,
+                success,
+            ),
+        )
+
+    def log_timeline(self):
+        """Log when every node is started and finished."""
+        for entry in self.timeline:
+            info(
+                get_language_string("core-info-task-timeline")
+                % (
+                    ", ".join(entry.node.titles),
+                    entry.start,
+                    entry.end,
+                    entry.success,
+                ),
+            )
+
+    def _get_requirements_state(self, node: TaskNode) -> TaskStatus:
+        state = TaskStatus.SUCCESS
+        for requirement in node.task.requires:
+            task = get_task_by_task_title(requirement)
+            if task is None or task is node.task:
+                continue
+            if task in self._failed:
+                return TaskStatus.FAILED
+            if task in self._succeeded:
+                continue
+            if any(other.task is task for other in [*self._pending, *self._running]):
+                state = TaskStatus.UNKNOWN
+            elif task.status == TaskStatus.FAILED:
+                return TaskStatus.FAILED
+        return state
+
+    def _drop(self, node: TaskNode):
+        self._pending.remove(node)
+        self._failed.add(node.task)
+        self.dropped.append(node)
+        warning(get_language_string("core-warning-task-dropped") % ", ".join(node.titles))
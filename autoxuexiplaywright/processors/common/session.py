@@ -0,0 +1,20 @@
+"""Functions for reusing login sessions saved as storage state."""
+
+# Relative imports
+from .progress import parse_progress
+
+
+def is_logged_in(status: int, payload: object) -> bool:
+    """Check if the session is logged in by the response of score progress API.
+
+    The API only returns progress to logged in users, so it is cheaper than loading
+    login page and waiting for the result of login check.
+
+    Args:
+        status (int): The status code of response
+        payload (object): The json of response, None if it is not a json
+
+    Returns:
+        bool: If the session is logged in
+    """
+    return status == 200 and parse_progress(payload) is not None
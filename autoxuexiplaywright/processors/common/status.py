@@ -0,0 +1,165 @@
+"""Classes and functions for collecting task status from points page."""
+
+# Relative imports
+from . import TaskStatus
+from . import get_scores
+from . import get_tasks_to_be_done
+from . import set_task_status_by_task_title
+from typing import NamedTuple
+from ...config import get_runtime_config
+from ...events import EventID
+from ...events import find_event_by_id
+from ...logger import info
+from ...logger import debug
+from ...logger import error
+from ...logger import warning
+from .accounts import AccountLocal
+from .progress import Progress
+from .progress import RuleProgress
+from .selectors import PointsSelectors
+from ...languages import get_language_string
+
+
+# Read points and all cards in one round-trip
+STATUS_SCRIPT = """([pointsSelector, cardsSelector, titleSelector, progressSelector]) => ({
+    points: Array.from(document.querySelectorAll(pointsSelector), (span) => span.innerText),
+    cards: Array.from(document.querySelectorAll(cardsSelector), (card) => ({
+        title: card.querySelector(titleSelector)?.innerText ?? "",
+        style: card.querySelector(progressSelector)?.getAttribute("style") ?? "",
+    })),
+})"""
+STATUS_SCRIPT_ARGS = [
+    PointsSelectors.POINTS_SPAN,
+    PointsSelectors.POINTS_CARDS,
+    PointsSelectors.CARD_TITLE,
+    PointsSelectors.CARD_PROGRESS,
+]
+
+_config = get_runtime_config()
+_latest_progress: AccountLocal[Progress | None] = AccountLocal(lambda: None)
+
+
+class CardStatus(NamedTuple):
+    """Progress of a card on points page."""
+
+    title: str
+    progress: float
+
+
+def parse_progress_style(style: str) -> float | None:
+    """Parse progress from style like `width: 50%;`.
+
+    Args:
+        style (str): The style of progress bar
+
+    Returns:
+        float | None: The progress between 0 and 1, None if it is not a width style
+    """
+    style = style.strip()
+    if not style.startswith("width"):
+        return None
+    percent = style.removeprefix("width").replace(":", "").removesuffix(";").strip()
+    try:
+        return float(percent.removesuffix("%")) / 100
+    except ValueError:
+        return None
+
+
+class StatusCollector:
+    """Apply status read from points page and remember cards seen last time.
+
+    Progress parsed from the score progress API is preferred, pass it to
+    `apply_progress()`, and call `apply()` with cards scraped from the page only
+    if the API is not available.
+    """
+
+    def __init__(self):
+        """Create a StatusCollector instance."""
+        self.cards: dict[str, CardStatus] = {}
+
+    def apply_progress(self, progress: Progress) -> bool:
+        """Update scores and tasks to be done from progress of API.
+
+        Args:
+            progress (Progress): The progress
+
+        Returns:
+            bool: If all tasks are finished
+        """
+        _latest_progress.set(progress)
+        scores = get_scores()
+        if progress.total is not None:
+            scores[0] = progress.total
+        scores[1] = progress.today
+        info(get_language_string("core-info-update-score-success") % tuple(scores))
+        return self._apply_cards(
+            [CardStatus(rule.title, rule.ratio) for rule in progress.rules],
+            {rule.title: rule.remaining for rule in progress.rules},
+        )
+
+    def apply(self, status: dict[str, list[str] | list[dict[str, str]]]) -> bool:
+        """Update scores and tasks to be done from the result of `STATUS_SCRIPT`.
+
+        Args:
+            status (dict[str, list[str] | list[dict[str, str]]]): The result of script
+
+        Returns:
+            bool: If all tasks are finished
+        """
+        scores = get_scores()
+        try:
+            points = [int(text) for text in status["points"][:2]]  # type: ignore
+            scores[0], scores[1] = points
+        except ValueError:
+            error(get_language_string("core-error-update-score-failed"))
+        else:
+            info(get_language_string("core-info-update-score-success") % tuple(scores))
+
+        cards: list[CardStatus] = []
+        for card in status["cards"]:
+            progress = parse_progress_style(card["style"])  # type: ignore
+            if progress is None:
+                warning(get_language_string("core-warning-failed-to-parse-progress"))
+                progress = 0.0
+            cards.append(CardStatus(card["title"].strip(), progress))  # type: ignore
+        return self._apply_cards(cards, {})
+
+    def _apply_cards(self, cards: list[CardStatus], remaining: dict[str, int]) -> bool:
+        """Only cards changed since last time are logged.
+
+        Tasks with more remaining points are put first.
+        """
+        tasks_to_be_done = get_tasks_to_be_done()
+        tasks_to_be_done.clear()
+        for card in cards:
+            self._update_card(card)
+            if (card.title in _config.skipped) and not set_task_status_by_task_title(
+                card.title,
+                TaskStatus.SKIPPED,
+            ):
+                warning(get_language_string("core-warning-failed-to-skip-task") % card.title)
+            elif card.progress < 1.0 and card.title not in tasks_to_be_done:
+                tasks_to_be_done.append(card.title)
+        tasks_to_be_done.sort(key=lambda title: -remaining.get(title, 0))
+        find_event_by_id(EventID.SCORE_UPDATED).invoke(tuple(get_scores()))
+        return len(tasks_to_be_done) == 0
+
+    def _update_card(self, card: CardStatus):
+        if self.cards.get(card.title) != card:
+            debug(
+                get_language_string("core-debug-card-changed") % (card.title, card.progress * 100),
+            )
+            self.cards[card.title] = card
+
+
+def get_rule_progress(title: str) -> RuleProgress | None:
+    """Get progress of the rule parsed from API last time.
+
+    Args:
+        title (str): The title of rule, like the title of card on points page
+
+    Returns:
+        RuleProgress | None: The progress, None if progress from API is not available
+    """
+    progress = _latest_progress.get()
+    return None if progress is None else progress.get(title)
@@ -8,3 +8,6 @@ MAIN_PAGE = "https://xuexi.cn"
 DAILY_EXAM_PAGE = "https://pc.xuexi.cn/points/exam-practice.html"
 WEEKLY_EXAM_PAGE = "https://pc.xuexi.cn/points/exam-weekly-list.html"
 SPECIAL_EXAM_PAGE = "https://pc.xuexi.cn/points/exam-paper-list.html"
+SCORE_PROGRESS_API = (
+    "https://pc-proxy-api.xuexi.cn/delegate/score/days/listScoreProgress?sence=score&deviceType=2"
+)
@@ -0,0 +1,105 @@
+"""Classes and functions for remembering read articles and videos across runs."""
+
+# Relative imports
+from . import VISITED_RETENTION_DAYS
+from . import clean_string
+from pathlib import Path
+from sqlite3 import connect
+from datetime import date
+from datetime import timedelta
+from .accounts import AccountLocal
+from .accounts import get_account_file_name
+from threading import Lock
+from ...storage import get_data_path
+
+
+VISITED_DB_FILENAME = "visited.db"
+
+_CREATE_VISITED = """
+CREATE TABLE IF NOT EXISTS visited (
+    key TEXT PRIMARY KEY,
+    visited_on TEXT NOT NULL
+) WITHOUT ROWID
+"""
+_DELETE_EXPIRED = "DELETE FROM visited WHERE visited_on < ?"
+_SELECT_KEYS = "SELECT key FROM visited"
+_INSERT_VISITED = "INSERT OR REPLACE INTO visited (key, visited_on) VALUES (?, ?)"
+
+
+class VisitedIndex:
+    """Titles and urls of content read, storaged in sqlite database.
+
+    Keys visited in last `retention_days` days are loaded into memory when opened,
+    older keys are pruned, so checking a key does not touch the database.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        retention_days: int = VISITED_RETENTION_DAYS,
+        today: date | None = None,
+    ):
+        """Open the database and load keys not expired.
+
+        Args:
+            path (Path | str): The path to the database file
+            retention_days (int, optional): How many days a key is kept.
+                Defaults to VISITED_RETENTION_DAYS.
+            today (date | None, optional): The date of today, for testing. Defaults to None.
+        """
+        self._today = (today or date.today()).isoformat()
+        self._lock = Lock()
+        self._conn = connect(path, check_same_thread=False)
+        _ = self._conn.execute("PRAGMA journal_mode = WAL")
+        _ = self._conn.execute("PRAGMA synchronous = NORMAL")
+        cutoff = (date.fromisoformat(self._today) - timedelta(days=retention_days)).isoformat()
+        with self._conn:
+            _ = self._conn.execute(_CREATE_VISITED)
+            _ = self._conn.execute(_DELETE_EXPIRED, (cutoff,))
+        self._keys = {row[0] for row in self._conn.execute(_SELECT_KEYS)}
+
+    def __contains__(self, key: object) -> bool:
+        """Check if the title or url is visited."""
+        return isinstance(key, str) and clean_string(key) in self._keys
+
+    def __len__(self) -> int:
+        """Count keys visited."""
+        return len(self._keys)
+
+    def add(self, *keys: str):
+        """Mark titles or urls as visited today.
+
+        Args:
+            *keys (str): The titles or urls
+        """
+        cleaned = [clean_string(key) for key in keys]
+        with self._lock, self._conn:
+            self._keys.update(cleaned)
+            _ = self._conn.executemany(_INSERT_VISITED, [(key, self._today) for key in cleaned])
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+# Each account reads content on its own, so content read by one does not stop another
+_visited_indexes: AccountLocal[VisitedIndex] = AccountLocal(
+    lambda: VisitedIndex(get_data_path(get_account_file_name(VISITED_DB_FILENAME))),
+)
+
+
+def get_visited_index() -> VisitedIndex:
+    """Get the visited index of current account in data folder, it is opened when first used.
+
+    Returns:
+        VisitedIndex: The index
+    """
+    return _visited_indexes.get()
+
+
+def close_visited_index():
+    """Close visited indexes of all accounts if they are opened."""
+    for index in _visited_indexes.values():
+        index.close()
+    _visited_indexes.clear()
@@ -4,13 +4,11 @@ from time import time
 
 # Relative imports
 from .task import do_task
+from queue import Queue
 from ..common import WAIT_PAGE_SECS
-from ..common import TaskQueue
-from ..common import TaskStatus
-from ..common import scores
-from ..common import tasks_to_be_done
-from ..common import set_task_status_by_task_title
-from ..common import create_queues_from_existing_task_titles
+from ..common import WAIT_PROGRESS_SECS
+from ..common import SCORE_PROGRESS_REGEX
+from ..common import get_tasks_to_be_done
 from ...config import get_runtime_config
 from ...events import EventID
 from ...events import find_event_by_id
@@ -18,89 +16,217 @@ from ...logger import info
 from ...logger import debug
 from ...logger import error
 from ...logger import warning
+from functools import partial
+from threading import Lock
 from ...storage import get_cache_path
+from contextlib import suppress
 from ...languages import get_language_string
 from ..common.urls import POINTS_PAGE
+from ..common.launch import get_launch_options
+from ..common.launch import get_context_options
+from ..common.status import STATUS_SCRIPT
+from ..common.status import STATUS_SCRIPT_ARGS
+from ..common.status import StatusCollector
+from ..common.reading import log_read_summary
+from ..common.accounts import DEFAULT_ACCOUNT
+from ..common.accounts import get_storage_state_path
+from ..common.blocking import BLOCK_PROFILES
+from ..common.blocking import BlockProfile
+from ..common.blocking import should_block
+from ..common.blocking import block_counter
+from ..common.blocking import log_block_summary
+from ..common.progress import parse_progress
+from ..common.httpcache import HttpCache
+from ..common.httpcache import get_ttl
+from ..common.httpcache import is_cacheable
+from ..common.httpcache import get_http_cache
+from ..common.scheduler import TaskNode
+from ..common.scheduler import TaskScheduler
 from ..common.selectors import PointsSelectors
+from concurrent.futures import ThreadPoolExecutor
 from playwright.sync_api import Page
-from playwright.sync_api import Locator
+from playwright.sync_api import Error
+from playwright.sync_api import Route
 from playwright.sync_api import BrowserContext
 from playwright.sync_api import sync_playwright
+from ..common.answer.sources import log_answer_source_health
 
 
 _config = get_runtime_config()
 
+STORAGE_STATE_FILENAME = "cookies.json"
 
-def _is_card_finished(card: Locator) -> bool:
-    progress_value = 0.0
-    progress = card.locator(PointsSelectors.CARD_PROGRESS).first
-    style = progress.get_attribute("style") or ""
-    if style.startswith("width"):
-        progress_percent = (
-            style.removeprefix("width").replace(":", "").removesuffix(";").strip().removesuffix("%")
-        )
-        try:
-            progress_value = float(progress_percent) / 100
-        except ValueError:
-            warning(get_language_string("core-warning-failed-to-parse-progress"))
-    return progress_value == 1.0
 
+def _route_request(route: Route, profile: BlockProfile):
+    request = route.request
+    try:
+        page_url = request.frame.url
+    except Error:
+        # Requests of service workers do not have a frame
+        page_url = ""
+    if should_block(profile, request.resource_type, request.url, page_url):
+        block_counter.record(request.resource_type)
+        route.abort("blockedbyclient")
+    else:
+        route.fallback()
 
-def _get_status_from_page(page: Page, close: bool) -> bool:
-    page.goto(POINTS_PAGE)
-    tasks_to_be_done.clear()
 
-    points = page.locator(PointsSelectors.POINTS_SPAN)
+def _cache_request(route: Route, cache: HttpCache):
+    request = route.request
+    if not is_cacheable(request.method, request.resource_type, request.url):
+        route.fallback()
+        return
+    cached = cache.get(request.url)
     try:
-        points.nth(0).wait_for()
-        points.nth(1).wait_for()
-        scores[0] = int(points.nth(0).inner_text())
-        scores[1] = int(points.nth(1).inner_text())
-    except ValueError:
-        error(get_language_string("core-error-update-score-failed"))
-    else:
-        info(get_language_string("core-info-update-score-success") % tuple(scores))
-
-    cards = page.locator(PointsSelectors.POINTS_CARDS)
-    cards.last.wait_for()
-    for i in range(cards.count()):
-        card = cards.nth(i)
-        title = card.locator(PointsSelectors.CARD_TITLE).first.inner_text().strip()
-        if (title in _config.skipped) and not set_task_status_by_task_title(
-            title,
-            TaskStatus.SKIPPED,
-        ):
-            warning(get_language_string("core-warning-failed-to-skip-task") % title)
-        elif (not _is_card_finished(card)) and (title not in tasks_to_be_done):
-            tasks_to_be_done.append(title)
-    find_event_by_id(EventID.SCORE_UPDATED).invoke(tuple(scores))
-
-    if close and not page.is_closed():
-        page.close()
-    return len(tasks_to_be_done) == 0
-
-
-def _finish_queue(queue: TaskQueue, context: BrowserContext, close: bool):
-    debug(
-        get_language_string("core-debug-current-queue") % ", ".join([str(task) for task in queue]),
-    )
+        if cached is not None:
+            headers, body = cached
+            route.fulfill(status=200, headers=headers, body=body)
+            return
+        response = route.fetch()
+        body = response.body()
+        route.fulfill(response=response, body=body)
+    except Error as e:
+        # Let the browser load it itself, this fails too if the route is already handled
+        debug(get_language_string("core-debug-http-cache-failed") % (request.url, e))
+        with suppress(Error):
+            route.fallback()
+        return
+    # Cache after fulfilling, so a broken cache never leaves the request pending
+    ttl = get_ttl(response.headers) if response.status == 200 else None
+    if ttl is not None:
+        cache.put(request.url, response.headers, body, ttl)
+
+
+def _install_routes(context: BrowserContext):
+    # Routes registered later run first, so blocked requests never reach the cache
+    if _config.http_cache_size_mb > 0:
+        cache = get_http_cache(_config.http_cache_size_mb * 1024 * 1024)
+        context.route("**/*", partial(_cache_request, cache=cache))
+    profile = BLOCK_PROFILES.get(_config.block_profile)
+    if profile is None:
+        warning(get_language_string("core-warning-unknown-block-profile") % _config.block_profile)
+    elif len(profile.resource_types) > 0 or len(profile.hosts) > 0:
+        context.route("**/*", partial(_route_request, profile=profile))
+
+
+def _get_status_from_page(page: Page, collector: StatusCollector) -> bool:
+    # Keep the points page open and reload it instead of opening a new one every round,
+    # progress from API is exact, cards on page only have a rounded width
+    try:
+        with page.expect_response(
+            SCORE_PROGRESS_REGEX,
+            timeout=WAIT_PROGRESS_SECS * 1000,
+        ) as event:
+            _ = page.reload() if page.url.startswith(POINTS_PAGE) else page.goto(POINTS_PAGE)
+        progress = parse_progress(event.value.json())
+    except (Error, ValueError) as e:
+        debug(get_language_string("core-debug-parse-progress-failed") % e)
+        progress = None
+    page.locator(PointsSelectors.POINTS_SPAN).nth(1).wait_for()
+    page.locator(PointsSelectors.POINTS_CARDS).last.wait_for()
+    if progress is not None:
+        return collector.apply_progress(progress)
+    return collector.apply(page.evaluate(STATUS_SCRIPT, STATUS_SCRIPT_ARGS))
+
+
+def _finish_node(node: TaskNode, context: BrowserContext, close: bool) -> bool:
+    debug(get_language_string("core-debug-current-queue") % ", ".join(node.titles))
     results: list[bool] = []
-    for task in queue:
-        task_result = do_task(context.new_page(), task, close)
-        debug(get_language_string("core-debug-task-result") % (str(task), str(task_result)))
+    for task_title in node.titles:
+        task_result = do_task(context.new_page(), task_title, close)
+        debug(get_language_string("core-debug-task-result") % (task_title, str(task_result)))
         results.append(task_result)
-    if not all(results):
+    return all(results)
+
+
+def _try_finish_node(node: TaskNode, context: BrowserContext, close: bool) -> bool:
+    try:
+        return _finish_node(node, context, close)
+    except Exception as e:
+        error(get_language_string("core-err-process-exception") % e)
+        return False
+
+
+def _schedule(scheduler: TaskScheduler, queue: Queue[TaskNode | None], workers: int):
+    for node in scheduler.take_ready():
+        queue.put(node)
+    if scheduler.done:
+        # Tell workers to exit
+        for _ in range(workers):
+            queue.put(None)
+
+
+def _work(scheduler: TaskScheduler, queue: Queue[TaskNode | None], lock: Lock, workers: int):
+    # Sync api is bound to thread, so every worker has its own playwright and browser,
+    # login state is shared by storage state saved by main thread
+    with sync_playwright() as p:
+        browser = p[_config.browser_id].launch(**get_launch_options(_config))
+        try:
+            context = browser.new_context(
+                storage_state=get_cache_path(STORAGE_STATE_FILENAME),
+                **get_context_options(_config),
+            )
+            context.set_default_timeout(WAIT_PAGE_SECS * 1000)
+            _install_routes(context)
+            node = queue.get()
+            while node is not None:
+                result = _try_finish_node(node, context, close=True)
+                with lock:
+                    scheduler.finish(node, result)
+                    _schedule(scheduler, queue, workers)
+                node = queue.get()
+        finally:
+            browser.close()
+
+
+def _fail_unfinished(scheduler: TaskScheduler, queue: Queue[TaskNode | None]):
+    # Nodes are left if all workers failed to launch, nobody will run them
+    while not queue.empty():
+        node = queue.get_nowait()
+        if node is not None:
+            scheduler.finish(node, success=False)
+    while not scheduler.done:
+        for node in scheduler.take_ready():
+            scheduler.finish(node, success=False)
+
+
+def _finish_scheduler(scheduler: TaskScheduler, context: BrowserContext, close: bool):
+    if scheduler.budget == 1:
+        while not scheduler.done:
+            for node in scheduler.take_ready():
+                scheduler.finish(node, _try_finish_node(node, context, close))
+    else:
+        _ = context.storage_state(path=get_cache_path(STORAGE_STATE_FILENAME))
+        queue: Queue[TaskNode | None] = Queue()
+        lock = Lock()
+        ready = scheduler.take_ready()
+        # Every worker launches a browser, do not launch more than nodes can use
+        workers = min(scheduler.budget, len(ready))
+        for node in ready:
+            queue.put(node)
+        if workers > 0:
+            with ThreadPoolExecutor(workers, "task-worker") as executor:
+                futures = [
+                    executor.submit(_work, scheduler, queue, lock, workers) for _ in range(workers)
+                ]
+            for future in futures:
+                e = future.exception()
+                if e is not None:
+                    error(get_language_string("core-err-process-exception") % e)
+        _fail_unfinished(scheduler, queue)
+    if len(scheduler.dropped) > 0 or not all(entry.success for entry in scheduler.timeline):
         warning(get_language_string("core-warning-some-tasks-failed"))
+    scheduler.log_timeline()
 
 
 def _finish_all(context: BrowserContext, close: bool = True):
+    collector = StatusCollector()
     do_task(context.new_page(), "登录", close)
-    while not _get_status_from_page(context.new_page(), close):
+    status_page = context.new_page()
+    tasks_to_be_done = get_tasks_to_be_done()
+    while not _get_status_from_page(status_page, collector):
         debug(get_language_string("core-debug-task-to-be-done-is") % str(tasks_to_be_done))
-        queues = create_queues_from_existing_task_titles(*tasks_to_be_done)
-
-        for queue in queues:
-            _finish_queue(queue, context, close)
+        _finish_scheduler(TaskScheduler(_config.page_budget, *tasks_to_be_done), context, close)
 
     if close:
         for page in context.pages:
@@ -111,24 +237,37 @@ def _finish_all(context: BrowserContext, close: bool = True):
 def start():
     """Main entrance."""
     start_time = time()
+    if len(_config.accounts) > 0:
+        warning(get_language_string("core-warning-accounts-need-async-mode"))
     with sync_playwright() as p:
-        context = p[_config.browser_id].launch_persistent_context(
-            user_data_dir=get_cache_path("browser-cache") / _config.browser_id,
-            headless=not _config.debug,
-            proxy=_config.proxy,
-            channel=_config.browser_channel,
-            args=["--mute-audio"],
-            devtools=not _config.debug,
-            executable_path=_config.executable_path,
-            firefox_user_prefs={"media.volume_scale": "0.0"},
-        )
+        if _config.persistent_profile:
+            context = p[_config.browser_id].launch_persistent_context(
+                user_data_dir=get_cache_path("browser-cache") / _config.browser_id,
+                **get_launch_options(_config),
+                **get_context_options(_config),
+            )
+        else:
+            # Without profile, the login state is restored from storage state
+            state_path = get_storage_state_path(DEFAULT_ACCOUNT)
+            context = (
+                p[_config.browser_id]
+                .launch(**get_launch_options(_config))
+                .new_context(
+                    storage_state=state_path if state_path.exists() else None,
+                    **get_context_options(_config),
+                )
+            )
         context.set_default_timeout(WAIT_PAGE_SECS * 1000)
+        _install_routes(context)
         try:
             _finish_all(context)
         except Exception as e:
             error(get_language_string("core-err-process-exception") % e)
         finally:
             context.close()
+            # Persistent context does not have a browser
+            if context.browser is not None:
+                context.browser.close()
     delta_mins, delta_secs = divmod(time() - start_time, 60)
     delta_hrs, delta_mins = divmod(delta_mins, 60)
     finish_str = get_language_string("core-info-all-finished").format(
@@ -137,4 +276,7 @@ def start():
         int(delta_secs),
     )
     info(finish_str)
+    log_answer_source_health()
+    log_read_summary()
+    log_block_summary()
     find_event_by_id(EventID.FINISHED).invoke(finish_str)
@@ -0,0 +1,80 @@
+"""Functions for benchmarking browsers in sync mode."""
+
+from os import getpid
+from time import monotonic
+
+# Relative imports
+from ...config import BrowserType
+from ...config import get_runtime_config
+from ...logger import error
+from ...languages import get_language_string
+from ..common.launch import get_launch_options
+from ..common.launch import get_context_options
+from ..common.benchmark import BenchmarkResult
+from ..common.benchmark import read_tree_rss
+from playwright.sync_api import Error
+from playwright.sync_api import sync_playwright
+
+
+_config = get_runtime_config()
+
+
+def run_benchmark(
+    browser_ids: list[BrowserType],
+    profiles: list[str],
+    url: str,
+    rounds: int,
+) -> list[BenchmarkResult]:
+    """Launch every browser with every profile, load the page and measure memory.
+
+    Memory is the peak resident memory of processes started by the browser, measured
+    after every load.
+
+    Args:
+        browser_ids (list[BrowserType]): The browsers
+        profiles (list[str]): The launch profiles
+        url (str): The page to load
+        rounds (int): How many times the page is loaded in a new page
+
+    Returns:
+        list[BenchmarkResult]: The results, browsers failed to launch are logged and skipped
+    """
+    results: list[BenchmarkResult] = []
+    with sync_playwright() as p:
+        for browser_id in browser_ids:
+            for profile in profiles:
+                baseline = read_tree_rss(getpid())
+                start = monotonic()
+                try:
+                    browser = p[browser_id].launch(
+                        **get_launch_options(_config, browser_id, profile),
+                    )
+                except Error as e:
+                    # The browser may be not installed, go on with others
+                    error(
+                        get_language_string("core-error-benchmark-launch-failed")
+                        % (browser_id, profile, e),
+                    )
+                    continue
+                launch_secs = monotonic() - start
+                try:
+                    context = browser.new_context(**get_context_options(_config, profile))
+                    load_secs: list[float] = []
+                    rss: int | None = None
+                    for _ in range(rounds):
+                        page = context.new_page()
+                        start = monotonic()
+                        _ = page.goto(url, wait_until="load")
+                        load_secs.append(monotonic() - start)
+                        rss = _max_rss(rss, read_tree_rss(getpid()), baseline)
+                        page.close()
+                finally:
+                    browser.close()
+                results.append(BenchmarkResult(browser_id, profile, launch_secs, load_secs, rss))
+    return results
+
+
+def _max_rss(peak: int | None, current: int | None, baseline: int | None) -> int | None:
+    if current is None or baseline is None:
+        return None
+    return max(peak or 0, current - baseline)
@@ -9,13 +9,19 @@ from ..common import CHECK_ELEMENT_TIMEOUT_SECS
 from ...events import EventID
 from ...events import find_event_by_id
 from ...logger import info
+from ...logger import debug
 from ...logger import error
 from ...storage import get_cache_path
 from ...languages import get_language_string
 from ..common.urls import LOGIN_PAGE
+from ..common.urls import SCORE_PROGRESS_API
+from ..common.session import is_logged_in
+from ..common.accounts import get_current_account
+from ..common.accounts import get_storage_state_path
 from typing_extensions import override
 from ..common.selectors import LoginSelectors
 from playwright.sync_api import Page
+from playwright.sync_api import Error
 from playwright.sync_api import Locator
 from playwright.sync_api import TimeoutError
 
@@ -35,12 +41,18 @@ class LoginTask(Task):
 
     @override
     def __enter__(self) -> Self:
-        self.last_page.goto(LOGIN_PAGE)
-        self.last_page.bring_to_front()
+        # Check saved session before opening any page, login page is slow
+        self._session_valid = self._check_session()
+        if not self._session_valid:
+            self.last_page.goto(LOGIN_PAGE)
+            self.last_page.bring_to_front()
         return self
 
     @override
     def finish(self) -> bool:
+        if self._session_valid:
+            info(get_language_string("core-info-session-reuse-success"))
+            return True
         success = False
         if self._wait_locator(
             self.last_page.locator(LoginSelectors.LOGIN_CHECK).first,
@@ -87,8 +99,27 @@ class LoginTask(Task):
                         find_event_by_id(EventID.QR_UPDATED).invoke("".encode())
                         success = True
 
+        if success:
+            self._save_session()
         return success
 
+    def _check_session(self) -> bool:
+        try:
+            response = self.last_page.context.request.get(
+                SCORE_PROGRESS_API,
+                timeout=CHECK_ELEMENT_TIMEOUT_SECS * 1000,
+            )
+            payload = response.json() if response.ok else None
+        except (Error, ValueError) as e:
+            debug(get_language_string("core-debug-session-check-failed") % e)
+            return False
+        return is_logged_in(response.status, payload)
+
+    def _save_session(self):
+        path = get_storage_state_path(get_current_account())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ = self.last_page.context.storage_state(path=path)
+
     def _on_timeout(
         self,
         failed_times: int,
@@ -10,9 +10,11 @@ from typing import Self
 from ..common import ANSWER_CONNECTOR
 from ..common import WAIT_CHOICE_SECS
 from ..common import WAIT_RESULT_SECS
+from ..common import PAPER_REQUEST_REGEX
 from ..common import VIDEO_REQUEST_REGEX
 from ..common import ANSWER_SLEEP_MAX_SECS
 from ..common import ANSWER_SLEEP_MIN_SECS
+from ..common import HINT_ANSWER_CONFIDENCE
 from ..common import clean_string
 from .captcha import handle_drag_captcha
 from ...config import get_runtime_config
@@ -25,16 +27,30 @@ from ...logger import warning
 from ...storage import get_cache_path
 from ...languages import get_language_string
 from urllib.parse import urlparse
+from ..common.scan import ROWS_SCRIPT
+from ..common.scan import WEEK_ROWS_ARGS
+from ..common.scan import SPECIAL_ROWS_ARGS
+from ..common.scan import parse_rows
+from ..common.scan import find_unmarked_row
+from ..common.scan import find_marker_without
 from ..common.urls import DAILY_EXAM_PAGE
 from ..common.urls import WEEKLY_EXAM_PAGE
 from ..common.urls import SPECIAL_EXAM_PAGE
+from ..common.paper import PaperQuestion
+from ..common.paper import parse_paper
+from ..common.paper import find_paper_question
 from typing_extensions import override
 from ..common.selectors import Selectors
 from ..common.selectors import TestSelectors
+from playwright.sync_api import Page
 from playwright.sync_api import Locator
+from playwright.sync_api import Response
 from playwright.sync_api import TimeoutError
+from ..common.answer.utils import parse_solution
 from ..common.answer.utils import is_valid_answer
 from ..common.answer.utils import gen_random_string
+from ..common.answer.sources import prefetch_answers
+from ..common.answer.sources import report_wrong_answer
 from ..common.answer.sources import add_answer_to_all_sources
 from ..common.answer.sources import find_answer_in_answer_sources
 
@@ -48,6 +64,38 @@ class _TestTask(Task):
     def requires(self) -> list[str]:
         return ["登录"]
 
+    @override
+    def ready(self, page: Page, task_title: str, close: bool = True) -> Self:
+        self._paper: list[PaperQuestion] = []
+        self._paper_index = 0
+        if _config.capture_paper:
+            page.on("response", self._on_response)
+        return super().ready(page, task_title, close)
+
+    def _on_response(self, response: Response):
+        if PAPER_REQUEST_REGEX.match(response.url) is None:
+            return
+        try:
+            paper = parse_paper(response.json())
+        except Exception as e:
+            debug(get_language_string("core-debug-parse-paper-failed") % e)
+            return
+        if len(paper) > 0:
+            debug(get_language_string("core-debug-paper-captured") % len(paper))
+            self._paper = paper
+            self._paper_index = 0
+            prefetch_answers([question.title for question in paper])
+
+    def _get_paper_question(self, title: str) -> PaperQuestion | None:
+        # Title on page is always used, the paper only gives hints of the same question
+        index = find_paper_question(self._paper, self._paper_index, title)
+        if index is None:
+            if len(self._paper) > 0:
+                debug(get_language_string("core-debug-paper-question-mismatch") % title)
+            return None
+        self._paper_index = index
+        return self._paper[index]
+
     @override
     def finish(self) -> bool:
         while not self._is_test_finished():
@@ -59,9 +107,12 @@ class _TestTask(Task):
             title_element = question.locator(TestSelectors.QUESTION_TITLE).last
             title_element.scroll_into_view_if_needed()
             title = clean_string(title_element.inner_text())
+            paper_question = self._get_paper_question(title)
             info(get_language_string("core-info-current-question-title") % title)
             tips = [title]
-            match choices.count():
+            options: list[str] = []
+            choices_count = choices.count()
+            match choices_count:
                 case 0:
                     # Blank
                     items_to_answer = question.locator(TestSelectors.BLANK)
@@ -69,24 +120,40 @@ class _TestTask(Task):
                 case 1:
                     # Choice
                     items_to_answer = choices.locator(TestSelectors.ANSWER_ITEM)
+                    options = [clean_string(item) for item in items_to_answer.all_inner_texts()]
                     tips.append(
                         get_language_string("core-available-answers")
-                        + ANSWER_CONNECTOR.join(
-                            [clean_string(item) for item in items_to_answer.all_inner_texts()],
-                        ),
+                        + ANSWER_CONNECTOR.join(options),
                     )
                     debug(get_language_string("core-debug-current-question-type-choice"))
                 case _:
                     self.status = TaskStatus.FAILED
                     return False
-            if not self._do_answer(items_to_answer, choices.count() == 0, tips):
+            if not self._do_answer(
+                items_to_answer,
+                choices_count == 0,
+                tips,
+                options,
+                paper_question.hints if paper_question else None,
+            ):
                 error(get_language_string("core-error-answer-failed"))
+            self._paper_index += 1
             self._go_to_next_question()
             if self.last_page.locator(TestSelectors.TEST_SOLUTION).count() > 0:
                 error(get_language_string("core-error-answer-is-wrong") % title)
+                self._learn_from_solution(title, options)
                 self._go_to_next_question()
         return True
 
+    def _learn_from_solution(self, title: str, options: list[str]):
+        solution = self.last_page.locator(TestSelectors.TEST_SOLUTION).first
+        answers = parse_solution(solution.inner_text(), options)
+        if len(answers) > 0:
+            info(get_language_string("core-info-answer-learned") % (title, answers))
+            add_answer_to_all_sources(title, answers)
+        else:
+            report_wrong_answer(title)
+
     def _get_answer_from_page(self) -> list[str]:
         answer_on_page: list[str] = []
         tips = self.last_page.locator(TestSelectors.QUESTION).locator(TestSelectors.TIPS)
@@ -140,38 +207,37 @@ class _TestTask(Task):
         elements: Locator,
         blank: bool,
         tips: list[str],
-        title: str | None = None,
+        options: list[str],
+        hints: list[str] | None = None,
     ) -> bool:
         def do_answer(answers: list[str]) -> bool:
             handled = False
             if len(answers) > 0:
-                if len(answers) > elements.count():
+                elements_count = elements.count()
+                if len(answers) > elements_count:
                     warning(get_language_string("core-warning-too-much-answers"))
                 debug(get_language_string("core-debug-final-answer-list") % answers)
 
                 for i in range(len(answers)):
                     if blank:
-                        if i <= elements.count():
+                        if i < elements_count:
                             debug(get_language_string("core-debug-filling-blank"))
                             self._fill_blank(elements.nth(i), answers[i])
                             handled = True
                     else:
-                        for j in range(elements.count()):
-                            if answers[i] in clean_string(elements.nth(j).inner_text()):
-                                debug(
-                                    get_language_string("core-debug-choosing-choice")
-                                    % elements.nth(j),
-                                )
+                        for j, option in enumerate(options):
+                            if answers[i] in option:
+                                debug(get_language_string("core-debug-choosing-choice") % option)
                                 self._chose_answer(elements.nth(j))
                                 handled = True
             return handled
 
-        if not title:
-            title = tips[0]
+        title = tips[0]
         if do_answer(find_answer_in_answer_sources(title)):
             return True
-        answer_from_page = self._get_answer_from_page()
+        answer_from_page = hints or self._get_answer_from_page()
         if do_answer(answer_from_page):
+            add_answer_to_all_sources(title, answer_from_page, HINT_ANSWER_CONFIDENCE)
             return True
         error(get_language_string("core-error-no-answer-found"))
         tips.append(
@@ -185,8 +251,8 @@ class _TestTask(Task):
         if blank:
             for i in range(elements.count()):
                 self._fill_blank(elements.nth(i), gen_random_string())
-        else:
-            self._chose_answer(elements.nth(randint(0, elements.count())))
+        elif len(options) > 0:
+            self._chose_answer(elements.nth(randint(0, len(options) - 1)))
         return False
 
     def _handle_captcha(self) -> bool:
@@ -301,12 +367,9 @@ class WeeklyTestTask(_TestTask):
         return self
 
     def _get_first_available_week(self, weeks: Locator) -> Locator | None:
-        for i in range(weeks.count()):
-            week = weeks.nth(i)
-            stat = week.locator(TestSelectors.TEST_WEEK_STAT).get_attribute("class") or "done"
-            if "done" not in stat:
-                return week
-        return None
+        rows = parse_rows(weeks.evaluate_all(ROWS_SCRIPT, WEEK_ROWS_ARGS))
+        index = find_marker_without(rows, "done")
+        return None if index is None else weeks.nth(index)
 
 
 class SpecialTestTask(_TestTask):
@@ -345,8 +408,6 @@ class SpecialTestTask(_TestTask):
         return self
 
     def _get_first_available_item(self, items: Locator) -> Locator | None:
-        for i in range(items.count()):
-            item = items.nth(i)
-            if item.locator(TestSelectors.TEST_SPECIAL_SOLUTION).count() == 0:
-                return item
-        return None
+        rows = parse_rows(items.evaluate_all(ROWS_SCRIPT, SPECIAL_ROWS_ARGS))
+        index = find_unmarked_row(rows)
+        return None if index is None else items.nth(index)
@@ -2,6 +2,7 @@
 
 from abc import abstractmethod
 from .module import Module
+from asyncio import to_thread
 
 
 class AnswerSource(Module):
@@ -17,3 +18,47 @@ class AnswerSource(Module):
         Returns:
             list[str]: The answers
         """
+
+    async def get_answer_async(self, title: str) -> list[str]:
+        """Get answer without blocking the event loop in async mode.
+
+        Defaults to running `get_answer` in a thread, override this if the source
+        can do its I/O natively in asyncio. If it is not overridden, the processor runs
+        `get_answer` in its own bounded threads instead.
+
+        Args:
+            title(str): Question title
+
+        Returns:
+            list[str]: The answers
+        """
+        return await to_thread(self.get_answer, title)
+
+    def get_answers(self, titles: list[str]) -> dict[str, list[str]]:
+        """Get answers of many questions at once.
+
+        Defaults to calling `get_answer` for each question, override this if the source
+        can answer them in one round-trip.
+
+        Args:
+            titles(list[str]): Question titles
+
+        Returns:
+            dict[str, list[str]]: The answers of questions, questions without answer can be omitted
+        """
+        answers: dict[str, list[str]] = {}
+        for title in titles:
+            answer = self.get_answer(title)
+            if len(answer) > 0:
+                answers[title] = answer
+        return answers
+
+    @property
+    def priority(self) -> int:
+        """The priority of source, answers from sources with higher priority are preferred."""
+        return 0
+
+    @property
+    def timeout(self) -> float:
+        """How many seconds to wait for the answer."""
+        return 10.0
@@ -42,7 +42,7 @@ class Module(ABC):
     @staticmethod
     def get_module_api_version() -> SemVer:
         """Get the module's API version."""
-        return SemVer(2, 1, 0)
+        return SemVer(2, 2, 0)
 
     @property
     @abstractmethod
@@ -0,0 +1,66 @@
+"""Test if accounts running in one event loop do not share state."""
+
+from json import dumps
+from asyncio import run
+from asyncio import sleep
+from asyncio import gather
+from pathlib import Path
+from autoxuexiplaywright.config import deserialize_config
+from autoxuexiplaywright.events import EventID
+from autoxuexiplaywright.events import isolate_events
+from autoxuexiplaywright.events import find_event_by_id
+from autoxuexiplaywright.processors.common import get_scores
+from autoxuexiplaywright.processors.common import get_tasks_to_be_done
+from autoxuexiplaywright.processors.common.accounts import AccountLocal
+from autoxuexiplaywright.processors.common.accounts import get_current_account
+from autoxuexiplaywright.processors.common.accounts import set_current_account
+from autoxuexiplaywright.processors.common.accounts import get_account_file_name
+
+
+def test_account_local():
+    """Check if every account gets its own value and the default account is kept."""
+    local: AccountLocal[list[str]] = AccountLocal(list)
+
+    async def use(account: str) -> tuple[list[str], str]:
+        await sleep(0)
+        set_current_account(account)
+        local.get().append(account)
+        get_tasks_to_be_done().append(account)
+        get_scores()[1] = len(account)
+        return list(get_tasks_to_be_done()), get_account_file_name("qr.png")
+
+    async def use_all() -> list[tuple[list[str], str]]:
+        return await gather(use("alice"), use("bob"))
+
+    assert run(use_all()) == [(["alice"], "alice-qr.png"), (["bob"], "bob-qr.png")]
+    assert sorted(local.values()) == [["alice"], ["bob"]]
+    assert not get_current_account()
+    assert local.get() == []
+    assert get_tasks_to_be_done() == []
+    assert get_scores() == [-1, -1]
+    assert get_account_file_name("qr.png") == "qr.png"
+    local.clear()
+    assert local.values() == []
+
+
+def test_isolate_events():
+    """Check if callbacks added by an account are not called by others."""
+    called: list[str] = []
+
+    async def listen(account: str):
+        await sleep(0)
+        isolate_events()
+        find_event_by_id(EventID.STATUS_UPDATED).add_callback(called.append)
+        find_event_by_id(EventID.STATUS_UPDATED).invoke(account)
+
+    run(listen("alice"))
+    find_event_by_id(EventID.STATUS_UPDATED).invoke("default")
+    assert called == ["alice"]
+
+
+def test_account_names(tmp_path: Path):
+    """Check if names which are not safe in file names are rejected."""
+    names = ["alice", "../bob", "a/b", "Alice", "default", "", 1, "\u5f20\u4e09", "c-d_e"]
+    path = tmp_path / "config.json"
+    _ = path.write_text(dumps({"accounts": names}), encoding="utf-8")
+    assert deserialize_config(path).accounts == ["alice", "\u5f20\u4e09", "c-d_e"]
@@ -0,0 +1,40 @@
+"""Test if import_answer_bank and export_answer_bank work."""
+
+import pytest
+from json import dumps
+from pathlib import Path
+from autoxuexiplaywright.processors.common.answer.bank import export_answer_bank
+from autoxuexiplaywright.processors.common.answer.bank import import_answer_bank
+from autoxuexiplaywright.processors.common.answer.store import AnswerStore
+
+
+_lines = [
+    {"question": "问题一", "answers": ["甲"]},
+    {"question": " 问 题一 ", "answers": ["乙", "丙"]},
+    {"question": "问题二", "answer": "丁#戊"},
+    {"question": "没有答案", "answers": []},
+]
+_valid_lines_count = 3
+_questions_count = 2
+
+
+def test_import_and_export_answer_bank(tmp_path: Path):
+    """Check if answer banks can be imported and exported."""
+    bank = tmp_path / "bank.jsonl"
+    lines = [dumps(line) for line in _lines]
+    bank.write_text("\n".join([*lines, "{broken", "[]"]) + "\n\n", encoding="utf-8")
+    store = AnswerStore(tmp_path / "data.db")
+    assert import_answer_bank(bank, store) == _valid_lines_count
+    assert store.get("问题一") == ["乙", "丙"]
+    assert store.get("问题二") == ["丁", "戊"]
+    assert store.get("没有答案") == []
+    assert export_answer_bank(tmp_path / "bank.csv", store) == _questions_count
+    store.close()
+
+    new_store = AnswerStore(tmp_path / "new.db")
+    assert import_answer_bank(tmp_path / "bank.csv", new_store) == _questions_count
+    assert export_answer_bank(tmp_path / "new.jsonl", new_store) == _questions_count
+    assert list(new_store.iter_items()) == [("问 题一", ["乙", "丙"]), ("问题二", ["丁", "戊"])]
+    with pytest.raises(ValueError, match="Unsupported"):
+        _ = import_answer_bank(tmp_path / "bank.txt", new_store)
+    new_store.close()
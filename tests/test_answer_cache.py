@@ -0,0 +1,31 @@
+"""Test if AnswerCache works."""
+
+from autoxuexiplaywright.processors.common.answer.cache import AnswerCache
+
+
+def test_answer_cache():
+    """Check if AnswerCache evicts least recently used answers."""
+    cache = AnswerCache(2, 60)
+    assert cache.get("A") is None
+    cache.put("A", ["a"])
+    cache.put("B", ["b"])
+    assert cache.get(" A ") == ["a"]
+    cache.put("C", ["c"])
+    assert cache.get("B") is None
+    assert cache.get("A") == ["a"]
+    assert cache.get("C") == ["c"]
+    cache.invalidate("C")
+    assert cache.get("C") is None
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_answer_cache_negative():
+    """Check if AnswerCache remembers misses until they expire."""
+    cache = AnswerCache(2, 60)
+    cache.put("A", [])
+    assert cache.get("A") == []
+    cache.put("A", ["a"])
+    assert cache.get("A") == ["a"]
+    expired_cache = AnswerCache(2, 0)
+    expired_cache.put("A", [])
+    assert expired_cache.get("A") is None
@@ -0,0 +1,98 @@
+"""Test if HttpAnswerSource works with AnswerServer."""
+
+import pytest
+from pathlib import Path
+from threading import Thread
+from http.client import HTTPException
+from http.client import HTTPConnection
+from concurrent.futures import ThreadPoolExecutor
+from autoxuexiplaywright.processors.common.answer.store import AnswerStore
+from autoxuexiplaywright.processors.common.answer.client import HttpAnswerSource
+from autoxuexiplaywright.processors.common.answer.server import AnswerServer
+
+
+_QUESTIONS_COUNT = 8
+
+
+class _CountingServer(AnswerServer):
+    queries = 0
+
+    def query(self, questions: list[str]) -> dict[str, dict[str, list[str]]]:
+        self.queries += 1
+        return super().query(questions)
+
+
+def test_answer_server(tmp_path: Path):
+    """Check if answers are shared, cached and batched."""
+    store = AnswerStore(tmp_path / "data.db")
+    with _CountingServer(store, "127.0.0.1", 0) as server:
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        source = HttpAnswerSource(server.url)
+        source.add("问题", ["甲", "乙"], 1.0)
+        source.flush()
+        assert store.get("问题") == ["甲", "乙"]
+        assert source.get_answer("问题") == ["甲", "乙"]
+        assert source.get_answer("问题") == ["甲", "乙"]
+        assert server.queries == 1
+        questions = ["问题%d" % i for i in range(_QUESTIONS_COUNT)]
+        with ThreadPoolExecutor(_QUESTIONS_COUNT) as executor:
+            assert list(executor.map(source.get_answer, questions)) == [[]] * _QUESTIONS_COUNT
+        assert server.queries < 1 + _QUESTIONS_COUNT
+        source.penalize("问题")
+        source.flush()
+        assert source.get_answers(["问题"]) == {}
+        source.close()
+        server.shutdown()
+        thread.join()
+    store.close()
+
+
+def test_answer_server_token(tmp_path: Path):
+    """Check if requests without the token are rejected."""
+    store = AnswerStore(tmp_path / "data.db")
+    with AnswerServer(store, "127.0.0.1", 0, "secret") as server:
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        source = HttpAnswerSource(server.url, "secret")
+        source.add("问题", ["甲"], 1.0)
+        source.flush()
+        assert source.get_answers(["问题"]) == {"问题": ["甲"]}
+        source.close()
+        stranger = HttpAnswerSource(server.url)
+        stranger.add("问题", ["乙"], 1.0)
+        stranger.flush()
+        with pytest.raises(HTTPException):
+            _ = stranger.get_answers(["问题"])
+        stranger.close()
+        assert store.get("问题") == ["甲"]
+        server.shutdown()
+        thread.join()
+    store.close()
+
+
+def test_answer_server_content_length(tmp_path: Path):
+    """Check if requests with invalid Content-Length are rejected."""
+    store = AnswerStore(tmp_path / "data.db")
+    with AnswerServer(store, "127.0.0.1", 0) as server:
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        host, port = server.server_address[:2]
+        for length, status in [
+            (None, 411),
+            ("abc", 400),
+            ("-1", 400),
+            ("+2", 400),
+            (str(64 * 1024 * 1024), 413),
+            ("2", 200),
+        ]:
+            conn = HTTPConnection(str(host), port)
+            conn.putrequest("POST", "/query")
+            if length is not None:
+                conn.putheader("Content-Length", length)
+            conn.endheaders(b"{}")
+            assert conn.getresponse().status == status
+            conn.close()
+        server.shutdown()
+        thread.join()
+    store.close()
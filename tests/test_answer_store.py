@@ -0,0 +1,113 @@
+"""Test if AnswerStore works."""
+
+from base64 import b64encode
+from pathlib import Path
+from sqlite3 import connect
+from autoxuexiplaywright.processors.common.answer.store import AnswerStore
+
+
+def _encode(string: str) -> str:
+    return b64encode(string.encode()).decode()
+
+
+def test_answer_store(tmp_path: Path):
+    """Check if AnswerStore can add, get and replace answers."""
+    store = AnswerStore(tmp_path / "data.db")
+    assert store.get("问题") == []
+    store.add("问题", ["答案1", "答案2"])
+    assert store.get("问题") == ["答案1", "答案2"]
+    assert store.get(" 问 题\n") == ["答案1", "答案2"]
+    store.add("问题", ["答案3"])
+    assert store.get("问题") == ["答案3"]
+    store.close()
+    store = AnswerStore(tmp_path / "data.db")
+    assert store.get("问题") == ["答案3"]
+    store.close()
+
+
+def test_answer_store_migrate_legacy(tmp_path: Path):
+    """Check if AnswerStore migrates legacy base64 table."""
+    conn = connect(tmp_path / "data.db")
+    _ = conn.execute(
+        "CREATE TABLE 'answer' ('QUESTION' TEXT NOT NULL UNIQUE,'ANSWER' TEXT NOT NULL)",
+    )
+    _ = conn.execute(
+        "INSERT INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
+        (_encode("旧问题"), _encode("甲#乙")),
+    )
+    _ = conn.execute(
+        "INSERT INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
+        ("not base64!", "not base64!"),
+    )
+    _ = conn.execute(
+        "INSERT INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
+        ("!!!", _encode("x")),
+    )
+    _ = conn.execute(
+        "INSERT INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
+        (b64encode(b"\xff").decode(), _encode("x")),
+    )
+    _ = conn.execute(
+        "INSERT INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
+        (_encode("非 ASCII"), "答案"),
+    )
+    _ = conn.execute(
+        "INSERT INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
+        (_encode("空答案"), ""),
+    )
+    _ = conn.execute(
+        "INSERT INTO 'answer' ('QUESTION', 'ANSWER') VALUES (?, ?)",
+        (_encode(" "), _encode("x")),
+    )
+    conn.commit()
+    conn.close()
+    store = AnswerStore(tmp_path / "data.db")
+    assert store.get("旧问题") == ["甲", "乙"]
+    assert list(store.iter_items()) == [("旧问题", ["甲", "乙"])]
+    store.close()
+
+
+def test_answer_store_get_many(tmp_path: Path):
+    """Check if AnswerStore gets answers of many questions in one query."""
+    store = AnswerStore(tmp_path / "data.db")
+    store.add("问题一", ["甲", "乙"])
+    store.add("问题二", ["丙"])
+    assert store.get_many(["问题一", " 问题一", "问题二", "问题三"]) == {
+        "问题一": ["甲", "乙"],
+        " 问题一": ["甲", "乙"],
+        "问题二": ["丙"],
+    }
+    store.close()
+
+
+def test_answer_store_confidence(tmp_path: Path):
+    """Check if answers with low confidence do not replace trusted answers."""
+    store = AnswerStore(tmp_path / "data.db")
+    assert store.get_confidence("问题") is None
+    assert store.add("问题", ["甲"], 0.8)
+    assert store.add("问题", ["乙"])
+    assert not store.add("问题", ["丙"], 0.8)
+    assert store.get("问题") == ["乙"]
+    store.penalize("问题")
+    assert store.get("问题") == []
+    assert store.get_many(["问题"]) == {}
+    assert store.add("问题", ["丙"], 0.8)
+    assert store.get("问题") == ["丙"]
+    assert store.get_confidence("问题") == 0.8  # noqa: PLR2004
+    store.close()
+
+
+def test_answer_store_migrate_v1(tmp_path: Path):
+    """Check if AnswerStore adds confidence to questions of schema v1."""
+    conn = connect(tmp_path / "data.db")
+    _ = conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY, key TEXT, title TEXT)")
+    _ = conn.execute("CREATE TABLE answers (question_id, position, content)")
+    _ = conn.execute("INSERT INTO questions (id, key, title) VALUES (1, '问题', '问题')")
+    _ = conn.execute("INSERT INTO answers VALUES (1, 0, '甲')")
+    _ = conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    store = AnswerStore(tmp_path / "data.db")
+    assert store.get("问题") == ["甲"]
+    assert store.get_confidence("问题") == 1.0
+    store.close()
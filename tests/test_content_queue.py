@@ -0,0 +1,48 @@
+"""Test if content found in list data is queued."""
+
+from autoxuexiplaywright.processors.common import NEWS_PAGE_REGEX
+from autoxuexiplaywright.processors.common import VIDEO_PAGE_REGEX
+from autoxuexiplaywright.processors.common.content import ContentItem
+from autoxuexiplaywright.processors.common.content import ContentQueue
+from autoxuexiplaywright.processors.common.content import parse_content_list
+
+
+_ARTICLE_URL = "https://www.xuexi.cn/lgpage/detail/index.html?id=1"
+_VIDEO_URL = (
+    "https://www.xuexi.cn/0123456789abcdef0123456789abcdef/0123456789abcdef0123456789abcdef.html"
+)
+
+
+def test_parse_content_list():
+    """Check if only items linking to content are parsed."""
+    assert parse_content_list({"title": "a"}) == []
+    assert parse_content_list(
+        [
+            {"title": " article\n", "url": _ARTICLE_URL},
+            {"title": "video", "url": _VIDEO_URL},
+            {"title": "channel", "url": "https://www.xuexi.cn/xxqg.html"},
+            {"url": _ARTICLE_URL},
+            "broken",
+        ],
+    ) == [ContentItem("article", _ARTICLE_URL), ContentItem("video", _VIDEO_URL)]
+
+
+def test_content_queue():
+    """Check if visited, duplicated and other kinds of items are skipped."""
+    visited = {"old"}
+    queue = ContentQueue(visited, VIDEO_PAGE_REGEX)
+    items = [
+        ContentItem("old", _VIDEO_URL.replace("0123", "3210")),
+        ContentItem("article", _ARTICLE_URL),
+        ContentItem("video", _VIDEO_URL),
+        ContentItem("another video", _VIDEO_URL.replace("0123", "4567")),
+    ]
+    assert queue.put_many(items) == 2  # noqa: PLR2004
+    assert queue.put_many(items) == 0
+    assert len(queue) == 2  # noqa: PLR2004
+    visited.add(_VIDEO_URL)
+    assert queue.pop() == ContentItem("another video", _VIDEO_URL.replace("0123", "4567"))
+    assert queue.pop() is None
+    news_queue = ContentQueue(visited, NEWS_PAGE_REGEX)
+    assert news_queue.put_many(items) == 1
+    assert news_queue.pop() == ContentItem("article", _ARTICLE_URL)
@@ -0,0 +1,116 @@
+"""Test if find_answer_in_answer_sources works."""
+
+import pytest
+from time import sleep
+from time import monotonic
+from typing import Generator
+from asyncio import run
+from typing_extensions import override
+from autoxuexiplaywright.sdk.answer import AnswerSource
+from autoxuexiplaywright.processors.common.answer import sources
+
+
+_SLOW_SECS = 1.0
+
+
+class _Source(AnswerSource):
+    def __init__(self, answer: list[str], priority: int, delay: float = 0, timeout: float = 10):
+        self.answer = answer
+        self._priority = priority
+        self.delay = delay
+        self._timeout = timeout
+
+    @override
+    def get_answer(self, title: str) -> list[str]:
+        sleep(self.delay)
+        if title == "error":
+            raise RuntimeError(title)
+        return self.answer
+
+    @property
+    @override
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    @override
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    @override
+    def name(self) -> str:
+        return "Test"
+
+    @property
+    @override
+    def author(self) -> str:
+        return "Test"
+
+
+@pytest.fixture()
+def answer_sources() -> Generator[list[AnswerSource], None, None]:
+    """Replace loaded answer sources with test sources."""
+    test_sources: list[AnswerSource] = [
+        _Source(["slow"], 0, _SLOW_SECS),
+        _Source([], 20),
+        _Source(["fast"], 10),
+        _Source(["timeout"], 30, _SLOW_SECS, _SLOW_SECS / 10),
+    ]
+    sources._answer_sources[:] = test_sources
+    yield test_sources
+    sources._answer_sources.clear()
+    sources._answer_cache.clear()
+    sources._source_health.clear()
+
+
+def test_find_answer_in_answer_sources(answer_sources: list[AnswerSource]):
+    """Check if answer from the source with highest priority is returned without waiting."""
+    start_time = monotonic()
+    assert sources.find_answer_in_answer_sources("sync") == ["fast"]
+    assert sources.find_answer_in_answer_sources("error") == []
+    assert sources.find_answer_in_answer_sources("error") == []
+    assert monotonic() - start_time < _SLOW_SECS * len(answer_sources)
+    assert sources._source_hits[answer_sources[2]] == 1
+
+
+def test_find_answer_in_answer_sources_async(answer_sources: list[AnswerSource]):
+    """Check if async version works like sync version."""
+
+    async def find_answers() -> float:
+        start_time = monotonic()
+        assert await sources.find_answer_in_answer_sources_async("async") == ["fast"]
+        assert await sources.find_answer_in_answer_sources_async("async") == ["fast"]
+        return monotonic() - start_time
+
+    assert run(find_answers()) < _SLOW_SECS
+    assert sources._source_hits[answer_sources[2]] == 1
+
+
+def test_prefetch_answers(answer_sources: list[AnswerSource]):
+    """Check if prefetched answers are cached without waiting for slow sources."""
+    start_time = monotonic()
+    sources.prefetch_answers(["prefetch"])
+    assert monotonic() - start_time < _SLOW_SECS
+    assert "prefetch" in sources._answer_cache
+    sources.prefetch_answers(["prefetch error", "error"])
+    assert "prefetch error" not in sources._answer_cache
+    assert "error" not in sources._answer_cache
+    run(sources.prefetch_answers_async(["prefetch async"]))
+    assert sources.find_answer_in_answer_sources("prefetch") == ["fast"]
+    assert sources.find_answer_in_answer_sources("prefetch async") == ["fast"]
+    assert sources._source_hits[answer_sources[2]] == len(["prefetch", "prefetch async"])
+
+
+def test_close_all_answer_sources(answer_sources: list[AnswerSource]):
+    """Check if threads are shut down on close and created again when needed."""
+    assert sources.find_answer_in_answer_sources("close") == ["fast"]
+    sources.close_all_answer_sources()
+    assert sources._executor is None
+    sources._answer_sources[:] = answer_sources
+    assert run(sources.find_answer_in_answer_sources_async("close async")) == ["fast"]
+    # Async mode uses the same bounded threads
+    assert sources._executor is not None
+    sources.close_all_answer_sources()
+    sources._answer_sources[:] = answer_sources
+    assert sources.find_answer_in_answer_sources("close") == ["fast"]
@@ -0,0 +1,71 @@
+"""Test if static assets are cached on disk."""
+
+from pathlib import Path
+from autoxuexiplaywright.processors.common import HTTP_CACHE_DEFAULT_TTL_SECS
+from autoxuexiplaywright.processors.common.httpcache import HttpCache
+from autoxuexiplaywright.processors.common.httpcache import get_ttl
+from autoxuexiplaywright.processors.common.httpcache import is_cacheable
+
+
+_HEADERS = {"content-type": "text/javascript", "content-encoding": "gzip"}
+
+
+def test_is_cacheable():
+    """Check if only static assets of xuexi.cn are cached."""
+    assert is_cacheable("GET", "script", "https://at.xuexi.cn/main.js")
+    assert is_cacheable("GET", "image", "https://xuexi.cn/logo.png")
+    assert not is_cacheable("POST", "script", "https://at.xuexi.cn/main.js")
+    assert not is_cacheable("GET", "xhr", "https://pc-api.xuexi.cn/data.json")
+    assert not is_cacheable("GET", "script", "https://notxuexi.cn/main.js")
+
+
+def test_get_ttl():
+    """Check if only responses with a lifetime or a validator are cached."""
+    assert get_ttl({}) is None
+    assert get_ttl({"etag": '"abc"'}) == HTTP_CACHE_DEFAULT_TTL_SECS
+    assert get_ttl({"cache-control": "public, max-age=60"}) == 60  # noqa: PLR2004
+    assert get_ttl({"cache-control": "max-age=0"}) is None
+    assert get_ttl({"cache-control": "no-store"}) is None
+    assert get_ttl({"cache-control": "no-cache", "etag": '"abc"'}) is None
+    date = "Wed, 21 Oct 2026 07:28:00 GMT"
+    assert get_ttl({"date": date, "expires": "Wed, 21 Oct 2026 08:28:00 GMT"}) == 3600  # noqa: PLR2004
+    assert get_ttl({"date": date, "expires": "Wed, 21 Oct 2026 06:28:00 GMT"}) is None
+    assert get_ttl({"expires": "0", "last-modified": date}) is None
+
+
+def test_http_cache(tmp_path: Path):
+    """Check if bodies are shared, expired and evicted."""
+    cache = HttpCache(tmp_path, 10)
+    assert cache.get("https://xuexi.cn/a.js") is None
+    cache.put("https://xuexi.cn/a.js", _HEADERS, b"12345", 60)
+    cache.put("https://xuexi.cn/b.js", _HEADERS, b"12345", 60)
+    assert len(list(tmp_path.glob("[0-9a-f]" * 64))) == 1
+    assert cache.get("https://xuexi.cn/a.js") == ({"content-type": "text/javascript"}, b"12345")
+    cache.put("https://xuexi.cn/c.js", _HEADERS, b"abcde", -1)
+    assert cache.get("https://xuexi.cn/c.js") is None
+    # Adding the third body evicts the expired body first
+    cache.put("https://xuexi.cn/d.js", _HEADERS, b"67890", 60)
+    assert cache.get("https://xuexi.cn/d.js") is not None
+    assert cache.get("https://xuexi.cn/a.js") is not None
+    assert cache.get("https://xuexi.cn/c.js") is None
+    cache.put("https://xuexi.cn/huge.js", _HEADERS, b"0" * 11, 60)
+    assert cache.get("https://xuexi.cn/huge.js") is None
+    assert cache.hits == 3  # noqa: PLR2004
+    cache.close()
+
+
+def test_http_cache_replace(tmp_path: Path):
+    """Check if the old body of a changed url is deleted."""
+    cache = HttpCache(tmp_path, 10)
+    cache.put("https://xuexi.cn/a.js", _HEADERS, b"12345", 60)
+    cache.put("https://xuexi.cn/b.js", _HEADERS, b"12345", 60)
+    cache.put("https://xuexi.cn/a.js", _HEADERS, b"abcde", 60)
+    # The old body is still used by another url
+    assert len(list(tmp_path.glob("[0-9a-f]" * 64))) == 2  # noqa: PLR2004
+    cache.put("https://xuexi.cn/b.js", _HEADERS, b"abcde", 60)
+    assert len(list(tmp_path.glob("[0-9a-f]" * 64))) == 1
+    # Without the old body, both urls fit and nothing is evicted
+    cache.put("https://xuexi.cn/c.js", _HEADERS, b"67890", 60)
+    assert cache.get("https://xuexi.cn/a.js") == ({"content-type": "text/javascript"}, b"abcde")
+    assert cache.get("https://xuexi.cn/c.js") is not None
+    cache.close()
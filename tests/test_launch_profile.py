@@ -0,0 +1,45 @@
+"""Test if launch profiles tune browsers and memory of process tree is measured."""
+
+import os
+import pytest
+from pathlib import Path
+from autoxuexiplaywright.config import Config
+from autoxuexiplaywright.processors.common.launch import get_launch_options
+from autoxuexiplaywright.processors.common.launch import get_context_options
+from autoxuexiplaywright.processors.common.benchmark import read_tree_rss
+
+
+def test_launch_options():
+    """Check if only the performance profile changes options for each engine."""
+    config = Config()
+    default = get_launch_options(config, "chromium", "default")
+    assert default["args"] == ["--mute-audio"]
+    assert get_context_options(config, "default") == {}
+    chromium = get_launch_options(config, "chromium", "performance")
+    assert "--disable-gpu" in chromium["args"]
+    assert not chromium["devtools"]
+    firefox = get_launch_options(config, "firefox", "performance")
+    assert firefox["firefox_user_prefs"]["layers.acceleration.disabled"]
+    assert get_launch_options(config, "webkit", "performance")["args"] == []
+    assert get_launch_options(config, "chromium", "unknown") == default
+    assert "viewport" in get_context_options(config, "performance")
+
+
+def _add_process(proc: Path, pid: int, ppid: int, pages: int):
+    folder = proc / str(pid)
+    folder.mkdir()
+    _ = (folder / "stat").write_text("%d (web content) S %d 1 1" % (pid, ppid))
+    _ = (folder / "statm").write_text("100 %d 10 1 0 50 0" % pages)
+
+
+@pytest.mark.skipif(not hasattr(os, "sysconf"), reason="sysconf is not available")
+def test_read_tree_rss(tmp_path: Path):
+    """Check if only descendants of the process are counted."""
+    _add_process(tmp_path, 10, 1, 1000)
+    _add_process(tmp_path, 11, 10, 3)
+    _add_process(tmp_path, 12, 11, 4)
+    _add_process(tmp_path, 13, 1, 5)
+    (tmp_path / "self").mkdir()
+    assert read_tree_rss(10, tmp_path) == 7 * os.sysconf("SC_PAGE_SIZE")
+    assert read_tree_rss(13, tmp_path) == 0
+    assert read_tree_rss(10, tmp_path / "missing") is None
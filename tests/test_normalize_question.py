@@ -0,0 +1,17 @@
+"""Test if normalize_question works."""
+
+from autoxuexiplaywright.processors.common.answer.utils import normalize_question
+
+
+_io_map = {
+    "问题": "问题",
+    " 问 题\n": "问题",
+    "\uff21\uff22\uff23\uff08\uff09": "ABC()",
+    "": "",
+}
+
+
+def test_normalize_question():
+    """Check if normalize_question is correct."""
+    for k, v in _io_map.items():
+        assert normalize_question(k) == v
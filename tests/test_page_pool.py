@@ -0,0 +1,59 @@
+"""Test if PagePool works."""
+
+from asyncio import run
+from asyncio import sleep
+from asyncio import gather
+from autoxuexiplaywright.processors.async_api.pool import BLANK_PAGE
+from autoxuexiplaywright.processors.async_api.pool import PagePool
+
+
+_POOL_SIZE = 2
+_WORKERS = 5
+
+
+class _Page:
+    def __init__(self):
+        self.url = ""
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def goto(self, url: str):
+        self.url = url
+
+    async def close(self):
+        self.closed = True
+
+
+class _Context:
+    def __init__(self):
+        self.pages: list[_Page] = [_Page()]
+
+    async def new_page(self) -> _Page:
+        page = _Page()
+        self.pages.append(page)
+        return page
+
+
+def test_page_pool():
+    """Check if pages are reused, reset and never exceed pool size."""
+
+    async def use_pages(context: _Context):
+        async with PagePool(context, _POOL_SIZE) as pool:  # type: ignore
+
+            async def work():
+                page = await pool.acquire()
+                await sleep(0)
+                await pool.release(page)
+
+            _ = await gather(*[work() for _ in range(_WORKERS)])
+            page = await pool.acquire()
+            assert page.url == BLANK_PAGE
+            await page.close()
+            await pool.release(page)
+
+    context = _Context()
+    run(use_pages(context))
+    assert len(context.pages) == _POOL_SIZE + 1
+    assert all(page.closed for page in context.pages)
@@ -0,0 +1,51 @@
+"""Test if parse_paper works."""
+
+from json import dumps
+from base64 import b64encode
+from autoxuexiplaywright.processors.common import PAPER_REQUEST_REGEX
+from autoxuexiplaywright.processors.common.paper import PaperQuestion
+from autoxuexiplaywright.processors.common.paper import parse_paper
+from autoxuexiplaywright.processors.common.paper import find_paper_question
+
+
+_questions = [
+    {
+        "body": "<p>中国的首都是</p>",
+        "answers": [{"content": "北京"}, {"content": "上海"}],
+        "questionDesc": '首都是<font color="red">北京</font>。',
+    },
+    {"body": "没有选项"},
+    {"answers": []},
+]
+_paper = [
+    PaperQuestion("中国的首都是", ["北京", "上海"], ["北京"]),
+    PaperQuestion("没有选项", [], []),
+]
+
+
+def test_parse_paper():
+    """Check if parse_paper finds questions in all supported payloads."""
+    data_str = b64encode(dumps({"questions": _questions}).encode()).decode()
+    assert parse_paper({"questions": _questions}) == _paper
+    assert parse_paper({"data": {"questions": _questions}}) == _paper
+    assert parse_paper({"data_str": data_str}) == _paper
+    assert parse_paper({"data_str": "not base64"}) == []
+    assert parse_paper(None) == []
+
+
+def test_find_paper_question():
+    """Check if questions are matched by title instead of position."""
+    assert find_paper_question(_paper, 0, "中国的首都是") == 0
+    assert find_paper_question(_paper, 0, "没有 选项。") == 1
+    assert find_paper_question(_paper, 2, "中国的首都是(  )") == 0
+    assert find_paper_question(_paper, 0, "另一个问题") is None
+    assert find_paper_question([], 0, "中国的首都是") is None
+
+
+def test_paper_request_regex():
+    """Check if only paper APIs are matched."""
+    base = "https://pc-proxy-api.xuexi.cn/api/exam/service/"
+    assert PAPER_REQUEST_REGEX.match(base + "common/deduplicateRandomSearchV3?limit=5")
+    assert PAPER_REQUEST_REGEX.match(base + "detail/queryV3?type=2&id=1")
+    assert PAPER_REQUEST_REGEX.match(base + "detail/submitV3?id=1") is None
+    assert PAPER_REQUEST_REGEX.match(base + "practice/weekPageSearch?pageNo=1") is None
@@ -0,0 +1,63 @@
+"""Test if progress from score progress API can be parsed."""
+
+import pytest
+from autoxuexiplaywright.processors.common import get_scores
+from autoxuexiplaywright.processors.common import get_tasks_to_be_done
+from autoxuexiplaywright.processors.common.status import StatusCollector
+from autoxuexiplaywright.processors.common.status import get_rule_progress
+from autoxuexiplaywright.processors.common.progress import RuleProgress
+from autoxuexiplaywright.processors.common.progress import parse_progress
+
+
+_payload = {
+    "data": {
+        "totalScore": 1000,
+        "taskProgress": [
+            {"title": "登录", "currentScore": 1, "dayMaxScore": 1},
+            {"title": "我要选读文章", "currentScore": 6, "dayMaxScore": 12},
+            {"title": "每日答题", "currentScore": 0, "dayMaxScore": 5},
+            {"title": "broken", "currentScore": "1"},
+        ],
+    },
+}
+
+
+def test_parse_progress():
+    """Check if rules, total and today scores are parsed."""
+    progress = parse_progress(_payload)
+    assert progress is not None
+    assert progress.total == 1000  # noqa: PLR2004
+    assert progress.today == 7  # noqa: PLR2004
+    assert len(progress.rules) == 3  # noqa: PLR2004
+    rule = progress.get("我要选读文章")
+    assert rule == RuleProgress("我要选读文章", 6, 12)
+    assert rule.remaining == 6  # noqa: PLR2004
+    assert rule.ratio == 0.5  # noqa: PLR2004
+    assert progress.get("unknown") is None
+    assert RuleProgress("over", 3, 2).remaining == 0
+    assert RuleProgress("no cap", 0, 0).ratio == 1.0
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [None, [], {"data": None}, {"data": {"taskProgress": None}}, {"data": {"taskProgress": []}}],
+)
+def test_parse_invalid_progress(payload: object):
+    """Check if invalid payloads are rejected."""
+    assert parse_progress(payload) is None
+
+
+def test_apply_progress():
+    """Check if tasks with more remaining points are put first."""
+    collector = StatusCollector()
+    progress = parse_progress(_payload)
+    assert progress is not None
+    assert not collector.apply_progress(progress)
+    assert get_scores() == [1000, 7]
+    assert get_tasks_to_be_done() == ["我要选读文章", "每日答题"]
+    assert get_rule_progress("每日答题") == RuleProgress(
+        "每日答题",
+        0,
+        5,
+    )
+    get_tasks_to_be_done().clear()
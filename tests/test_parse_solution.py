@@ -0,0 +1,15 @@
+"""Test if parse_solution works."""
+
+from autoxuexiplaywright.processors.common.answer.utils import parse_solution
+
+
+_options = ["A. 北京", "B. 上海", "C.广州"]
+
+
+def test_parse_solution():
+    """Check if parse_solution translates option letters and keeps blank answers."""
+    assert parse_solution("正确答案\uff1aA C\n解析", _options) == ["北京", "广州"]
+    assert parse_solution("正确答案: B", _options) == ["上海"]
+    assert parse_solution("正确答案: D", _options) == []
+    assert parse_solution("正确答案\uff1a 北京 上海", []) == ["北京", "上海"]
+    assert parse_solution("解析", []) == []
@@ -0,0 +1,72 @@
+"""Test if QuestionIndex works."""
+
+from pathlib import Path
+from autoxuexiplaywright.processors.common.answer.index import QuestionIndex
+from autoxuexiplaywright.processors.common.answer.store import AnswerStore
+from autoxuexiplaywright.processors.common.answer.utils import normalize_question
+from autoxuexiplaywright.processors.common.answer.sources import SqliteAnswerSource
+
+
+_keys = [
+    "中国共产党第一次全国代表大会在哪里召开\uff1f",
+    "中国共产党第二次全国代表大会在哪里召开\uff1f",
+    "学习强国平台于哪一年上线\uff1f",
+]
+# Only the part after the context differs, they are similar without checking negations
+_NEGATION_QUESTION = "关于坚持以人民为中心的发展思想和推动高质量发展的要求\uff0c%s\uff08\uff09"
+_YEAR_QUESTION = "%d年是全面贯彻党的二十大精神的开局之年\uff0c经济增长\uff08\uff09\u3002"
+
+
+def test_question_index():
+    """Check if QuestionIndex finds similar questions only."""
+    index = QuestionIndex(0.85)
+    for key in _keys:
+        index.add(normalize_question(key))
+        index.add(normalize_question(key))
+    assert len(index) == len(_keys)
+    assert index.find("学习强国平台于\uff08\u3000\uff09哪一年上线") == normalize_question(_keys[2])
+    assert index.find("中国共产党第一次全国代表大会在哪里召开") == normalize_question(_keys[0])
+    assert index.find("学习强国平台的用户有多少\uff1f") is None
+    assert index.find("") is None
+    index.clear()
+    assert index.find(_keys[0]) is None
+
+
+def test_question_index_numbers():
+    """Check if questions differ only in numbers are not similar."""
+    index = QuestionIndex(0.85)
+    index.add(normalize_question(_YEAR_QUESTION % 2023))
+    assert index.find(_YEAR_QUESTION % 2022) is None
+    assert index.find((_YEAR_QUESTION % 2023).removesuffix("\uff08\uff09\u3002")) is not None
+
+
+def test_question_index_negations():
+    """Check if questions with opposite meanings are not similar."""
+    index = QuestionIndex(0.85)
+    pairs = [
+        ("下列说法中不属于新发展理念的是", "下列说法中属于新发展理念的是"),
+        ("下列说法错误的是", "下列说法正确的是"),
+        ("下列说法正确的是", "下列说法不正确的是"),
+        ("下列选项中没有体现的是", "下列选项中有体现的是"),
+        ("下列选项中并非其内容的是", "下列选项中是其内容的是"),
+    ]
+    for stored, asked in pairs:
+        index.clear()
+        index.add(normalize_question(_NEGATION_QUESTION % stored))
+        assert index.find(_NEGATION_QUESTION % stored) is not None
+        assert index.find(_NEGATION_QUESTION % asked) is None
+
+
+def test_similar_answer(tmp_path: Path):
+    """Check if answers of similar questions are trusted less and penalized by their key."""
+    store = AnswerStore(tmp_path / "data.db")
+    _ = store.add(_keys[0], ["上海"])
+    _ = store.add(_keys[2], ["2019"], 0.7)
+    store.close()
+    source = SqliteAnswerSource(tmp_path / "data.db")
+    source.start()
+    assert source.get_answer("中国共产党第一次全国代表大会在哪里召开") == ["上海"]
+    assert source.get_answer("学习强国平台于哪一年上线") == []
+    source.penalize("中国共产党第一次全国代表大会在哪里召开")
+    assert source.get_answer(_keys[0]) == []
+    source.close()
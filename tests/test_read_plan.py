@@ -0,0 +1,44 @@
+"""Test if reading is planned by remaining points."""
+
+from autoxuexiplaywright.processors.common import READ_TIME_SECS
+from autoxuexiplaywright.processors.common import READ_SECS_PER_TIME_POINT
+from autoxuexiplaywright.processors.common import get_tasks_to_be_done
+from autoxuexiplaywright.processors.common.status import StatusCollector
+from autoxuexiplaywright.processors.common.reading import ReadPlan
+from autoxuexiplaywright.processors.common.reading import plan_read
+from autoxuexiplaywright.processors.common.reading import record_read
+from autoxuexiplaywright.processors.common.reading import read_summary
+from autoxuexiplaywright.processors.common.progress import parse_progress
+
+
+def test_plan_read():
+    """Check if items to read follow remaining points."""
+    assert plan_read("unknown") == ReadPlan(1, READ_TIME_SECS)
+    progress = parse_progress(
+        {
+            "data": {
+                "taskProgress": [
+                    {"title": "我要选读文章", "currentScore": 9, "dayMaxScore": 12},
+                    {"title": "我要视听学习", "currentScore": 6, "dayMaxScore": 6},
+                    {"title": "视听学习时长", "currentScore": 2, "dayMaxScore": 6},
+                ],
+            },
+        },
+    )
+    assert progress is not None
+    _ = StatusCollector().apply_progress(progress)
+    assert plan_read("我要选读文章") == ReadPlan(3, READ_TIME_SECS)
+    assert plan_read("我要视听学习") == ReadPlan(0, READ_TIME_SECS)
+    assert plan_read("视听学习时长") == ReadPlan(1, 4 * READ_SECS_PER_TIME_POINT)
+    get_tasks_to_be_done().clear()
+
+
+def test_record_read():
+    """Check if measured durations are summed and the summary can be cleared."""
+    read_summary.clear()
+    record_read("我要选读文章", ReadPlan(2, READ_TIME_SECS), 10, 2 * READ_TIME_SECS + 15)
+    record_read("我要视听学习", ReadPlan(0, READ_TIME_SECS), 0, 1)
+    assert (read_summary.items, read_summary.dwell_secs) == (2, 2 * READ_TIME_SECS)
+    assert read_summary.spent_secs == 2 * READ_TIME_SECS + 16
+    read_summary.clear()
+    assert (read_summary.items, read_summary.dwell_secs, read_summary.spent_secs) == (0, 0, 0)
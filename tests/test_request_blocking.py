@@ -0,0 +1,32 @@
+"""Test if requests are blocked by profiles."""
+
+from autoxuexiplaywright.processors.common.blocking import BLOCK_PROFILES
+from autoxuexiplaywright.processors.common.blocking import BlockCounter
+from autoxuexiplaywright.processors.common.blocking import should_block
+
+
+_ARTICLE_PAGE = "https://www.xuexi.cn/lgpage/detail/index.html?id=1"
+_POINTS_PAGE = "https://pc.xuexi.cn/points/my-points.html"
+_IMAGE = "https://boot-img.xuexi.cn/image/1.png"
+
+
+def test_should_block():
+    """Check if only content pages lose images and analytics are always blocked."""
+    balanced = BLOCK_PROFILES["balanced"]
+    assert should_block(balanced, "image", _IMAGE, _ARTICLE_PAGE)
+    assert not should_block(balanced, "image", _IMAGE, _POINTS_PAGE)
+    assert not should_block(balanced, "media", "https://a.xuexi.cn/1.mp4", _ARTICLE_PAGE)
+    assert should_block(balanced, "script", "https://hm.baidu.com/hm.js", _POINTS_PAGE)
+    assert not should_block(balanced, "script", "https://xbaidu.com/hm.js", _POINTS_PAGE)
+    assert should_block(BLOCK_PROFILES["aggressive"], "media", "https://a/1.mp4", _ARTICLE_PAGE)
+    assert not should_block(BLOCK_PROFILES["off"], "image", _IMAGE, _ARTICLE_PAGE)
+
+
+def test_block_counter():
+    """Check if blocked requests are counted by type."""
+    counter = BlockCounter()
+    counter.record("image")
+    counter.record("image")
+    counter.record("font")
+    assert counter.total == 3  # noqa: PLR2004
+    assert counter.format_counts() == "image: 2, font: 1"
@@ -0,0 +1,26 @@
+"""Test if rows scanned from lists are picked correctly."""
+
+from autoxuexiplaywright.processors.common.scan import Row
+from autoxuexiplaywright.processors.common.scan import parse_rows
+from autoxuexiplaywright.processors.common.scan import find_unmarked_row
+from autoxuexiplaywright.processors.common.scan import find_unvisited_row
+from autoxuexiplaywright.processors.common.scan import find_marker_without
+
+
+def test_parse_rows():
+    """Check if texts are cleaned."""
+    assert parse_rows([{"text": " a\nb ", "marker": None}, {"text": None, "marker": ""}]) == [
+        Row("ab", None),
+        Row("", ""),
+    ]
+
+
+def test_find_rows():
+    """Check if the first available row is found."""
+    rows = [Row("read", None), Row("unread", "stat done"), Row("new", "stat")]
+    assert find_unvisited_row(rows, {"read"}) == 1
+    assert find_unvisited_row(rows, {"read", "unread", "new"}) is None
+    assert find_marker_without(rows, "done") == 2  # noqa: PLR2004
+    assert find_marker_without(rows[:2], "done") is None
+    assert find_unmarked_row(rows) == 0
+    assert find_unmarked_row(rows[1:]) is None
@@ -0,0 +1,12 @@
+"""Test if saved sessions are checked by the response of score progress API."""
+
+from autoxuexiplaywright.processors.common.session import is_logged_in
+
+
+def test_is_logged_in():
+    """Check if only successful responses with progress are logged in."""
+    payload = {"data": {"taskProgress": [{"title": "登录", "currentScore": 1, "dayMaxScore": 1}]}}
+    assert is_logged_in(200, payload)
+    assert not is_logged_in(401, payload)
+    assert not is_logged_in(200, {"code": 401, "message": "not login"})
+    assert not is_logged_in(200, None)
@@ -0,0 +1,44 @@
+"""Test if SourceHealth works."""
+
+from time import sleep
+from autoxuexiplaywright.processors.common.answer.health import SourceHealth
+
+
+_WINDOW = 4
+_LATENCY_BUDGET_SECS = 1.0
+_COOLDOWN_SECS = 0.1
+
+
+def test_source_health():
+    """Check if breaker opens on failures and only one trial call closes it."""
+    health = SourceHealth(_WINDOW, _LATENCY_BUDGET_SECS, 0.5, _COOLDOWN_SECS)
+    for _ in range(_WINDOW):
+        health.record(0.001, ok=False)
+    assert not health.allow()
+    assert health.skips == 1
+    assert health.trips == 1
+    assert health.error_rate == 1.0
+    assert health.histogram[0] == _WINDOW
+    # A call started before breaker opened does not close it
+    health.record(0.001, ok=True)
+    assert not health.allow()
+    sleep(_COOLDOWN_SECS)
+    assert health.allow()
+    assert not health.allow()
+    health.record(_LATENCY_BUDGET_SECS * 2, ok=True)
+    assert not health.allow()
+    sleep(_COOLDOWN_SECS)
+    assert health.allow()
+    health.record(0.001, ok=True)
+    assert health.allow()
+    assert health.allow()
+    for _ in range(_WINDOW):
+        health.record(_LATENCY_BUDGET_SECS * 2, ok=True)
+    assert not health.allow()
+    assert health.trips == 1 + 1
+    # A trial call never recorded does not keep the source skipped forever
+    sleep(_COOLDOWN_SECS)
+    assert health.allow()
+    assert not health.allow()
+    sleep(_COOLDOWN_SECS)
+    assert health.allow()
@@ -0,0 +1,35 @@
+"""Test if StatusCollector works."""
+
+from autoxuexiplaywright.processors.common import get_scores
+from autoxuexiplaywright.processors.common import get_tasks_to_be_done
+from autoxuexiplaywright.processors.common.status import CardStatus
+from autoxuexiplaywright.processors.common.status import StatusCollector
+from autoxuexiplaywright.processors.common.status import parse_progress_style
+
+
+_status = {
+    "points": ["1000", "12"],
+    "cards": [
+        {"title": " 登录 ", "style": "width: 100%;"},
+        {"title": "我要选读文章", "style": "width: 50%;"},
+        {"title": "每日答题", "style": ""},
+    ],
+}
+
+
+def test_parse_progress_style():
+    """Check if parse_progress_style is correct."""
+    assert parse_progress_style("width: 100%;") == 1.0
+    assert parse_progress_style(" width:25% ") == 0.25  # noqa: PLR2004
+    assert parse_progress_style("height: 1%") is None
+    assert parse_progress_style("width: auto") is None
+
+
+def test_status_collector():
+    """Check if scores, tasks and cards are updated."""
+    collector = StatusCollector()
+    assert not collector.apply(_status)  # type: ignore
+    assert get_scores() == [1000, 12]
+    assert get_tasks_to_be_done() == ["我要选读文章", "每日答题"]
+    assert collector.cards["登录"] == CardStatus("登录", 1.0)
+    get_tasks_to_be_done().clear()
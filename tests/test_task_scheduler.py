@@ -0,0 +1,95 @@
+"""Test if TaskScheduler works."""
+
+import pytest
+from typing import Generator
+from typing_extensions import override
+from autoxuexiplaywright.processors.common import AbstractBaseTask
+from autoxuexiplaywright.processors.common import clean_tasks
+from autoxuexiplaywright.processors.common import register_tasks
+from autoxuexiplaywright.processors.common.scheduler import TaskScheduler
+
+
+class _Login(AbstractBaseTask):
+    @property
+    @override
+    def requires(self) -> list[str]:
+        return []
+
+    @property
+    @override
+    def handles(self) -> list[str]:
+        return ["login"]
+
+
+class _Read(AbstractBaseTask):
+    @property
+    @override
+    def requires(self) -> list[str]:
+        return ["login"]
+
+    @property
+    @override
+    def handles(self) -> list[str]:
+        return ["read", "read time"]
+
+
+class _Test(AbstractBaseTask):
+    @property
+    @override
+    def requires(self) -> list[str]:
+        return ["login"]
+
+    @property
+    @override
+    def handles(self) -> list[str]:
+        return ["test"]
+
+
+class _Extra(AbstractBaseTask):
+    @property
+    @override
+    def requires(self) -> list[str]:
+        return ["test"]
+
+    @property
+    @override
+    def handles(self) -> list[str]:
+        return ["extra"]
+
+
+@pytest.fixture()
+def _tasks() -> Generator[None, None, None]:
+    assert register_tasks(_Login, _Read, _Test, _Extra)
+    yield
+    clean_tasks()
+
+
+@pytest.mark.usefixtures("_tasks")
+def test_task_scheduler():
+    """Check if nodes start as soon as requirements succeeded within budget."""
+    scheduler = TaskScheduler(2, "extra", "read", "test", "read time", "login", "unknown")
+    [login] = scheduler.take_ready()
+    assert login.titles == ("login",)
+    assert scheduler.take_ready() == []
+    scheduler.finish(login, success=True)
+    read, test = scheduler.take_ready()
+    assert read.titles == ("read", "read time")
+    assert test.titles == ("test",)
+    scheduler.finish(test, success=True)
+    [extra] = scheduler.take_ready()
+    assert extra.titles == ("extra",)
+    scheduler.finish(read, success=False)
+    scheduler.finish(extra, success=True)
+    assert scheduler.done
+    assert [entry.success for entry in scheduler.timeline] == [True, True, False, True]
+
+
+@pytest.mark.usefixtures("_tasks")
+def test_task_scheduler_drop():
+    """Check if nodes depending on a failed node are dropped."""
+    scheduler = TaskScheduler(1, "extra", "test")
+    [test] = scheduler.take_ready()
+    scheduler.finish(test, success=False)
+    assert scheduler.take_ready() == []
+    assert scheduler.done
+    assert [node.titles for node in scheduler.dropped] == [("extra",)]
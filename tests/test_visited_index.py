@@ -0,0 +1,31 @@
+"""Test if VisitedIndex works."""
+
+from pathlib import Path
+from datetime import date
+from autoxuexiplaywright.processors.common.visited import VisitedIndex
+
+
+_DAY = date(2024, 5, 1)
+
+
+def test_visited_index(tmp_path: Path):
+    """Check if keys are kept across runs and expired keys are pruned."""
+    path = tmp_path / "visited.db"
+    index = VisitedIndex(path, 7, _DAY)
+    assert "title" not in index
+    index.add(" title\n", "https://www.xuexi.cn/1.html")
+    assert "title" in index
+    assert "https://www.xuexi.cn/1.html" in index
+    assert None not in index
+    index.close()
+
+    index = VisitedIndex(path, 7, date(2024, 5, 8))
+    assert "title" in index
+    index.add("another")
+    index.close()
+
+    index = VisitedIndex(path, 7, date(2024, 5, 9))
+    assert "title" not in index
+    assert "another" in index
+    assert len(index) == 1
+    index.close()